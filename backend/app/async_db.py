@@ -0,0 +1,29 @@
+from .executors import run_db
+
+
+class AsyncSQLite:
+    """Async access to a SQLitePool for request handlers.
+
+    There is deliberately no way to keep a connection checked out across
+    awaits: a handler that held one while awaiting hashing or another hop
+    would pin it for that whole time, and holders waiting for DB executor
+    threads behind blocked acquires deadlock once the pool is exhausted.
+    """
+
+    def __init__(self, pool):
+        self.pool = pool
+
+    async def run(self, fn, *args):
+        """Run fn(conn, *args) on the DB executor with a pooled connection.
+
+        The connection is acquired and released within the one executor hop,
+        so it is never held across an await. Handlers should do their whole
+        unit of work in ``fn``.
+        """
+        def call():
+            conn = self.pool.acquire()
+            try:
+                return fn(conn, *args)
+            finally:
+                conn.close()
+        return await run_db(call)
@@ -0,0 +1,116 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+
+
+class CacheBackend:
+    """Interface for key/value caches.
+
+    Handlers only use these methods, so a shared backend (Redis, memcached)
+    can replace the in-process one for multi-worker deployments.
+    """
+
+    def get(self, key):
+        """Return the cached value, or None on a miss."""
+        raise NotImplementedError
+
+    def set(self, key, value, ttl: float = None):
+        raise NotImplementedError
+
+    def delete(self, key):
+        raise NotImplementedError
+
+    def clear(self):
+        raise NotImplementedError
+
+    def stats(self) -> dict:
+        raise NotImplementedError
+
+
+class LRUCache(CacheBackend):
+    """Bounded in-process cache with least-recently-used eviction and a TTL.
+
+    Expired entries are dropped lazily when read or when they reach the LRU
+    end; ``ttl=None`` keeps entries until they are evicted or deleted. Each
+    worker process has its own copy, so writes made through another worker
+    only show up here once the TTL runs out.
+    """
+
+    def __init__(self, max_entries: int = 10000, ttl: float = 300):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key):
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires_at, value = entry
+            if expires_at <= now:
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key, value, ttl: float = None):
+        ttl = self.ttl if ttl is None else ttl
+        expires_at = float("inf") if ttl is None else time.monotonic() + ttl
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                _, (old_expires_at, _) = self._entries.popitem(last=False)
+                if old_expires_at <= time.monotonic():
+                    self.expirations += 1
+                else:
+                    self.evictions += 1
+
+    def delete(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "backend": "memory",
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else None,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
+
+
+CACHE_BACKENDS = {
+    "memory": LRUCache,
+}
+
+
+def create_cache(prefix: str, max_entries: int = 10000, ttl: float = 300) -> CacheBackend:
+    """Build a cache from env, e.g. PROFILE_CACHE_BACKEND / _SIZE / _TTL for prefix "PROFILE"."""
+    kind = os.getenv(f"{prefix}_CACHE_BACKEND", "memory")
+    if kind not in CACHE_BACKENDS:
+        raise ValueError(f"Unknown cache backend: {kind}")
+    return CACHE_BACKENDS[kind](
+        max_entries=int(os.getenv(f"{prefix}_CACHE_SIZE", str(max_entries))),
+        ttl=float(os.getenv(f"{prefix}_CACHE_TTL", str(ttl))),
+    )
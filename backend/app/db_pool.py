@@ -0,0 +1,268 @@
+import os
+import sqlite3
+import threading
+import time
+
+from .metrics import DB_ACQUIRE_SECONDS, DB_QUERY_SECONDS, query_verb
+from .slow_queries import format_sqlite_plan, slow_query_log
+
+DEFAULT_PRAGMAS = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "mmap_size": 268435456,     # 256 MiB
+    "cache_size": -64000,       # negative = KiB, so ~64 MB per connection
+    "busy_timeout": 5000,
+    "temp_store": "MEMORY",
+}
+
+
+class PoolTimeout(Exception):
+    pass
+
+
+def pool_settings_from_env():
+    pragmas = {
+        "journal_mode": os.getenv("SQLITE_JOURNAL_MODE", DEFAULT_PRAGMAS["journal_mode"]),
+        "synchronous": os.getenv("SQLITE_SYNCHRONOUS", DEFAULT_PRAGMAS["synchronous"]),
+        "mmap_size": int(os.getenv("SQLITE_MMAP_SIZE", DEFAULT_PRAGMAS["mmap_size"])),
+        "cache_size": int(os.getenv("SQLITE_CACHE_SIZE", DEFAULT_PRAGMAS["cache_size"])),
+        "busy_timeout": int(os.getenv("SQLITE_BUSY_TIMEOUT", DEFAULT_PRAGMAS["busy_timeout"])),
+        "temp_store": os.getenv("SQLITE_TEMP_STORE", DEFAULT_PRAGMAS["temp_store"]),
+    }
+    return {
+        "max_size": int(os.getenv("SQLITE_POOL_SIZE", "16")),
+        "timeout": float(os.getenv("SQLITE_POOL_TIMEOUT", "30")),
+        "cached_statements": int(os.getenv("SQLITE_STATEMENT_CACHE", "256")),
+        "health_check_interval": float(os.getenv("SQLITE_HEALTH_CHECK_INTERVAL", "30")),
+        "pragmas": pragmas,
+        # Opt-in with SLOW_QUERY_MS; shared by every pool in the process
+        "slow_log": slow_query_log,
+    }
+
+
+class PooledConnection:
+    """Wraps a pooled sqlite3 connection; ``close()`` hands it back to the pool.
+
+    Handlers that raise before closing their connection still return it:
+    the wrapper releases itself when it is garbage collected. Statements
+    and commits are timed into DB_QUERY_SECONDS, and statements over the
+    pool's slow-query threshold go to its slow-query log.
+    """
+
+    def __init__(self, pool, raw):
+        self._pool = pool
+        self._raw = raw
+
+    def __getattr__(self, name):
+        return getattr(self._raw, name)
+
+    def execute(self, sql, params=()):
+        started = time.perf_counter()
+        try:
+            cursor = self._raw.execute(sql, params)
+        finally:
+            elapsed = time.perf_counter() - started
+            DB_QUERY_SECONDS.observe(elapsed, (self._pool.name, query_verb(sql)))
+        slow_log = self._pool.slow_log
+        if slow_log is not None and elapsed >= slow_log.threshold:
+            slow_log.record(self._pool.name, sql, params, elapsed, self._explain)
+        return cursor
+
+    def executemany(self, sql, seq_of_params):
+        started = time.perf_counter()
+        try:
+            cursor = self._raw.executemany(sql, seq_of_params)
+        finally:
+            elapsed = time.perf_counter() - started
+            DB_QUERY_SECONDS.observe(elapsed, (self._pool.name, query_verb(sql)))
+        slow_log = self._pool.slow_log
+        if slow_log is not None and elapsed >= slow_log.threshold:
+            # No single parameter set to explain with
+            slow_log.record(self._pool.name, sql, (), elapsed)
+        return cursor
+
+    def _explain(self, sql, params):
+        return format_sqlite_plan(self._raw.execute("EXPLAIN QUERY PLAN " + sql, params).fetchall())
+
+    def commit(self):
+        started = time.perf_counter()
+        try:
+            self._raw.commit()
+        finally:
+            DB_QUERY_SECONDS.observe(time.perf_counter() - started, (self._pool.name, "COMMIT"))
+
+    def close(self):
+        raw, self._raw = self._raw, None
+        if raw is not None:
+            self._pool.release(raw)
+
+    def __del__(self):
+        if getattr(self, "_raw", None) is not None:
+            self._pool.leaked += 1
+            try:
+                self.close()
+            except Exception:
+                pass
+
+
+class SQLitePool:
+    """Bounded pool of tuned SQLite connections.
+
+    Idle connections are handed out LIFO, preferring the one the calling
+    thread used last, so a worker thread keeps reusing the same connection
+    (and its warm page and statement caches). Connections are opened with
+    ``check_same_thread=False`` because a connection may move between
+    threads, but only one thread holds it at a time.
+    """
+
+    def __init__(self, path, max_size: int = 16, timeout: float = 30.0,
+                 cached_statements: int = 256, health_check_interval: float = 30.0,
+                 pragmas: dict = None, slow_log=None):
+        self.path = path
+        self.name = os.path.basename(path)
+        self.max_size = max_size
+        self.timeout = timeout
+        self.cached_statements = cached_statements
+        self.health_check_interval = health_check_interval
+        self.pragmas = dict(DEFAULT_PRAGMAS if pragmas is None else pragmas)
+        self.slow_log = slow_log
+
+        self._cond = threading.Condition()
+        self._local = threading.local()
+        self._idle = []           # [raw connection], most recently released last
+        self._last_used = {}      # id(raw) -> monotonic time it was released
+        self._size = 0
+
+        self.created = 0
+        self.acquired = 0
+        self.thread_reuses = 0
+        self.waits = 0
+        self.timeouts = 0
+        self.health_checks = 0
+        self.health_check_failures = 0
+        self.leaked = 0
+
+    def _connect(self):
+        raw = sqlite3.connect(
+            self.path,
+            timeout=self.pragmas.get("busy_timeout", 5000) / 1000,
+            cached_statements=self.cached_statements,
+            check_same_thread=False,
+        )
+        raw.row_factory = sqlite3.Row
+        for name, value in self.pragmas.items():
+            raw.execute(f"PRAGMA {name} = {value}")
+        self.created += 1
+        return raw
+
+    def _healthy(self, raw) -> bool:
+        idle_for = time.monotonic() - self._last_used.get(id(raw), 0)
+        if idle_for < self.health_check_interval:
+            return True
+        self.health_checks += 1
+        try:
+            raw.execute("SELECT 1").fetchone()
+            return True
+        except sqlite3.Error:
+            self.health_check_failures += 1
+            return False
+
+    def _take_idle(self):
+        preferred = getattr(self._local, "raw", None)
+        if preferred is not None and preferred in self._idle:
+            self._idle.remove(preferred)
+            self.thread_reuses += 1
+            return preferred
+        return self._idle.pop()
+
+    def acquire(self) -> PooledConnection:
+        started = time.perf_counter()
+        try:
+            return self._acquire()
+        finally:
+            DB_ACQUIRE_SECONDS.observe(time.perf_counter() - started, (self.name,))
+
+    def _acquire(self) -> PooledConnection:
+        deadline = time.monotonic() + self.timeout
+        with self._cond:
+            while True:
+                if self._idle:
+                    raw = self._take_idle()
+                    break
+                if self._size < self.max_size:
+                    self._size += 1
+                    raw = None
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self.timeouts += 1
+                    raise PoolTimeout(f"No SQLite connection available after {self.timeout}s")
+                self.waits += 1
+                self._cond.wait(remaining)
+            self.acquired += 1
+
+        try:
+            if raw is not None and not self._healthy(raw):
+                self._discard(raw, reopen=True)
+                raw = None
+            if raw is None:
+                raw = self._connect()
+        except Exception:
+            with self._cond:
+                self._size -= 1
+                self._cond.notify()
+            raise
+
+        self._local.raw = raw
+        return PooledConnection(self, raw)
+
+    def _discard(self, raw, reopen: bool = False):
+        self._last_used.pop(id(raw), None)
+        try:
+            raw.close()
+        except sqlite3.Error:
+            pass
+        if not reopen:
+            with self._cond:
+                self._size -= 1
+                self._cond.notify()
+
+    def release(self, raw):
+        try:
+            # Never hand out a connection with a half-finished transaction
+            if raw.in_transaction:
+                raw.rollback()
+        except sqlite3.Error:
+            self._discard(raw)
+            return
+        with self._cond:
+            self._last_used[id(raw)] = time.monotonic()
+            self._idle.append(raw)
+            self._cond.notify()
+
+    def close_all(self):
+        with self._cond:
+            idle, self._idle = self._idle, []
+        for raw in idle:
+            self._discard(raw)
+
+    def stats(self) -> dict:
+        with self._cond:
+            idle = len(self._idle)
+            size = self._size
+        return {
+            "path": os.path.abspath(self.path),
+            "max_size": self.max_size,
+            "size": size,
+            "idle": idle,
+            "in_use": size - idle,
+            "created": self.created,
+            "acquired": self.acquired,
+            "thread_reuses": self.thread_reuses,
+            "waits": self.waits,
+            "timeouts": self.timeouts,
+            "health_checks": self.health_checks,
+            "health_check_failures": self.health_check_failures,
+            "leaked": self.leaked,
+            "pragmas": self.pragmas,
+        }
@@ -0,0 +1,221 @@
+import re
+
+import numpy as np
+
+from .matching import normalize_skill
+
+# Within a facet, selected values are OR'ed (type=full-time&type=contract),
+# except skills, where a job must have every selected skill. Facets are
+# AND'ed with each other and with the text query.
+FACET_FIELDS = ("type", "experience", "work_mode", "skills")
+ALL_OF_FACETS = {"skills"}
+
+# Facet values are slugs so they can go straight into a query string
+EXPERIENCE_LEVELS = (
+    ("entry", 0, 1),      # 0-1 years
+    ("mid", 2, 4),        # 2-4 years
+    ("senior", 5, 7),     # 5-7 years
+    ("lead", 8, None),    # 8+ years
+)
+WORK_MODE_RE = re.compile(r"\b(remote|hybrid|on[- ]?site|in[- ]office)\b", re.IGNORECASE)
+YEARS_RE = re.compile(r"(\d+)")
+
+# Skill counts only consider the most common skills (plus any selected ones);
+# with thousands of skills, counting them all would dominate the request
+SKILL_FACET_CANDIDATES = 100
+SKILL_FACET_LIMIT = 20
+
+
+def slugify(value: str) -> str:
+    return "-".join(re.findall(r"[a-z0-9+#]+", (value or "").lower()))
+
+
+def parse_work_mode(location: str) -> str:
+    # "Austin, TX (Remote)" -> remote; no marker means on-site
+    match = WORK_MODE_RE.search(location or "")
+    if not match:
+        return "onsite"
+    mode = match.group(1).lower()
+    return mode if mode in ("remote", "hybrid") else "onsite"
+
+
+def parse_experience_level(experience: str) -> str:
+    match = YEARS_RE.search(experience or "")
+    if not match:
+        return "unspecified"
+    years = int(match.group(1))
+    for level, low, high in EXPERIENCE_LEVELS:
+        if years >= low and (high is None or years <= high):
+            return level
+    return "unspecified"
+
+
+def normalize_facet_value(field: str, value: str) -> str:
+    if field == "skills":
+        return normalize_skill(value)
+    return slugify(value)
+
+
+def job_facets(job: dict) -> dict:
+    """Structured facet values for a job, parsed once at index time."""
+    return {
+        "type": [slugify(job.get('type'))],
+        "experience": [parse_experience_level(job.get('experience'))],
+        "work_mode": [parse_work_mode(job.get('location'))],
+        "skills": list(dict.fromkeys(
+            normalize_skill(skill) for skill in job.get('skills_required') or [] if skill.strip()
+        )),
+    }
+
+
+class _OrdinalList:
+    """Unordered set of ordinals backed by a growable numpy buffer."""
+
+    __slots__ = ("_data", "_size")
+
+    def __init__(self):
+        self._data = np.zeros(8, dtype=np.int64)
+        self._size = 0
+
+    def __len__(self):
+        return self._size
+
+    def append(self, ordinal: int):
+        if self._size == len(self._data):
+            grown = np.zeros(len(self._data) * 2, dtype=np.int64)
+            grown[:self._size] = self._data
+            self._data = grown
+        self._data[self._size] = ordinal
+        self._size += 1
+
+    def discard(self, ordinal: int):
+        # Order doesn't matter to the masks, so the last entry fills the gap
+        found = np.flatnonzero(self._data[:self._size] == ordinal)
+        if len(found):
+            self._size -= 1
+            self._data[found[0]] = self._data[self._size]
+
+    def view(self):
+        return self._data[:self._size]
+
+
+def rank_by_value(keys, ids, limit: int = None, after=None):
+    """Positions of ``keys`` in ascending order, ties going to the higher id.
+
+    ``after`` is a (key, id) keyset position; only entries ranked after it
+    are returned. With a ``limit`` the candidates are narrowed with a
+    partition first, so ranking stays linear in the number of entries.
+    """
+    positions = np.arange(len(keys))
+    if after is not None:
+        after_key, after_id = after
+        keep = (keys > after_key) | ((keys == after_key) & (ids < after_id))
+        positions, keys, ids = positions[keep], keys[keep], ids[keep]
+    if limit is not None and limit < len(keys):
+        cutoff = np.partition(keys, limit - 1)[limit - 1]
+        keep = keys <= cutoff
+        positions, keys, ids = positions[keep], keys[keep], ids[keep]
+    order = np.lexsort((-ids, keys))
+    if limit is not None:
+        order = order[:limit]
+    return positions[order]
+
+
+class FacetIndex:
+    """Facet posting lists keyed by the search index's document ordinals.
+
+    Every facet value keeps the ordinals of the jobs that have it. A query
+    is evaluated as a boolean mask over ordinals (a bitmap); filtering and
+    counting are then mask intersections via numpy gathers over the posting
+    lists, so no job document is looked at. Removing a job takes its
+    ordinal out of the live mask and out of its values' postings, so the
+    ordinal can be given to another job.
+    """
+
+    def __init__(self):
+        self._postings = {field: {} for field in FACET_FIELDS}
+        self._live = np.zeros(1024, dtype=bool)
+        self._size = 0
+        self._ordinal_postings = {}   # ordinal -> the postings it was added to
+
+    def add(self, ordinal: int, job: dict):
+        if ordinal >= len(self._live):
+            grown = np.zeros(max(ordinal + 1, len(self._live) * 2), dtype=bool)
+            grown[:len(self._live)] = self._live
+            self._live = grown
+        self._live[ordinal] = True
+        self._size = max(self._size, ordinal + 1)
+        added = []
+        for field, values in job_facets(job).items():
+            postings = self._postings[field]
+            for value in values:
+                posting = postings.get(value)
+                if posting is None:
+                    posting = postings[value] = _OrdinalList()
+                posting.append(ordinal)
+                added.append(posting)
+        self._ordinal_postings[ordinal] = tuple(added)
+
+    def remove(self, ordinal: int):
+        if ordinal < self._size:
+            self._live[ordinal] = False
+        for posting in self._ordinal_postings.pop(ordinal, ()):
+            posting.discard(ordinal)
+
+    def live_mask(self):
+        return self._live[:self._size].copy()
+
+    def value_mask(self, field: str, value: str):
+        mask = np.zeros(self._size, dtype=bool)
+        posting = self._postings[field].get(value)
+        if posting is not None:
+            mask[posting.view()] = True
+        return mask
+
+    def apply_filters(self, mask, filters: dict, exclude: str = None):
+        """Intersect ``mask`` (in place) with every filtered facet except ``exclude``."""
+        for field, values in (filters or {}).items():
+            # Non-facet filters (salary, distance) are applied by the search index
+            if field == exclude or field not in self._postings or not values:
+                continue
+            if field in ALL_OF_FACETS:
+                for value in values:
+                    mask &= self.value_mask(field, value)
+            else:
+                selected = np.zeros(self._size, dtype=bool)
+                for value in values:
+                    selected |= self.value_mask(field, value)
+                mask &= selected
+        return mask
+
+    def _count(self, mask, field: str, value: str) -> int:
+        posting = self._postings[field].get(value)
+        if posting is None:
+            return 0
+        return int(np.count_nonzero(mask[posting.view()]))
+
+    def counts(self, base_mask, filters: dict) -> dict:
+        """Facet value counts for the jobs in ``base_mask`` under ``filters``.
+
+        A single-choice facet is counted with every other facet's filter
+        applied but not its own, so the counts show what selecting another
+        value would add. Skills are a drill-down and include their own filter.
+        """
+        filters = filters or {}
+        result = {}
+        for field in FACET_FIELDS:
+            exclude = None if field in ALL_OF_FACETS else field
+            mask = self.apply_filters(base_mask.copy(), filters, exclude=exclude)
+            postings = self._postings[field]
+            if field == "skills":
+                candidates = sorted(postings, key=lambda value: len(postings[value]), reverse=True)
+                candidates = list(dict.fromkeys(candidates[:SKILL_FACET_CANDIDATES] + list(filters.get(field, []))))
+            else:
+                candidates = list(postings)
+            counts = [(value, self._count(mask, field, value)) for value in candidates]
+            counts = [(value, count) for value, count in counts if count or value in filters.get(field, [])]
+            counts.sort(key=lambda item: (-item[1], item[0]))
+            if field == "skills":
+                counts = counts[:SKILL_FACET_LIMIT]
+            result[field] = [{"value": value, "count": count} for value, count in counts]
+        return result
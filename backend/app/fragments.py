@@ -0,0 +1,71 @@
+import orjson
+
+from .cache import LRUCache
+
+
+class JobFragmentCache:
+    """Encoded JSON bytes for individual jobs, keyed by job id.
+
+    Jobs are validated when they enter the catalog, so responses can splice
+    these pre-encoded fragments together instead of running every job back
+    through pydantic and the JSON encoder. Entries are dropped whenever a
+    job is indexed, whether written here or pulled from another worker by
+    the catalog sync; the cache is bounded so a large catalog doesn't end
+    up fully duplicated in memory.
+    """
+
+    def __init__(self, fields, max_entries: int = 50000):
+        self.fields = tuple(fields)
+        self._cache = LRUCache(max_entries=max_entries, ttl=None)
+
+    def encode(self, job: dict) -> bytes:
+        # Only the public fields, in model order, like response_model would
+        return orjson.dumps({field: job[field] for field in self.fields})
+
+    def invalidate(self, job_ids):
+        for job_id in job_ids:
+            self._cache.delete(job_id)
+
+    def for_jobs(self, jobs) -> list:
+        """Fragments for rows the caller just read from the store.
+
+        Always encoded from the rows themselves: a cached fragment could be
+        older than the row (a write by another worker not yet synced), and
+        encoding costs little next to the read. The fresh fragments replace
+        the cached ones for later ``for_ids`` calls.
+        """
+        fragments = []
+        for job in jobs:
+            fragment = self.encode(job)
+            self._cache.set(job['id'], fragment)
+            fragments.append(fragment)
+        return fragments
+
+    def for_ids(self, job_ids, load) -> list:
+        """Fragments in ``job_ids`` order; ``load(ids)`` fetches jobs for misses."""
+        job_ids = list(job_ids)
+        found = {}
+        missing = []
+        for job_id in job_ids:
+            fragment = self._cache.get(job_id)
+            if fragment is None:
+                missing.append(job_id)
+            else:
+                found[job_id] = fragment
+        if missing:
+            for job in load(missing):
+                fragment = self.encode(job)
+                self._cache.set(job['id'], fragment)
+                found[job['id']] = fragment
+        return [found[job_id] for job_id in job_ids if job_id in found]
+
+    def stats(self) -> dict:
+        return self._cache.stats()
+
+
+def render_jobs_envelope(fragments, envelope: dict) -> bytes:
+    """JSON object with a "jobs" array of pre-encoded fragments plus ``envelope``'s keys."""
+    jobs = b'{"jobs":[' + b",".join(fragments) + b"]"
+    if not envelope:
+        return jobs + b"}"
+    return jobs + b"," + orjson.dumps(envelope)[1:]
@@ -0,0 +1,115 @@
+from array import array
+
+import numpy as np
+
+# Typos are corrected against the words of these fields only; descriptions
+# would add a long tail of rare words that make poor corrections
+FUZZY_FIELDS = ("title", "company", "skills_required")
+MIN_FUZZY_LENGTH = 4
+# Each edit multiplies a corrected term's score contribution by this
+FUZZY_WEIGHT = 0.5
+MAX_CORRECTIONS = 5
+
+
+def max_edits(term: str) -> int:
+    # Short words tolerate one typo, longer ones two
+    if len(term) < MIN_FUZZY_LENGTH:
+        return 0
+    return 1 if len(term) <= 6 else 2
+
+
+def trigrams(term: str):
+    padded = f"${term}$"
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def bounded_edit_distance(a: str, b: str, limit: int):
+    """Edit distance between a and b, or None once it exceeds limit.
+
+    Optimal string alignment: insertions, deletions, substitutions and
+    swaps of two adjacent characters ("pyhton") each cost one edit.
+    """
+    if abs(len(a) - len(b)) > limit:
+        return None
+    before = None
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, start=1):
+        current = [i]
+        for j, char_b in enumerate(b, start=1):
+            cost = min(
+                previous[j] + 1,
+                current[j - 1] + 1,
+                previous[j - 1] + (char_a != char_b),
+            )
+            if i > 1 and j > 1 and char_a == b[j - 2] and a[i - 2] == char_b:
+                cost = min(cost, before[j - 2] + 1)
+            current.append(cost)
+        # Every row after the next is at least this row's minimum; a swap
+        # reaches back two rows, so stop only once both are past the limit
+        if min(current) > limit and min(previous) > limit:
+            return None
+        before, previous = previous, current
+    return previous[-1] if previous[-1] <= limit else None
+
+
+class TrigramIndex:
+    """Trigram index over the vocabulary of titles, companies and skills.
+
+    Each distinct word gets a small integer id; a trigram maps to a compact
+    array of the ids of the words containing it. Corrections for a word
+    are the vocabulary words sharing enough trigrams with it (an edit
+    touches at most three trigrams and an adjacent swap four, so a word
+    within k edits shares at least len(word) - 4k of them), verified with
+    an edit distance that gives up past the bound.
+    Words are only ever added; corrections that no longer match a job
+    simply produce no hits.
+    """
+
+    def __init__(self):
+        self._ids = {}             # word -> id
+        self._words = []
+        self._lengths = array('B')
+        self._grams = {}           # trigram -> array of word ids
+
+    def __len__(self):
+        return len(self._words)
+
+    def add(self, word: str):
+        if word in self._ids or len(word) < MIN_FUZZY_LENGTH or len(word) > 255:
+            return
+        word_id = self._ids[word] = len(self._words)
+        self._words.append(word)
+        self._lengths.append(len(word))
+        for gram in trigrams(word):
+            ids = self._grams.get(gram)
+            if ids is None:
+                ids = self._grams[gram] = array('I')
+            ids.append(word_id)
+
+    def corrections(self, term: str):
+        """[(word, edits), ...] within max_edits(term) of term, closest first."""
+        limit = max_edits(term)
+        if not limit or not self._words:
+            return []
+        grams = trigrams(term)
+        postings = [self._grams[gram] for gram in grams if gram in self._grams]
+        if not postings:
+            return []
+        shared = np.bincount(
+            np.concatenate([np.frombuffer(ids, dtype=np.uint32) for ids in postings]),
+            minlength=len(self._words)
+        )
+        lengths = np.frombuffer(self._lengths, dtype=np.uint8)
+        candidates = np.flatnonzero(
+            (shared >= max(len(grams) - 4 * limit, 1))
+            & (np.abs(lengths.astype(np.int16) - len(term)) <= limit)
+        )
+
+        found = []
+        for word_id in candidates.tolist():
+            word = self._words[word_id]
+            edits = bounded_edit_distance(term, word, limit)
+            if edits:
+                found.append((edits, -int(shared[word_id]), word))
+        found.sort()
+        return [(word, edits) for edits, _, word in found[:MAX_CORRECTIONS]]
@@ -0,0 +1,193 @@
+import csv
+import math
+import os
+import re
+from array import array
+
+import numpy as np
+
+from .facets import _OrdinalList, rank_by_value
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+# city,state,zip_code,latitude,longitude; the bundled file only covers major
+# US metros, point GEO_PLACES_PATH at a full zip gazetteer for complete coverage
+GEO_PLACES_PATH = os.getenv("GEO_PLACES_PATH", os.path.join(BASE_DIR, 'data', 'us_places.csv'))
+
+EARTH_RADIUS_MILES = 3958.8
+MILES_PER_DEGREE_LAT = 69.0
+GRID_CELL_DEGREES = 1.0
+DEFAULT_RADIUS_MILES = 25
+MAX_RADIUS_MILES = 500
+DISTANCE_SORT = "distance"
+# Sort value for jobs whose location couldn't be geocoded, so they come last
+MISSING_DISTANCE = 1e9
+
+ZIP_RE = re.compile(r"\b(\d{5})(?:-\d{4})?\b")
+PARENS_RE = re.compile(r"\([^)]*\)")
+
+
+def _place_key(city: str, state: str):
+    city = re.sub(r"[^a-z0-9 ]", "", city.lower())
+    city = re.sub(r"^saint ", "st ", " ".join(city.split()))
+    return city, state.strip().upper()
+
+
+def distance_miles(lat, lon, lats, lons):
+    """Great-circle (haversine) distance from one point to arrays of points."""
+    lat1, lon1 = math.radians(lat), math.radians(lon)
+    lat2, lon2 = np.radians(lats), np.radians(lons)
+    a = (np.sin((lat2 - lat1) / 2) ** 2
+         + math.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2)
+    return 2 * EARTH_RADIUS_MILES * np.arcsin(np.sqrt(a))
+
+
+class Gazetteer:
+    """Offline lookup from zip codes and "City, ST" strings to coordinates.
+
+    A zip code that isn't listed falls back to a listed one with the same
+    three-digit prefix (its sectional center), which is close enough for
+    radius search.
+    """
+
+    def __init__(self, places=()):
+        self._by_zip = {}
+        self._by_prefix = {}
+        self._by_city = {}
+        for city, state, zip_code, lat, lon in places:
+            coords = (float(lat), float(lon))
+            zip_code = zip_code.strip().zfill(5)
+            self._by_zip[zip_code] = coords
+            self._by_prefix.setdefault(zip_code[:3], coords)
+            self._by_city.setdefault(_place_key(city, state), coords)
+
+    @classmethod
+    def load(cls, path: str = GEO_PLACES_PATH):
+        with open(path, newline="", encoding="utf-8") as f:
+            reader = csv.DictReader(f)
+            return cls(
+                (row['city'], row['state'], row['zip_code'], row['latitude'], row['longitude'])
+                for row in reader
+            )
+
+    def locate_zip(self, zip_code: str):
+        zip_code = (zip_code or "").strip()[:5]
+        if not zip_code.isdigit() or len(zip_code) != 5:
+            return None
+        return self._by_zip.get(zip_code) or self._by_prefix.get(zip_code[:3])
+
+    def geocode(self, location: str):
+        """(lat, lon) for a job location like "Austin, TX (Remote)", or None."""
+        if not location:
+            return None
+        match = ZIP_RE.search(location)
+        if match:
+            coords = self.locate_zip(match.group(1))
+            if coords:
+                return coords
+        parts = [part.strip() for part in PARENS_RE.sub("", location).split(",")]
+        if len(parts) < 2:
+            return None
+        state = parts[1].split()[0] if parts[1] else ""
+        return self._by_city.get(_place_key(parts[0], state))
+
+
+gazetteer = Gazetteer.load()
+
+
+class GeoIndex:
+    """Geocoded job locations keyed by the search index's document ordinals.
+
+    Locations resolve to place centroids, so many jobs share a point. Each
+    distinct point keeps the ordinals located there, and points are
+    bucketed in a grid of GRID_CELL_DEGREES cells. A radius query measures
+    only the points in the cells overlapping the circle's bounding box and
+    marks their ordinals, so its cost depends on the nearby points and the
+    jobs at them, not on the size of the catalog. The grid doesn't wrap
+    around the antimeridian.
+    """
+
+    def __init__(self, places: Gazetteer = None):
+        self.gazetteer = places or gazetteer
+        self._points = {}        # (lat, lon) -> point id
+        self._lats = array('d')
+        self._lons = array('d')
+        self._postings = []      # point id -> ordinals located there
+        self._cells = {}         # grid cell -> [point id]
+        self._point_of = np.full(1024, -1, dtype=np.int32)
+        self._ids = np.zeros(1024, dtype=np.int64)
+        self._size = 0
+
+    def add(self, ordinal: int, job: dict):
+        if ordinal >= len(self._point_of):
+            grown = np.full(max(ordinal + 1, len(self._point_of) * 2), -1, dtype=np.int32)
+            grown[:len(self._point_of)] = self._point_of
+            self._point_of = grown
+            ids = np.zeros(len(grown), dtype=np.int64)
+            ids[:len(self._ids)] = self._ids
+            self._ids = ids
+        self._ids[ordinal] = job['id']
+        self._size = max(self._size, ordinal + 1)
+
+        coords = self.gazetteer.geocode(job.get('location'))
+        if coords is None:
+            self._point_of[ordinal] = -1
+            return
+        point = self._points.get(coords)
+        if point is None:
+            point = self._points[coords] = len(self._lats)
+            self._lats.append(coords[0])
+            self._lons.append(coords[1])
+            self._postings.append(_OrdinalList())
+            self._cells.setdefault(self._cell(*coords), []).append(point)
+        self._point_of[ordinal] = point
+        self._postings[point].append(ordinal)
+
+    def remove(self, ordinal: int):
+        if ordinal < self._size and self._point_of[ordinal] >= 0:
+            self._postings[self._point_of[ordinal]].discard(ordinal)
+            self._point_of[ordinal] = -1
+
+    @staticmethod
+    def _cell(lat: float, lon: float):
+        return math.floor(lat / GRID_CELL_DEGREES), math.floor(lon / GRID_CELL_DEGREES)
+
+    def _points_within(self, lat: float, lon: float, radius: float):
+        lat_span = radius / MILES_PER_DEGREE_LAT
+        lon_span = radius / max(MILES_PER_DEGREE_LAT * math.cos(math.radians(lat)), 1e-6)
+        low_cell = self._cell(lat - lat_span, lon - lon_span)
+        high_cell = self._cell(lat + lat_span, lon + lon_span)
+        candidates = [
+            point
+            for cell_lat in range(low_cell[0], high_cell[0] + 1)
+            for cell_lon in range(low_cell[1], high_cell[1] + 1)
+            for point in self._cells.get((cell_lat, cell_lon), ())
+        ]
+        if not candidates:
+            return []
+        candidates = np.array(candidates, dtype=np.int64)
+        lats = np.frombuffer(self._lats, dtype=np.float64)[candidates]
+        lons = np.frombuffer(self._lons, dtype=np.float64)[candidates]
+        return candidates[distance_miles(lat, lon, lats, lons) <= radius].tolist()
+
+    def radius_mask(self, lat: float, lon: float, radius: float):
+        """Boolean mask over ordinals of jobs located within ``radius`` miles."""
+        mask = np.zeros(self._size, dtype=bool)
+        for point in self._points_within(lat, lon, radius):
+            mask[self._postings[point].view()] = True
+        return mask
+
+    def ranked(self, ordinals, lat: float, lon: float, limit: int = None, after=None):
+        """Order ``ordinals`` nearest first; returns [(miles, ordinal), ...].
+
+        Jobs without a known location come last. ``after`` is a
+        (miles, job_id) keyset position.
+        """
+        ordinals = np.asarray(ordinals, dtype=np.int64)
+        # Measured once per distinct point, then gathered per job; unlocated
+        # jobs (point -1) pick up the trailing MISSING_DISTANCE
+        by_point = np.append(distance_miles(
+            lat, lon, np.frombuffer(self._lats, dtype=np.float64), np.frombuffer(self._lons, dtype=np.float64)
+        ), MISSING_DISTANCE)
+        miles = np.round(by_point[self._point_of[ordinals]], 2)
+        positions = rank_by_value(miles, self._ids[ordinals], limit, after)
+        return [(float(miles[i]), int(ordinals[i])) for i in positions]
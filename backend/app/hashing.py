@@ -0,0 +1,231 @@
+import asyncio
+import functools
+import hashlib
+import hmac
+import multiprocessing
+import os
+import re
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+from .metrics import PASSWORD_HASH_SECONDS
+
+# Unsalted SHA-256 hex digests written by the original signup handler
+LEGACY_SHA256_RE = re.compile(r"^[0-9a-f]{64}$")
+
+
+class HashingBusy(Exception):
+    """Raised when the hashing queue is full; callers should shed the request."""
+
+
+# --- Worker-side functions (run inside the process pool) ---
+
+@functools.lru_cache(maxsize=None)
+def _argon2_hasher(time_cost, memory_cost, parallelism):
+    from argon2 import PasswordHasher
+    return PasswordHasher(time_cost=time_cost, memory_cost=memory_cost, parallelism=parallelism)
+
+
+def _hash_worker(scheme, params, password):
+    if scheme == "bcrypt":
+        import bcrypt
+        # bcrypt only looks at the first 72 bytes
+        return bcrypt.hashpw(password.encode()[:72], bcrypt.gensalt(params["rounds"])).decode()
+    return _argon2_hasher(params["time_cost"], params["memory_cost"], params["parallelism"]).hash(password)
+
+
+def _verify_worker(password, stored_hash):
+    if stored_hash.startswith("$argon2"):
+        from argon2.exceptions import InvalidHashError, VerificationError
+        try:
+            # Cost parameters are read from the hash itself, so any hasher verifies
+            return _argon2_hasher(3, 65536, 1).verify(stored_hash, password)
+        except (VerificationError, InvalidHashError):
+            return False
+    if stored_hash.startswith("$2"):
+        import bcrypt
+        try:
+            return bcrypt.checkpw(password.encode()[:72], stored_hash.encode())
+        except ValueError:
+            return False
+    return False
+
+
+def _warm_up():
+    return os.getpid()
+
+
+# --- Service ---
+
+class PasswordHashingService:
+    """Hashes and verifies passwords on a bounded process pool.
+
+    At most ``workers`` hashes run at once and at most ``max_queue`` may be
+    waiting; beyond that ``HashingBusy`` is raised instead of queueing, so a
+    login storm saturates a fixed number of cores rather than every request
+    thread. Legacy unsalted SHA-256 hashes still verify, and ``verify``
+    returns a replacement hash whenever the stored one is legacy or uses
+    outdated cost parameters.
+    """
+
+    def __init__(self, scheme: str = "argon2", workers: int = 2, max_queue: int = 64,
+                 time_cost: int = 3, memory_cost: int = 65536, parallelism: int = 1,
+                 bcrypt_rounds: int = 12, start_method: str = None):
+        if scheme not in ("argon2", "bcrypt"):
+            raise ValueError(f"Unknown password hash scheme: {scheme}")
+        self.scheme = scheme
+        self.workers = workers
+        self.max_queue = max_queue
+        # fork keeps worker startup cheap (spawn would re-import the app in
+        # every worker); call start() early, before the app starts threads
+        if start_method is None:
+            start_method = "fork" if "fork" in multiprocessing.get_all_start_methods() else "spawn"
+        self.start_method = start_method
+        if scheme == "bcrypt":
+            self.params = {"rounds": bcrypt_rounds}
+        else:
+            self.params = {"time_cost": time_cost, "memory_cost": memory_cost, "parallelism": parallelism}
+
+        self._lock = threading.Lock()
+        self._executor = None
+        self.in_flight = 0
+        self.rejected = 0
+        self.hashed = 0
+        self.verified = 0
+        self.rehashed = 0
+
+    @classmethod
+    def from_env(cls, **overrides):
+        workers = overrides.pop("workers", None) or int(
+            os.getenv("HASH_WORKERS", str(min(4, os.cpu_count() or 1)))
+        )
+        settings = dict(
+            scheme=os.getenv("PASSWORD_HASH_SCHEME", "argon2"),
+            workers=workers,
+            max_queue=int(os.getenv("HASH_MAX_QUEUE", str(workers * 16))),
+            time_cost=int(os.getenv("ARGON2_TIME_COST", "3")),
+            memory_cost=int(os.getenv("ARGON2_MEMORY_COST", "65536")),
+            parallelism=int(os.getenv("ARGON2_PARALLELISM", "1")),
+            bcrypt_rounds=int(os.getenv("BCRYPT_ROUNDS", "12")),
+            start_method=os.getenv("HASH_START_METHOD"),
+        )
+        settings.update(overrides)
+        return cls(**settings)
+
+    def _pool(self):
+        # Started lazily so importing the app (or a CLI) doesn't spawn workers
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ProcessPoolExecutor(
+                        max_workers=self.workers,
+                        mp_context=multiprocessing.get_context(self.start_method),
+                    )
+        return self._executor
+
+    def start(self):
+        # Bring every worker up front so the first logins don't pay for it
+        pool = self._pool()
+        for future in [pool.submit(_warm_up) for _ in range(self.workers)]:
+            future.result()
+
+    def _reserve(self):
+        with self._lock:
+            if self.in_flight >= self.max_queue:
+                self.rejected += 1
+                raise HashingBusy("Too many password hashing requests in progress")
+            self.in_flight += 1
+
+    def _done(self, _future=None):
+        with self._lock:
+            self.in_flight -= 1
+
+    def _submit(self, fn, *args):
+        self._reserve()
+        try:
+            future = self._pool().submit(fn, *args)
+        except Exception:
+            self._done()
+            raise
+        future.add_done_callback(self._done)
+        return future
+
+    def needs_rehash(self, stored_hash: str) -> bool:
+        if self.scheme == "argon2":
+            if not stored_hash.startswith("$argon2"):
+                return True
+            return _argon2_hasher(**self.params).check_needs_rehash(stored_hash)
+        if not stored_hash.startswith("$2"):
+            return True
+        return stored_hash.split("$")[2] != f"{self.params['rounds']:02d}"
+
+    @staticmethod
+    def _verify_legacy(password: str, stored_hash: str) -> bool:
+        digest = hashlib.sha256(password.encode()).hexdigest()
+        return hmac.compare_digest(digest, stored_hash)
+
+    async def hash(self, password: str) -> str:
+        with PASSWORD_HASH_SECONDS.time(("hash",)):
+            future = self._submit(_hash_worker, self.scheme, self.params, password)
+            result = await asyncio.wrap_future(future)
+        self.hashed += 1
+        return result
+
+    async def verify(self, password: str, stored_hash: str):
+        """Return (matches, replacement_hash_or_None)."""
+        with PASSWORD_HASH_SECONDS.time(("verify",)):
+            if LEGACY_SHA256_RE.match(stored_hash):
+                # Cheap enough to check inline; the upgrade hash goes to the pool
+                matches = self._verify_legacy(password, stored_hash)
+            else:
+                future = self._submit(_verify_worker, password, stored_hash)
+                matches = await asyncio.wrap_future(future)
+        self.verified += 1
+
+        if matches and self.needs_rehash(stored_hash):
+            self.rehashed += 1
+            return True, await self.hash(password)
+        return matches, None
+
+    def hash_blocking(self, password: str) -> str:
+        with PASSWORD_HASH_SECONDS.time(("hash",)):
+            result = self._submit(_hash_worker, self.scheme, self.params, password).result()
+        self.hashed += 1
+        return result
+
+    def verify_blocking(self, password: str, stored_hash: str) -> bool:
+        with PASSWORD_HASH_SECONDS.time(("verify",)):
+            if LEGACY_SHA256_RE.match(stored_hash):
+                return self._verify_legacy(password, stored_hash)
+            return self._submit(_verify_worker, password, stored_hash).result()
+
+    def hash_many_blocking(self, passwords, chunksize: int = 16) -> list:
+        """Hash a batch across every worker; for offline tools, so no queue limit."""
+        passwords = list(passwords)
+        if not passwords:
+            return []
+        worker = functools.partial(_hash_worker, self.scheme, self.params)
+        hashes = list(self._pool().map(worker, passwords, chunksize=chunksize))
+        self.hashed += len(hashes)
+        return hashes
+
+    def stats(self) -> dict:
+        return {
+            "scheme": self.scheme,
+            "params": self.params,
+            "workers": self.workers,
+            "max_queue": self.max_queue,
+            "in_flight": self.in_flight,
+            "rejected": self.rejected,
+            "hashed": self.hashed,
+            "verified": self.verified,
+            "rehashed": self.rehashed,
+        }
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+password_hasher = PasswordHashingService.from_env()
@@ -0,0 +1,33 @@
+import hashlib
+import secrets
+
+from fastapi import Response
+
+# Catalog versions are per-process counters; mixing in a per-process epoch
+# keeps an ETag from one worker (or a previous run) from matching another's
+PROCESS_EPOCH = secrets.token_hex(4)
+
+
+def make_etag(*parts) -> str:
+    """Strong ETag over the given parts (anything with a stable str())."""
+    digest = hashlib.sha1("\x1f".join(str(part) for part in parts).encode()).hexdigest()
+    return f'"{digest[:24]}"'
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    # If-None-Match uses weak comparison, so a W/ prefix is ignored
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*":
+            return True
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+    return False
+
+
+def not_modified(etag: str, cache_control: str) -> Response:
+    return Response(status_code=304, headers={"ETag": etag, "Cache-Control": cache_control})
@@ -0,0 +1,432 @@
+import json
+import os
+import threading
+
+from sqlalchemy import and_, func, or_, select, text
+from sqlalchemy.orm import Session
+
+from .db_pool import SQLitePool, pool_settings_from_env
+from .salary import ensure_salary_range, parse_salary
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+JOBS_DATABASE_PATH = os.getenv("JOBS_DATABASE_PATH", os.path.join(BASE_DIR, '..', 'jobs.db'))
+SAMPLE_JOBS_PATH = os.path.join(BASE_DIR, 'data', 'sample_jobs.json')
+
+JOB_SCALAR_FIELDS = (
+    "id", "title", "company", "location", "type", "experience",
+    "salary", "description", "posted_date", "salary_min", "salary_max",
+)
+JOB_LIST_FIELDS = ("skills_required", "responsibilities", "requirements")
+
+
+def catalog_sort_key(job: dict):
+    # Catalog order is newest first; id breaks ties so the order is stable
+    return (job.get('posted_date') or "", job['id'])
+
+
+def skills_text(job: dict) -> str:
+    # Skills joined on a newline so a substring search can never match
+    # across two adjacent skills
+    return "\n".join(job.get('skills_required') or []).lower()
+
+
+def _like_pattern(search: str) -> str:
+    escaped = search.lower().replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+    return f"%{escaped}%"
+
+
+class JobStore:
+    """Storage interface for the job catalog.
+
+    ``search`` arguments use the original substring semantics (title,
+    company or any skill contains the text, case-insensitively). Results
+    are always returned in catalog order: posted_date descending, then id
+    descending. ``after`` is a (posted_date, id) keyset position; only jobs
+    strictly after it in catalog order are returned. Stores fill in
+    ``salary_min``/``salary_max`` (annual, parsed from the salary text)
+    when jobs are added.
+
+    Stores shared between processes stamp every write with a catalog
+    revision, so each worker can pull the jobs other workers wrote.
+    Positions are opaque; stores local to one process never report changes.
+    """
+
+    def change_position(self):
+        """Position of the latest write; changes_since(position) returns later ones."""
+        return None
+
+    def changes_since(self, position, limit: int = 1000):
+        """(jobs written after position, new position), at most ``limit`` jobs."""
+        return [], position
+
+    def count(self, search: str = None) -> int:
+        raise NotImplementedError
+
+    def list_jobs(self, search: str = None, offset: int = 0, limit: int = None, after=None):
+        raise NotImplementedError
+
+    def get_many(self, job_ids):
+        raise NotImplementedError
+
+    def get(self, job_id: int):
+        jobs = self.get_many([job_id])
+        return jobs[0] if jobs else None
+
+    def add_many(self, jobs):
+        raise NotImplementedError
+
+    def iter_jobs(self, batch_size: int = 1000, search: str = None):
+        """Yield every (matching) job in catalog order, fetching batch_size at a time."""
+        raise NotImplementedError
+
+    def __len__(self):
+        return self.count()
+
+
+class MemoryJobStore(JobStore):
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._jobs = {}
+        self._ordered = []
+
+    def _filtered(self, search):
+        if not search:
+            return self._ordered
+        needle = search.lower()
+        return [
+            job for job in self._ordered
+            if needle in job['title'].lower()
+            or needle in job['company'].lower()
+            or needle in skills_text(job)
+        ]
+
+    def count(self, search: str = None) -> int:
+        return len(self._filtered(search))
+
+    def list_jobs(self, search: str = None, offset: int = 0, limit: int = None, after=None):
+        jobs = self._filtered(search)
+        if after is not None:
+            # Binary search for the first job past the keyset position; the
+            # list is sorted descending so bisect can't be used directly
+            after = tuple(after)
+            lo, hi = 0, len(jobs)
+            while lo < hi:
+                mid = (lo + hi) // 2
+                if catalog_sort_key(jobs[mid]) < after:
+                    hi = mid
+                else:
+                    lo = mid + 1
+            offset += lo
+        end = None if limit is None else offset + limit
+        return jobs[offset:end]
+
+    def get_many(self, job_ids):
+        return [self._jobs[job_id] for job_id in job_ids if job_id in self._jobs]
+
+    def add_many(self, jobs):
+        with self._lock:
+            for job in jobs:
+                self._jobs[job['id']] = ensure_salary_range(job)
+            self._ordered = sorted(self._jobs.values(), key=catalog_sort_key, reverse=True)
+
+    def iter_jobs(self, batch_size: int = 1000, search: str = None):
+        yield from list(self._filtered(search))
+
+
+class SQLiteJobStore(JobStore):
+    def __init__(self, path: str = JOBS_DATABASE_PATH, pool: SQLitePool = None):
+        self.path = path
+        self.pool = pool or SQLitePool(path, **pool_settings_from_env())
+        self._init_schema()
+
+    def _connect(self):
+        return self.pool.acquire()
+
+    def _init_schema(self):
+        conn = self._connect()
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS jobs (
+                id INTEGER PRIMARY KEY,
+                title TEXT NOT NULL,
+                company TEXT NOT NULL,
+                location TEXT NOT NULL,
+                type TEXT NOT NULL,
+                experience TEXT NOT NULL,
+                salary TEXT NOT NULL,
+                description TEXT NOT NULL,
+                posted_date TEXT NOT NULL,
+                skills_required TEXT NOT NULL,
+                responsibilities TEXT NOT NULL,
+                requirements TEXT NOT NULL,
+                skills_text TEXT NOT NULL,
+                salary_min INTEGER,
+                salary_max INTEGER,
+                revision INTEGER NOT NULL DEFAULT 0
+            )
+        ''')
+        conn.execute('CREATE INDEX IF NOT EXISTS idx_jobs_posted ON jobs(posted_date DESC, id DESC)')
+        columns = {row['name'] for row in conn.execute("PRAGMA table_info(jobs)")}
+        if "salary_min" not in columns:
+            self._add_salary_columns(conn)
+        if "revision" not in columns:
+            conn.execute("ALTER TABLE jobs ADD COLUMN revision INTEGER NOT NULL DEFAULT 0")
+        conn.execute('CREATE INDEX IF NOT EXISTS idx_jobs_revision ON jobs(revision, id)')
+        conn.commit()
+        conn.close()
+
+    @staticmethod
+    def _add_salary_columns(conn):
+        # Catalogs created before the numeric columns existed are parsed once here
+        conn.execute("ALTER TABLE jobs ADD COLUMN salary_min INTEGER")
+        conn.execute("ALTER TABLE jobs ADD COLUMN salary_max INTEGER")
+        rows = conn.execute("SELECT id, salary FROM jobs").fetchall()
+        conn.executemany(
+            "UPDATE jobs SET salary_min = ?, salary_max = ? WHERE id = ?",
+            ((*parse_salary(row['salary']), row['id']) for row in rows)
+        )
+
+    @staticmethod
+    def _row_to_job(row):
+        job = {field: row[field] for field in JOB_SCALAR_FIELDS}
+        for field in JOB_LIST_FIELDS:
+            job[field] = json.loads(row[field])
+        return job
+
+    @staticmethod
+    def _job_to_row(job):
+        ensure_salary_range(job)
+        row = [job[field] for field in JOB_SCALAR_FIELDS]
+        row.extend(json.dumps(job[field]) for field in JOB_LIST_FIELDS)
+        row.append(skills_text(job))
+        return row
+
+    @staticmethod
+    def _where(search, after=None):
+        clauses = []
+        params = []
+        if search:
+            pattern = _like_pattern(search)
+            clauses.append(
+                "(lower(title) LIKE ? ESCAPE '\\' OR lower(company) LIKE ? ESCAPE '\\' "
+                "OR skills_text LIKE ? ESCAPE '\\')"
+            )
+            params.extend([pattern, pattern, pattern])
+        if after is not None:
+            # Keyset seek; served by idx_jobs_posted without scanning skipped rows
+            posted_date, job_id = after
+            clauses.append("(posted_date < ? OR (posted_date = ? AND id < ?))")
+            params.extend([posted_date, posted_date, job_id])
+        if not clauses:
+            return "", params
+        return "WHERE " + " AND ".join(clauses), params
+
+    def count(self, search: str = None) -> int:
+        where, params = self._where(search)
+        conn = self._connect()
+        total = conn.execute(f"SELECT COUNT(*) FROM jobs {where}", params).fetchone()[0]
+        conn.close()
+        return total
+
+    def list_jobs(self, search: str = None, offset: int = 0, limit: int = None, after=None):
+        where, params = self._where(search, after)
+        params.extend([-1 if limit is None else limit, offset])
+        conn = self._connect()
+        rows = conn.execute(
+            f"SELECT * FROM jobs {where} ORDER BY posted_date DESC, id DESC LIMIT ? OFFSET ?",
+            params
+        ).fetchall()
+        conn.close()
+        return [self._row_to_job(row) for row in rows]
+
+    def get_many(self, job_ids):
+        job_ids = list(job_ids)
+        if not job_ids:
+            return []
+        placeholders = ", ".join("?" * len(job_ids))
+        conn = self._connect()
+        rows = conn.execute(f"SELECT * FROM jobs WHERE id IN ({placeholders})", job_ids).fetchall()
+        conn.close()
+        by_id = {row['id']: self._row_to_job(row) for row in rows}
+        return [by_id[job_id] for job_id in job_ids if job_id in by_id]
+
+    def add_many(self, jobs):
+        columns = JOB_SCALAR_FIELDS + JOB_LIST_FIELDS + ("skills_text", "revision")
+        placeholders = ", ".join("?" * len(columns))
+        conn = self._connect()
+        try:
+            # Taking the write lock up front keeps revisions in commit order,
+            # so a worker that has pulled revision r never misses one below it
+            conn.execute("BEGIN IMMEDIATE")
+            revision = conn.execute("SELECT COALESCE(MAX(revision), 0) + 1 FROM jobs").fetchone()[0]
+            conn.executemany(
+                f"INSERT OR REPLACE INTO jobs ({', '.join(columns)}) VALUES ({placeholders})",
+                ([*self._job_to_row(job), revision] for job in jobs)
+            )
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
+
+    def change_position(self):
+        conn = self._connect()
+        revision = conn.execute("SELECT COALESCE(MAX(revision), 0) FROM jobs").fetchone()[0]
+        conn.close()
+        return (revision, None)
+
+    def changes_since(self, position, limit: int = 1000):
+        # Keyset over (revision, id); an id of None means all of that revision was seen
+        revision, job_id = position
+        if job_id is None:
+            where, params = "revision > ?", [revision]
+        else:
+            where, params = "(revision > ? OR (revision = ? AND id > ?))", [revision, revision, job_id]
+        conn = self._connect()
+        rows = conn.execute(
+            f"SELECT * FROM jobs WHERE {where} ORDER BY revision, id LIMIT ?", params + [limit]
+        ).fetchall()
+        conn.close()
+        if not rows:
+            return [], position
+        return [self._row_to_job(row) for row in rows], (rows[-1]['revision'], rows[-1]['id'])
+
+    def iter_jobs(self, batch_size: int = 1000, search: str = None):
+        where, params = self._where(search)
+        conn = self._connect()
+        try:
+            cursor = conn.execute(f"SELECT * FROM jobs {where} ORDER BY posted_date DESC, id DESC", params)
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                for row in rows:
+                    yield self._row_to_job(row)
+        finally:
+            conn.close()
+
+
+class SQLAlchemyJobStore(JobStore):
+    """Job store on the SQLAlchemy engine from database.py (Postgres in production)."""
+
+    def __init__(self, engine=None):
+        # Imported here so the other stores don't build the Postgres engine
+        from .models import JobPosting
+
+        if engine is None:
+            from .database import engine
+        self.engine = engine
+        self._model = JobPosting
+        JobPosting.__table__.create(bind=engine, checkfirst=True)
+
+    def _ordered(self, search, after=None):
+        model = self._model
+        query = select(model)
+        if after is not None:
+            posted_date, job_id = after
+            query = query.where(or_(
+                model.posted_date < posted_date,
+                and_(model.posted_date == posted_date, model.id < job_id),
+            ))
+        if search:
+            pattern = _like_pattern(search)
+            query = query.where(or_(
+                model.title.ilike(pattern, escape='\\'),
+                model.company.ilike(pattern, escape='\\'),
+                model.skills_text.like(pattern, escape='\\'),
+            ))
+        return query.order_by(model.posted_date.desc(), model.id.desc())
+
+    @staticmethod
+    def _to_job(posting):
+        job = {field: getattr(posting, field) for field in JOB_SCALAR_FIELDS}
+        for field in JOB_LIST_FIELDS:
+            job[field] = list(getattr(posting, field))
+        return job
+
+    def count(self, search: str = None) -> int:
+        query = select(func.count()).select_from(self._ordered(search).order_by(None).subquery())
+        with Session(self.engine) as session:
+            return session.execute(query).scalar_one()
+
+    def list_jobs(self, search: str = None, offset: int = 0, limit: int = None, after=None):
+        query = self._ordered(search, after).offset(offset)
+        if limit is not None:
+            query = query.limit(limit)
+        with Session(self.engine) as session:
+            return [self._to_job(posting) for posting in session.scalars(query)]
+
+    def get_many(self, job_ids):
+        job_ids = list(job_ids)
+        if not job_ids:
+            return []
+        query = select(self._model).where(self._model.id.in_(job_ids))
+        with Session(self.engine) as session:
+            by_id = {posting.id: self._to_job(posting) for posting in session.scalars(query)}
+        return [by_id[job_id] for job_id in job_ids if job_id in by_id]
+
+    def add_many(self, jobs):
+        model = self._model
+        with Session(self.engine) as session:
+            if self.engine.dialect.name == "postgresql":
+                # Serializes catalog writers so revisions commit in order
+                session.execute(text(f"LOCK TABLE {model.__tablename__} IN SHARE ROW EXCLUSIVE MODE"))
+            revision = session.execute(select(func.coalesce(func.max(model.revision), 0) + 1)).scalar_one()
+            for job in jobs:
+                ensure_salary_range(job)
+                session.merge(model(skills_text=skills_text(job), revision=revision, **job))
+            session.commit()
+
+    def change_position(self):
+        with Session(self.engine) as session:
+            revision = session.execute(select(func.coalesce(func.max(self._model.revision), 0))).scalar_one()
+        return (revision, None)
+
+    def changes_since(self, position, limit: int = 1000):
+        model = self._model
+        revision, job_id = position
+        query = select(model)
+        if job_id is None:
+            query = query.where(model.revision > revision)
+        else:
+            query = query.where(or_(
+                model.revision > revision, and_(model.revision == revision, model.id > job_id)
+            ))
+        query = query.order_by(model.revision, model.id).limit(limit)
+        with Session(self.engine) as session:
+            postings = list(session.scalars(query))
+            if not postings:
+                return [], position
+            last = (postings[-1].revision, postings[-1].id)
+            jobs = [self._to_job(posting) for posting in postings]
+        return jobs, last
+
+    def iter_jobs(self, batch_size: int = 1000, search: str = None):
+        with Session(self.engine) as session:
+            result = session.execute(
+                self._ordered(search).execution_options(yield_per=batch_size)
+            ).scalars()
+            for posting in result:
+                yield self._to_job(posting)
+
+
+def load_sample_jobs():
+    with open(SAMPLE_JOBS_PATH) as f:
+        return json.load(f)
+
+
+def create_job_store(kind: str = None) -> JobStore:
+    kind = kind or os.getenv("JOB_STORE", "sqlite")
+    if kind == "memory":
+        store = MemoryJobStore()
+    elif kind == "sqlite":
+        store = SQLiteJobStore()
+    elif kind == "sqlalchemy":
+        store = SQLAlchemyJobStore()
+    else:
+        raise ValueError(f"Unknown job store: {kind}")
+
+    # Fresh databases start out with the sample catalog
+    if store.count() == 0:
+        store.add_many(load_sample_jobs())
+    return store
@@ -0,0 +1,420 @@
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import secrets
+import subprocess
+import sys
+import tempfile
+import time
+
+import httpx
+import numpy as np
+
+# Relative weights of each operation in the steady-state mix
+DEFAULT_MIX = {
+    "signup": 2,
+    "login": 8,
+    "profile_get": 20,
+    "profile_put": 8,
+    "job_search": 35,
+    "job_page": 20,
+    "suggest": 7,
+}
+PERCENTILES = (50, 95, 99)
+PASSWORD = "LoadTest-Passw0rd!"
+PER_PAGE = 10
+# Synthetic jobs get ids from here up, clear of the sample catalog
+FIRST_JOB_ID = 1_000_000
+
+TITLES = ("Backend Engineer", "Frontend Developer", "Data Scientist", "DevOps Engineer",
+          "Product Manager", "Mobile Developer", "QA Engineer", "Data Engineer",
+          "Machine Learning Engineer", "Site Reliability Engineer", "Full Stack Developer")
+LEVELS = ("Junior", "", "Senior", "Staff", "Lead")
+COMPANIES = ("TechCorp Solutions", "DataWorks", "CloudNine Systems", "Pixel Labs", "Finlytics",
+             "HealthStack", "GreenGrid Energy", "ShopWave", "Quantum Analytics", "BrightPath")
+SKILLS = ("Python", "JavaScript", "TypeScript", "React", "Node.js", "Django", "FastAPI", "SQL",
+          "PostgreSQL", "AWS", "Docker", "Kubernetes", "Go", "Java", "Spark", "TensorFlow",
+          "Terraform", "GraphQL", "Swift", "Kotlin")
+LOCATIONS = ("San Francisco, CA", "New York, NY", "Austin, TX", "Seattle, WA", "Chicago, IL",
+             "Boston, MA", "Denver, CO", "Atlanta, GA", "Los Angeles, CA", "Remote")
+JOB_TYPES = ("Full-time", "Part-time", "Contract", "Internship")
+EXPERIENCE = ("0-1 years", "1-3 years", "3-5 years", "5+ years", "8+ years")
+SEARCHES = ("python", "engineer", "react developer", "data", "senior backend", "aws docker",
+            "machine learning", "pyhton", "kubernetes", "product manager", "frontend")
+PREFIXES = ("py", "eng", "data", "re", "sen", "dev", "cl", "ku", "ja", "ma")
+
+
+def synthetic_job(rng: random.Random, job_id: int) -> dict:
+    level = rng.choice(LEVELS)
+    title = f"{level} {rng.choice(TITLES)}".strip()
+    low = rng.randrange(60, 200) * 1000
+    skills = rng.sample(SKILLS, rng.randint(2, 6))
+    location = rng.choice(LOCATIONS)
+    if location != "Remote" and rng.random() < 0.2:
+        location += " (Remote)"
+    return {
+        "id": job_id,
+        "title": title,
+        "company": rng.choice(COMPANIES),
+        "location": location,
+        "type": rng.choice(JOB_TYPES),
+        "skills_required": skills,
+        "experience": rng.choice(EXPERIENCE),
+        "salary": f"${low:,} - ${low + rng.randrange(10, 60) * 1000:,}",
+        "description": f"{title} working with {', '.join(skills)}.",
+        "responsibilities": [f"Build and maintain {skill} services" for skill in skills[:3]],
+        "requirements": [f"Experience with {skill}" for skill in skills[:2]],
+        "posted_date": f"2024-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+    }
+
+
+def synthetic_profile(rng: random.Random) -> dict:
+    city, _, state = rng.choice(LOCATIONS[:-1]).partition(", ")
+    return {
+        "first_name": rng.choice(("Ada", "Grace", "Alan", "Linus", "Barbara", "Ken")),
+        "last_name": rng.choice(("Lovelace", "Hopper", "Turing", "Torvalds", "Liskov", "Thompson")),
+        "phone": f"555{rng.randrange(10 ** 7):07d}",
+        "skills": ", ".join(rng.sample(SKILLS, rng.randint(2, 6))),
+        "experience": rng.choice(EXPERIENCE),
+        "city": city,
+        "state": state,
+        "availability": rng.choice(("Immediately", "2 weeks", "1 month")),
+    }
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, timeout=5,
+            cwd=os.path.dirname(os.path.abspath(__file__))
+        ).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+class EndpointStats:
+    """Latencies and outcomes of one operation; an error is a transport
+    failure or any status other than 2xx/304."""
+
+    def __init__(self):
+        self.latencies = []
+        self.statuses = {}
+        self.errors = 0
+
+    def add(self, seconds: float, status):
+        self.latencies.append(seconds)
+        self.statuses[status] = self.statuses.get(status, 0) + 1
+        if not isinstance(status, int) or not (200 <= status < 300 or status == 304):
+            self.errors += 1
+
+    def summary(self, elapsed: float) -> dict:
+        count = len(self.latencies)
+        if not count:
+            return {"requests": 0}
+        millis = np.array(self.latencies) * 1000
+        return {
+            "requests": count,
+            "throughput_rps": round(count / elapsed, 2),
+            "errors": self.errors,
+            "error_rate": round(self.errors / count, 4),
+            "statuses": {str(status): n for status, n in sorted(self.statuses.items(), key=str)},
+            "latency_ms": {
+                "mean": round(float(millis.mean()), 3),
+                **{f"p{p}": round(float(np.percentile(millis, p)), 3) for p in PERCENTILES},
+                "max": round(float(millis.max()), 3),
+            },
+        }
+
+
+class LoadTest:
+    """Seeds users, profiles and jobs through the API, then drives a weighted
+    mix of requests from ``concurrency`` workers, each logged in as one of
+    the seeded users.
+
+    Every random choice comes from a generator seeded with ``seed`` (one
+    per worker), so two runs with the same arguments send the same requests
+    in the same per-worker order.
+    """
+
+    def __init__(self, client: httpx.AsyncClient, seed: int = 0, mix: dict = None, admin_token: str = None):
+        self.client = client
+        self.random_seed = seed
+        self.mix = dict(mix or DEFAULT_MIX)
+        self.admin_headers = {"X-Admin-Token": admin_token} if admin_token else {}
+        self.run_id = f"{seed}-{int(time.time())}"
+        self.accounts = []           # [{"email", "user_id", "access_token"}]
+        self.stats = {name: EndpointStats() for name in self.mix}
+        self.seeding = {}
+        self._signups = 0
+
+    async def _call(self, name, method, url, **kwargs):
+        started = time.perf_counter()
+        try:
+            response = await self.client.request(method, url, **kwargs)
+            status = response.status_code
+        except httpx.HTTPError as e:
+            response, status = None, type(e).__name__
+        if name is not None:
+            self.stats[name].add(time.perf_counter() - started, status)
+        return response
+
+    # --- Seeding ---
+
+    async def _gather_limited(self, concurrency: int, coros):
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def limited(coro):
+            async with semaphore:
+                return await coro
+        return await asyncio.gather(*(limited(coro) for coro in coros))
+
+    async def _signup(self, email: str, name: str = None):
+        response = await self._call(name, "POST", "/api/signup", json={"email": email, "password": PASSWORD})
+        if response is None or response.status_code != 200:
+            return None
+        return await self._login(email, name=None)
+
+    async def _login(self, email: str, name: str = None):
+        response = await self._call(name, "POST", "/api/login", json={"email": email, "password": PASSWORD})
+        if response is None or response.status_code != 200:
+            return None
+        body = response.json()
+        return {"email": email, "user_id": body["user_id"], "access_token": body["access_token"]}
+
+    async def _seed_user(self, index: int, rng: random.Random):
+        account = await self._signup(f"loadtest-{self.run_id}-{index}@example.com")
+        if account is not None:
+            await self._call(None, "PUT", f"/api/profile/{account['user_id']}",
+                             json=synthetic_profile(rng), headers=self._auth(account))
+        return account
+
+    async def seed(self, users: int, jobs: int, concurrency: int):
+        rng = random.Random(self.random_seed)
+        started = time.perf_counter()
+        if jobs:
+            body = "\n".join(json.dumps(synthetic_job(rng, FIRST_JOB_ID + i)) for i in range(jobs))
+            response = await self.client.post(
+                "/api/jobs/bulk", content=body.encode(),
+                headers={"Content-Type": "application/x-ndjson", **self.admin_headers}, timeout=None
+            )
+            response.raise_for_status()
+        jobs_seconds = time.perf_counter() - started
+
+        started = time.perf_counter()
+        profile_rngs = [random.Random(f"{self.random_seed}-profile-{i}") for i in range(users)]
+        accounts = await self._gather_limited(
+            concurrency, (self._seed_user(i, profile_rngs[i]) for i in range(users))
+        )
+        self.accounts = [account for account in accounts if account is not None]
+        if not self.accounts:
+            raise RuntimeError("No user could be seeded; is RATE_LIMIT_BACKEND=off on the server?")
+        self.seeding = {
+            "jobs": jobs,
+            "jobs_seconds": round(jobs_seconds, 3),
+            "users": len(self.accounts),
+            "users_failed": users - len(self.accounts),
+            "users_seconds": round(time.perf_counter() - started, 3),
+        }
+
+    # --- Operations ---
+
+    @staticmethod
+    def _auth(account: dict) -> dict:
+        return {"Authorization": f"Bearer {account['access_token']}"}
+
+    def _search_params(self, rng: random.Random) -> dict:
+        params = {"per_page": PER_PAGE}
+        if rng.random() < 0.7:
+            params["search"] = rng.choice(SEARCHES)
+        if rng.random() < 0.2:
+            params["work_mode"] = "remote"
+        if rng.random() < 0.15:
+            params["min_salary"] = rng.choice((80000, 120000, 160000))
+        if rng.random() < 0.15:
+            params["sort"] = rng.choice(("date", "salary_desc"))
+        return params
+
+    async def _op_signup(self, worker: dict, rng: random.Random):
+        self._signups += 1
+        await self._signup(f"loadtest-{self.run_id}-new-{worker['id']}-{self._signups}@example.com", "signup")
+
+    async def _op_login(self, worker: dict, rng: random.Random):
+        account = await self._login(worker["account"]["email"], "login")
+        if account is not None:
+            worker["account"] = account
+
+    async def _op_profile_get(self, worker: dict, rng: random.Random):
+        account = worker["account"]
+        await self._call("profile_get", "GET", f"/api/profile/{account['user_id']}", headers=self._auth(account))
+
+    async def _op_profile_put(self, worker: dict, rng: random.Random):
+        account = worker["account"]
+        await self._call("profile_put", "PUT", f"/api/profile/{account['user_id']}",
+                         json=synthetic_profile(rng), headers=self._auth(account))
+
+    async def _op_job_search(self, worker: dict, rng: random.Random):
+        params = self._search_params(rng)
+        response = await self._call("job_search", "GET", "/api/jobs", params=params)
+        # Remembered so job_page can walk on from here
+        cursor = response.json().get("next_cursor") if response is not None and response.status_code == 200 else None
+        worker["page"] = (params, cursor) if cursor else None
+
+    async def _op_job_page(self, worker: dict, rng: random.Random):
+        if worker.get("page") is None:
+            await self._op_job_search(worker, rng)
+            return
+        params, cursor = worker["page"]
+        response = await self._call("job_page", "GET", "/api/jobs", params={**params, "cursor": cursor})
+        cursor = response.json().get("next_cursor") if response is not None and response.status_code == 200 else None
+        worker["page"] = (params, cursor) if cursor else None
+
+    async def _op_suggest(self, worker: dict, rng: random.Random):
+        await self._call("suggest", "GET", "/api/jobs/suggest", params={"prefix": rng.choice(PREFIXES)})
+
+    # --- Run ---
+
+    async def _worker(self, worker_id: int, budget, deadline: float):
+        rng = random.Random(f"{self.random_seed}-worker-{worker_id}")
+        names = list(self.mix)
+        weights = [self.mix[name] for name in names]
+        worker = {"id": worker_id, "account": self.accounts[worker_id % len(self.accounts)], "page": None}
+        while time.perf_counter() < deadline and budget():
+            await getattr(self, f"_op_{rng.choices(names, weights)[0]}")(worker, rng)
+
+    async def run(self, requests: int = None, duration: float = None, concurrency: int = 10):
+        """Run until ``requests`` operations have started or ``duration`` seconds pass."""
+        remaining = [requests]
+
+        def budget():
+            if remaining[0] is None:
+                return True
+            remaining[0] -= 1
+            return remaining[0] >= 0
+
+        deadline = time.perf_counter() + (duration if duration else float("inf"))
+        started = time.perf_counter()
+        await asyncio.gather(*(self._worker(i, budget, deadline) for i in range(concurrency)))
+        self.elapsed = time.perf_counter() - started
+
+    def report(self, config: dict) -> dict:
+        overall = EndpointStats()
+        for stats in self.stats.values():
+            overall.latencies.extend(stats.latencies)
+            overall.errors += stats.errors
+            for status, n in stats.statuses.items():
+                overall.statuses[status] = overall.statuses.get(status, 0) + n
+        return {
+            "commit": git_commit(),
+            "started_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(time.time() - self.elapsed)),
+            "python": platform.python_version(),
+            "config": config,
+            "seed": self.seeding,
+            "elapsed_seconds": round(self.elapsed, 3),
+            "overall": overall.summary(self.elapsed),
+            "endpoints": {name: stats.summary(self.elapsed) for name, stats in self.stats.items()},
+        }
+
+
+def parse_mix(text: str) -> dict:
+    # "job_search=50,login=10" overrides those weights; 0 drops an operation
+    mix = dict(DEFAULT_MIX)
+    for part in filter(None, (part.strip() for part in text.split(","))):
+        name, _, weight = part.partition("=")
+        if name not in DEFAULT_MIX:
+            raise argparse.ArgumentTypeError(f"Unknown operation: {name}")
+        mix[name] = float(weight)
+    return {name: weight for name, weight in mix.items() if weight > 0}
+
+
+def in_process_app(data_dir: str):
+    """The app on fresh databases in data_dir, with rate limiting off.
+
+    The environment has to be set before app.main is imported; variables
+    already set by the caller win. Seeding jobs needs the admin token, so
+    one is made up when none is set.
+    """
+    os.environ.setdefault("ADMIN_API_TOKEN", secrets.token_urlsafe(32))
+    os.environ.setdefault("DATABASE_PATH", os.path.join(data_dir, "auth.db"))
+    os.environ.setdefault("JOBS_DATABASE_PATH", os.path.join(data_dir, "jobs.db"))
+    os.environ.setdefault("RATE_LIMIT_BACKEND", "off")
+    from .main import app
+    return app
+
+
+async def main(args) -> dict:
+    config = {
+        "target": args.url or "in-process",
+        "users": args.users,
+        "jobs": args.jobs,
+        "requests": args.requests,
+        "duration": args.duration,
+        "concurrency": args.concurrency,
+        "seed": args.seed,
+        "mix": args.mix,
+    }
+    timeout = httpx.Timeout(args.timeout)
+    limits = httpx.Limits(max_connections=args.concurrency * 2)
+
+    if args.url:
+        admin_token = os.getenv("ADMIN_API_TOKEN")
+        async with httpx.AsyncClient(base_url=args.url, timeout=timeout, limits=limits) as client:
+            test = LoadTest(client, args.seed, args.mix, admin_token)
+            await test.seed(args.users, args.jobs, args.concurrency)
+            await test.run(args.requests, args.duration, args.concurrency)
+        return test.report(config)
+
+    with tempfile.TemporaryDirectory(prefix="recruitme-loadtest-") as data_dir:
+        app = in_process_app(data_dir)
+        admin_token = os.environ["ADMIN_API_TOKEN"]
+        # ASGITransport skips lifespan events, so start and stop the app here
+        await app.router.startup()
+        try:
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://loadtest", timeout=timeout) as client:
+                test = LoadTest(client, args.seed, args.mix, admin_token)
+                await test.seed(args.users, args.jobs, args.concurrency)
+                await test.run(args.requests, args.duration, args.concurrency)
+        finally:
+            await app.router.shutdown()
+    return test.report(config)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Seed synthetic users and jobs, drive a mix of API requests and report "
+                    "throughput and latency percentiles per endpoint as JSON"
+    )
+    parser.add_argument("--url", default=None,
+                        help="Base URL of a running server (start it with RATE_LIMIT_BACKEND=off, and set "
+                             "ADMIN_API_TOKEN here to the server's to seed jobs); "
+                             "default runs the app in-process on temporary databases")
+    parser.add_argument("--users", type=int, default=100, help="Users (with profiles) to seed")
+    parser.add_argument("--jobs", type=int, default=2000, help="Jobs to seed through /api/jobs/bulk")
+    parser.add_argument("--requests", type=int, default=None,
+                        help="Requests to send after seeding (default 2000 unless --duration is given)")
+    parser.add_argument("--duration", type=float, default=None,
+                        help="Stop after this many seconds instead (with --requests, whichever comes first)")
+    parser.add_argument("--concurrency", type=int, default=16, help="Concurrent virtual users")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed for data and request choices")
+    parser.add_argument("--mix", type=parse_mix, default=dict(DEFAULT_MIX),
+                        help="Weight overrides, e.g. job_search=50,signup=0 (operations: "
+                             + ", ".join(DEFAULT_MIX) + ")")
+    parser.add_argument("--timeout", type=float, default=30.0, help="Per-request timeout in seconds")
+    parser.add_argument("--output", default=None, help="Write the JSON report here instead of stdout")
+    args = parser.parse_args()
+    if args.requests is None and not args.duration:
+        args.requests = 2000
+
+    report = asyncio.run(main(args))
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+        print(f"✅ {report['overall']['requests']} requests in {report['elapsed_seconds']}s "
+              f"({report['overall'].get('throughput_rps', 0)} req/s), report written to {args.output}",
+              file=sys.stderr)
+    else:
+        print(text)
@@ -1,16 +1,77 @@
-from fastapi import FastAPI, HTTPException, Depends
+from fastapi import FastAPI, HTTPException, Depends, BackgroundTasks, Header, Query, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
-from typing import Optional, List
-import sqlite3
-import hashlib
+from pydantic import BaseModel, ValidationError
+from typing import Optional, List, Dict
+import asyncio
+import logging
+import math
 import os
 import secrets
+import sqlite3
+import threading
 import datetime
 import re
 
+import orjson
+
+from .async_db import AsyncSQLite
+from .cache import create_cache
+from .db_pool import SQLitePool, pool_settings_from_env
+from .job_store import catalog_sort_key, create_job_store
+from .matching import SkillMatcher, normalize_skill, parse_profile_skills
+from .hashing import HashingBusy, password_hasher
+from .metrics import CONTENT_TYPE, MetricsMiddleware, registry
+from .http_cache import PROCESS_EPOCH, etag_matches, make_etag, not_modified
+from .executors import run_cpu, run_db, shutdown_executors
+from .export import EXPORT_BATCH_SIZE, EXPORT_FORMATS, export_response
+from .facets import EXPERIENCE_LEVELS, normalize_facet_value
+from .fragments import JobFragmentCache, render_jobs_envelope
+from .rate_limit import RateRule, create_rate_limiter
+from .recommendations import RecommendationBuilder, job_skills
+from .salary import SALARY_MATCHES
+from .pagination import TotalCountCache, decode_cursor, encode_cursor
+from .geo import DEFAULT_RADIUS_MILES, DISTANCE_SORT, MAX_RADIUS_MILES, gazetteer
+from .search import VALUE_SORTS, JobSearchIndex
+from .slow_queries import SLOW_QUERY_ORDERS, slow_query_log
+from .suggest import MAX_PREFIX_LENGTH, MAX_SUGGEST_LIMIT, SUGGEST_LIMIT
+from .tokens import REFRESH, TokenError, token_service
+
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
-DATABASE_PATH = os.path.join(BASE_DIR, '..', 'auth.db')
+DATABASE_PATH = os.getenv("DATABASE_PATH", os.path.join(BASE_DIR, '..', 'auth.db'))
+# Admin routes (exports, bulk ingest, stats) need X-Admin-Token to match
+# ADMIN_API_TOKEN; with no token configured they are closed unless
+# ADMIN_ROUTES_OPEN=1 opts in, for local development only
+ADMIN_API_TOKEN = os.getenv("ADMIN_API_TOKEN")
+ADMIN_ROUTES_OPEN = os.getenv("ADMIN_ROUTES_OPEN", "").lower() in ("1", "true", "yes")
+REVOCATION_SYNC_SECONDS = int(os.getenv("REVOCATION_SYNC_SECONDS", "30"))
+# Workers sharing a jobs database pull each other's catalog writes this often,
+# at most CATALOG_SYNC_BATCH jobs per store round trip
+CATALOG_SYNC_SECONDS = float(os.getenv("CATALOG_SYNC_SECONDS", "5"))
+CATALOG_SYNC_BATCH = int(os.getenv("CATALOG_SYNC_BATCH", "1000"))
+
+# Expired reset tokens are deleted every RESET_TOKEN_SWEEP_SECONDS, at most
+# RESET_TOKEN_SWEEP_BATCH rows per transaction; a user can have at most
+# MAX_LIVE_RESET_TOKENS unused tokens, older ones are dropped
+RESET_TOKEN_SWEEP_SECONDS = int(os.getenv("RESET_TOKEN_SWEEP_SECONDS", "300"))
+RESET_TOKEN_SWEEP_BATCH = int(os.getenv("RESET_TOKEN_SWEEP_BATCH", "500"))
+MAX_LIVE_RESET_TOKENS = int(os.getenv("MAX_LIVE_RESET_TOKENS", "3"))
+
+# Only trust X-Forwarded-For when a proxy we control sets it
+TRUST_PROXY_HEADERS = os.getenv("TRUST_PROXY_HEADERS", "").lower() in ("1", "true", "yes")
+
+# Bulk ingest writes this many jobs per transaction and reports at most
+# MAX_BULK_ERRORS failing lines
+BULK_CHUNK_SIZE = int(os.getenv("JOB_BULK_CHUNK_SIZE", "5000"))
+MAX_BULK_ERRORS = 100
+MAX_BULK_LINE_BYTES = 1024 * 1024
+
+# Clients may keep a copy but must revalidate it (If-None-Match) before use
+PROFILE_CACHE_CONTROL = "private, no-cache"
+JOBS_CACHE_CONTROL = "no-cache"
+# Suggestions are the same for everyone and a minute of staleness is harmless
+SUGGEST_CACHE_CONTROL = "public, max-age=60"
+
+logger = logging.getLogger(__name__)
 
 app = FastAPI()
 
@@ -21,6 +82,7 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+app.add_middleware(MetricsMiddleware)
 
 # Authentication Models
 class UserCreate(BaseModel):
@@ -38,6 +100,12 @@ class ResetPasswordRequest(BaseModel):
     token: str
     new_password: str
 
+class RefreshTokenRequest(BaseModel):
+    refresh_token: str
+
+class LogoutRequest(BaseModel):
+    refresh_token: Optional[str] = None
+
 # Profile Models
 class UserProfileResponse(BaseModel):
     id: int
@@ -57,6 +125,9 @@ class UserProfileResponse(BaseModel):
     resume_cv: Optional[str] = None
     created_at: Optional[str] = None
     updated_at: Optional[str] = None
+    # False when the gazetteer has no centroid for zip_code, so distance
+    # filters can't be offered for this profile
+    location_known: bool = False
 
 class ProfileUpdate(BaseModel):
     first_name: Optional[str] = None
@@ -86,389 +157,132 @@ class Job(BaseModel):
     responsibilities: List[str]
     requirements: List[str]
     posted_date: str
+    # Annual range parsed from salary at ingest; None when it has no figure
+    salary_min: Optional[int] = None
+    salary_max: Optional[int] = None
+
+class FacetCount(BaseModel):
+    value: str
+    count: int
+
+class Suggestion(BaseModel):
+    text: str
+    kind: str
+    count: int
+
+class SuggestResponse(BaseModel):
+    prefix: str
+    suggestions: List[Suggestion]
 
 class JobSearchResponse(BaseModel):
     jobs: List[Job]
-    total_jobs: int
-    total_pages: int
+    total_jobs: Optional[int] = None
+    total_pages: Optional[int] = None
     current_page: int
     per_page: int
     has_next: bool
     has_prev: bool
+    next_cursor: Optional[str] = None
+    facets: Optional[Dict[str, List[FacetCount]]] = None
+
+class JobMatch(BaseModel):
+    job: Job
+    match_score: int
+    coverage: float
+    matched_skills: List[str]
 
-# Sample Jobs Data
-SAMPLE_JOBS = [
-    # Page 1
-    {
-        "id": 1,
-        "title": "Senior Backend Engineer",
-        "company": "TechCorp Solutions",
-        "location": "San Francisco, CA (Remote)",
-        "type": "Full-time",
-        "skills_required": ["Python", "Django", "PostgreSQL", "AWS", "Docker"],
-        "experience": "5+ years",
-        "salary": "$140,000 - $180,000",
-        "description": "We are looking for a Senior Backend Engineer to join our growing engineering team. You will be responsible for designing, building, and maintaining our core backend services.",
-        "responsibilities": [
-            "Design and develop scalable backend services",
-            "Collaborate with frontend developers to integrate user-facing elements",
-            "Optimize applications for maximum speed and scalability",
-            "Implement security and data protection protocols"
-        ],
-        "requirements": [
-            "Bachelor's degree in Computer Science or related field",
-            "5+ years of experience in backend development",
-            "Strong knowledge of Python and Django framework",
-            "Experience with PostgreSQL and database design"
-        ],
-        "posted_date": "2024-01-15"
-    },
-    {
-        "id": 2,
-        "title": "Frontend Engineer",
-        "company": "InnovateTech",
-        "location": "New York, NY (Hybrid)",
-        "type": "Full-time",
-        "skills_required": ["JavaScript", "React", "TypeScript", "CSS", "Redux"],
-        "experience": "3+ years",
-        "salary": "$120,000 - $150,000",
-        "description": "Join our frontend team to build beautiful, responsive user interfaces for our SaaS platform. You'll work closely with designers and backend engineers.",
-        "responsibilities": [
-            "Develop new user-facing features using React.js",
-            "Build reusable components and front-end libraries",
-            "Translate designs and wireframes into high-quality code",
-            "Optimize components for maximum performance across browsers"
-        ],
-        "requirements": [
-            "3+ years of experience in frontend development",
-            "Proficiency in JavaScript, React, and TypeScript",
-            "Experience with state management libraries (Redux)",
-            "Knowledge of modern authorization mechanisms"
-        ],
-        "posted_date": "2024-01-14"
-    },
-    {
-        "id": 3,
-        "title": "Full Stack Developer",
-        "company": "StartUp Ventures",
-        "location": "Austin, TX (Remote)",
-        "type": "Full-time",
-        "skills_required": ["JavaScript", "Node.js", "React", "MongoDB", "Express"],
-        "experience": "4+ years",
-        "salary": "$130,000 - $160,000",
-        "description": "We're seeking a versatile Full Stack Developer who can work across our entire technology stack and help us build amazing products.",
-        "responsibilities": [
-            "Develop both frontend and backend components",
-            "Design and implement RESTful APIs",
-            "Collaborate with cross-functional teams",
-            "Participate in code reviews and technical discussions"
-        ],
-        "requirements": [
-            "4+ years of full stack development experience",
-            "Proficiency in Node.js and React",
-            "Experience with MongoDB or similar NoSQL databases",
-            "Knowledge of cloud platforms (AWS, Azure, or GCP)"
-        ],
-        "posted_date": "2024-01-13"
-    },
-    # Page 2
-    {
-        "id": 4,
-        "title": "DevOps Engineer",
-        "company": "CloudFirst Inc",
-        "location": "Seattle, WA (Remote)",
-        "type": "Full-time",
-        "skills_required": ["AWS", "Docker", "Kubernetes", "Terraform", "CI/CD"],
-        "experience": "4+ years",
-        "salary": "$135,000 - $170,000",
-        "description": "Join our infrastructure team to build and maintain our cloud infrastructure and deployment pipelines.",
-        "responsibilities": [
-            "Design and maintain CI/CD pipelines",
-            "Manage cloud infrastructure on AWS",
-            "Implement monitoring and alerting systems",
-            "Ensure system reliability and performance"
-        ],
-        "requirements": [
-            "4+ years of DevOps or infrastructure experience",
-            "Strong knowledge of AWS services",
-            "Experience with containerization (Docker, Kubernetes)",
-            "Proficiency in infrastructure as code (Terraform)"
-        ],
-        "posted_date": "2024-01-12"
-    },
-    {
-        "id": 5,
-        "title": "Data Scientist",
-        "company": "DataInsights Corp",
-        "location": "Boston, MA (Hybrid)",
-        "type": "Full-time",
-        "skills_required": ["Python", "Machine Learning", "SQL", "TensorFlow", "PyTorch"],
-        "experience": "3+ years",
-        "salary": "$125,000 - $155,000",
-        "description": "Help us derive insights from data and build machine learning models that drive business decisions.",
-        "responsibilities": [
-            "Develop and implement machine learning models",
-            "Analyze and interpret complex data sets",
-            "Collaborate with product teams to define requirements",
-            "Create data visualizations and reports"
-        ],
-        "requirements": [
-            "Master's degree in Data Science, Statistics, or related field",
-            "3+ years of experience in data science",
-            "Proficiency in Python and ML libraries",
-            "Experience with SQL and data visualization tools"
-        ],
-        "posted_date": "2024-01-11"
-    },
-    {
-        "id": 6,
-        "title": "Mobile App Developer",
-        "company": "AppWorks Studio",
-        "location": "Los Angeles, CA (Remote)",
-        "type": "Full-time",
-        "skills_required": ["React Native", "iOS", "Android", "JavaScript", "TypeScript"],
-        "experience": "3+ years",
-        "salary": "$115,000 - $145,000",
-        "description": "Build amazing mobile experiences for both iOS and Android platforms using React Native.",
-        "responsibilities": [
-            "Develop cross-platform mobile applications",
-            "Collaborate with UX/UI designers",
-            "Optimize app performance and user experience",
-            "Write clean, maintainable code"
-        ],
-        "requirements": [
-            "3+ years of mobile development experience",
-            "Proficiency in React Native",
-            "Experience with both iOS and Android platforms",
-            "Knowledge of mobile app design patterns"
-        ],
-        "posted_date": "2024-01-10"
-    },
-    # Page 3
-    {
-        "id": 7,
-        "title": "QA Automation Engineer",
-        "company": "QualityFirst Tech",
-        "location": "Chicago, IL (Remote)",
-        "type": "Full-time",
-        "skills_required": ["Selenium", "Java", "TestNG", "JUnit", "API Testing"],
-        "experience": "3+ years",
-        "salary": "$95,000 - $125,000",
-        "description": "Ensure the quality of our software products through automated testing and quality assurance processes.",
-        "responsibilities": [
-            "Develop and maintain automated test scripts",
-            "Create test plans and test cases",
-            "Perform API and integration testing",
-            "Collaborate with development teams"
-        ],
-        "requirements": [
-            "3+ years of QA automation experience",
-            "Proficiency in Selenium and Java",
-            "Experience with test frameworks (TestNG, JUnit)",
-            "Knowledge of software testing methodologies"
-        ],
-        "posted_date": "2024-01-09"
-    },
-    {
-        "id": 8,
-        "title": "UX/UI Designer",
-        "company": "DesignInnovate",
-        "location": "Portland, OR (Hybrid)",
-        "type": "Full-time",
-        "skills_required": ["Figma", "Adobe XD", "User Research", "Wireframing", "Prototyping"],
-        "experience": "4+ years",
-        "salary": "$90,000 - $120,000",
-        "description": "Create intuitive and beautiful user experiences for our digital products.",
-        "responsibilities": [
-            "Design user interfaces and experiences",
-            "Create wireframes, prototypes, and mockups",
-            "Conduct user research and testing",
-            "Collaborate with product and engineering teams"
-        ],
-        "requirements": [
-            "4+ years of UX/UI design experience",
-            "Proficiency in design tools (Figma, Adobe XD)",
-            "Strong portfolio demonstrating design skills",
-            "Understanding of user-centered design principles"
-        ],
-        "posted_date": "2024-01-08"
-    },
-    {
-        "id": 9,
-        "title": "Product Manager",
-        "company": "ProductLabs",
-        "location": "Denver, CO (Remote)",
-        "type": "Full-time",
-        "skills_required": ["Product Strategy", "Agile", "Market Research", "Roadmapping", "Stakeholder Management"],
-        "experience": "5+ years",
-        "salary": "$130,000 - $160,000",
-        "description": "Lead product development from conception to launch, working with cross-functional teams.",
-        "responsibilities": [
-            "Define product vision and strategy",
-            "Create and maintain product roadmaps",
-            "Gather and prioritize product requirements",
-            "Work with engineering and design teams"
-        ],
-        "requirements": [
-            "5+ years of product management experience",
-            "Experience with Agile methodologies",
-            "Strong analytical and problem-solving skills",
-            "Excellent communication and leadership skills"
-        ],
-        "posted_date": "2024-01-07"
-    },
-    # Page 4
-    {
-        "id": 10,
-        "title": "Security Engineer",
-        "company": "SecureSystems",
-        "location": "Washington, DC (Hybrid)",
-        "type": "Full-time",
-        "skills_required": ["Cybersecurity", "Network Security", "Python", "AWS Security", "Incident Response"],
-        "experience": "4+ years",
-        "salary": "$140,000 - $175,000",
-        "description": "Protect our systems and data from security threats and ensure compliance with security standards.",
-        "responsibilities": [
-            "Implement security measures and controls",
-            "Conduct security assessments and audits",
-            "Monitor for security incidents",
-            "Develop security policies and procedures"
-        ],
-        "requirements": [
-            "4+ years of cybersecurity experience",
-            "Knowledge of security frameworks and standards",
-            "Experience with cloud security (AWS)",
-            "Relevant certifications (CISSP, CISM) preferred"
-        ],
-        "posted_date": "2024-01-06"
-    },
-    {
-        "id": 11,
-        "title": "Database Administrator",
-        "company": "DataSystems Pro",
-        "location": "Atlanta, GA (Remote)",
-        "type": "Full-time",
-        "skills_required": ["SQL", "PostgreSQL", "MySQL", "Database Design", "Performance Tuning"],
-        "experience": "4+ years",
-        "salary": "$110,000 - $140,000",
-        "description": "Manage and optimize our database systems to ensure high performance and availability.",
-        "responsibilities": [
-            "Design and maintain database systems",
-            "Optimize database performance",
-            "Implement backup and recovery strategies",
-            "Ensure data security and integrity"
-        ],
-        "requirements": [
-            "4+ years of database administration experience",
-            "Proficiency in PostgreSQL and MySQL",
-            "Knowledge of database design and normalization",
-            "Experience with database performance tuning"
-        ],
-        "posted_date": "2024-01-05"
-    },
-    {
-        "id": 12,
-        "title": "Technical Lead",
-        "company": "LeadTech Solutions",
-        "location": "San Diego, CA (Hybrid)",
-        "type": "Full-time",
-        "skills_required": ["Java", "Spring Boot", "Microservices", "Team Leadership", "System Design"],
-        "experience": "7+ years",
-        "salary": "$150,000 - $190,000",
-        "description": "Lead a team of developers and drive technical excellence in our software development practices.",
-        "responsibilities": [
-            "Lead and mentor development team",
-            "Make technical decisions and set standards",
-            "Design system architecture",
-            "Coordinate with product and business stakeholders"
-        ],
-        "requirements": [
-            "7+ years of software development experience",
-            "2+ years in a technical leadership role",
-            "Strong knowledge of Java and Spring Boot",
-            "Experience with microservices architecture"
-        ],
-        "posted_date": "2024-01-04"
-    },
-    # Page 5
-    {
-        "id": 13,
-        "title": "AI/ML Engineer",
-        "company": "AIImpact Labs",
-        "location": "Research Triangle, NC (Remote)",
-        "type": "Full-time",
-        "skills_required": ["Python", "Machine Learning", "Deep Learning", "TensorFlow", "PyTorch"],
-        "experience": "3+ years",
-        "salary": "$135,000 - $165,000",
-        "description": "Develop and deploy machine learning models to solve complex business problems.",
-        "responsibilities": [
-            "Research and implement ML algorithms",
-            "Train and optimize machine learning models",
-            "Deploy models to production",
-            "Collaborate with data scientists and engineers"
-        ],
-        "requirements": [
-            "Master's or PhD in Computer Science or related field",
-            "3+ years of ML engineering experience",
-            "Proficiency in TensorFlow or PyTorch",
-            "Experience with ML deployment and MLOps"
-        ],
-        "posted_date": "2024-01-03"
-    },
-    {
-        "id": 14,
-        "title": "Cloud Solutions Architect",
-        "company": "CloudNative Inc",
-        "location": "Dallas, TX (Remote)",
-        "type": "Full-time",
-        "skills_required": ["AWS", "Azure", "Cloud Architecture", "Kubernetes", "Terraform"],
-        "experience": "6+ years",
-        "salary": "$145,000 - $180,000",
-        "description": "Design and implement cloud solutions that are scalable, secure, and cost-effective.",
-        "responsibilities": [
-            "Design cloud architecture solutions",
-            "Provide technical guidance to teams",
-            "Evaluate and recommend cloud technologies",
-            "Ensure solutions meet security and compliance requirements"
-        ],
-        "requirements": [
-            "6+ years of cloud architecture experience",
-            "Expertise in AWS and/or Azure",
-            "Relevant certifications (AWS Solutions Architect)",
-            "Experience with containerization and orchestration"
-        ],
-        "posted_date": "2024-01-02"
-    },
-    {
-        "id": 15,
-        "title": "Scrum Master",
-        "company": "AgileWorks",
-        "location": "Phoenix, AZ (Remote)",
-        "type": "Full-time",
-        "skills_required": ["Scrum", "Agile", "JIRA", "Team Facilitation", "Project Management"],
-        "experience": "4+ years",
-        "salary": "$100,000 - $130,000",
-        "description": "Facilitate Agile processes and help teams deliver high-quality software efficiently.",
-        "responsibilities": [
-            "Facilitate Scrum ceremonies",
-            "Remove impediments for the team",
-            "Coach team on Agile principles",
-            "Track and report on team progress"
-        ],
-        "requirements": [
-            "4+ years of experience as Scrum Master",
-            "CSM or PSM certification",
-            "Experience with Agile tools (JIRA)",
-            "Excellent facilitation and communication skills"
-        ],
-        "posted_date": "2024-01-01"
-    }
-]
+class JobMatchResponse(BaseModel):
+    user_id: int
+    skills: List[str]
+    matches: List[JobMatch]
+
+# Job catalog lives in a pluggable store (JOB_STORE=memory|sqlite|sqlalchemy);
+# only the search index's posting lists are held in process memory
+job_store = create_job_store()
+# Taken before the in-memory indexes are built, so writes made meanwhile by
+# other workers are pulled by the first catalog sync (applying one twice is harmless)
+catalog_position = job_store.change_position()
+# Keys the ETags and cached counts over the catalog; bumped by index_jobs
+catalog_version = 0
+catalog_version_lock = threading.Lock()
+
+# Built once at startup; /api/jobs answers keyword queries from this index
+SEARCH_MODES = ("relevance", "substring")
+JOB_SORTS = ("relevance", "date") + VALUE_SORTS
+job_search_index = JobSearchIndex()
+job_search_index.add_many(job_store.iter_jobs())
+total_count_cache = TotalCountCache()
+facet_count_cache = TotalCountCache()
+
+# Facet values accepted by the filters (type and skills are open-ended)
+FACET_CHOICES = {
+    "experience": {level for level, _, _ in EXPERIENCE_LEVELS} | {"unspecified"},
+    "work_mode": {"remote", "hybrid", "onsite"},
+}
+
+# Pre-encoded JSON per job; /api/jobs splices these instead of re-validating
+job_fragments = JobFragmentCache(Job.model_fields, max_entries=int(os.getenv("JOB_FRAGMENT_CACHE_SIZE", "50000")))
+
+# Sparse skill matrix used to rank jobs against a profile's skills
+skill_matcher = SkillMatcher()
+skill_matcher.add_many(job_store.iter_jobs())
+MAX_MATCHES = 100
+
+# Connections are pooled and reused; conn.close() returns them to the pool
+db_pool = SQLitePool(DATABASE_PATH, **pool_settings_from_env())
 
 def get_db_connection():
-    conn = sqlite3.connect(DATABASE_PATH)
-    conn.row_factory = sqlite3.Row
-    return conn
+    return db_pool.acquire()
+
+# Async handlers go through this; every statement runs on the DB executor
+async_db = AsyncSQLite(db_pool)
+
+# Throttles credential endpoints per client IP and per email, before any DB
+# or hashing work (RATE_LIMIT_BACKEND=memory|sqlite|off, RATE_LIMIT_<RULE>=n/seconds)
+RATE_LIMIT_RULES = {
+    "login_ip": RateRule.from_env("login_ip", 20, 60),
+    "login_email": RateRule.from_env("login_email", 5, 60),
+    "signup_ip": RateRule.from_env("signup_ip", 5, 60),
+    "forgot_password_ip": RateRule.from_env("forgot_password_ip", 5, 60),
+    "forgot_password_email": RateRule.from_env("forgot_password_email", 3, 900),
+}
+rate_limiter = create_rate_limiter(RATE_LIMIT_RULES, get_db_connection)
+
+def client_ip(request: Request) -> str:
+    if TRUST_PROXY_HEADERS:
+        forwarded = request.headers.get("x-forwarded-for")
+        if forwarded:
+            return forwarded.split(",")[0].strip()
+    return request.client.host if request.client else "unknown"
+
+async def enforce_rate_limit(*hits):
+    if rate_limiter is None:
+        return
+    if rate_limiter.blocking:
+        retry_after = await run_db(rate_limiter.check, *hits)
+    else:
+        retry_after = rate_limiter.check(*hits)
+    if retry_after:
+        raise HTTPException(
+            status_code=429,
+            detail="Too many attempts, please try again later",
+            headers={"Retry-After": str(math.ceil(retry_after))}
+        )
+
+# Read-through cache for user_profiles rows (PROFILE_CACHE_SIZE / _TTL)
+profile_cache = create_cache("PROFILE")
+
+async def load_profile(user_id: int):
+    profile = profile_cache.get(user_id)
+    if profile is None:
+        row = await async_db.run(lambda conn: conn.execute(
+            "SELECT * FROM user_profiles WHERE user_id = ?", (user_id,)
+        ).fetchone())
+        if row is None:
+            return None
+        profile = dict(row)
+        profile_cache.set(user_id, profile)
+    return profile
 
 def init_db():
     conn = get_db_connection()
@@ -517,115 +331,422 @@ def init_db():
             FOREIGN KEY (user_id) REFERENCES users (id)
         )
     ''')
-    conn.execute('CREATE INDEX IF NOT EXISTS idx_reset_tokens_token ON password_reset_tokens(token)')
+    # token is UNIQUE, so SQLite already indexes it for lookups; the per-user
+    # cap uses a partial index over unused tokens only, and the sweeper
+    # finds expired rows by expires_at
+    conn.execute('DROP INDEX IF EXISTS idx_reset_tokens_token')
+    conn.execute(
+        'CREATE INDEX IF NOT EXISTS idx_reset_tokens_user_live ON password_reset_tokens(user_id, id) WHERE used = 0'
+    )
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_reset_tokens_expires ON password_reset_tokens(expires_at)')
+
+    # Precomputed top-K recommendations, plus a skill -> user index so a new
+    # job only re-scores users who list one of its skills
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS job_recommendations (
+            user_id INTEGER NOT NULL,
+            rank INTEGER NOT NULL,
+            job_id INTEGER NOT NULL,
+            score INTEGER NOT NULL,
+            coverage REAL NOT NULL,
+            updated_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+            PRIMARY KEY (user_id, rank),
+            FOREIGN KEY (user_id) REFERENCES users (id)
+        )
+    ''')
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS user_skills (
+            user_id INTEGER NOT NULL,
+            skill TEXT NOT NULL,
+            PRIMARY KEY (user_id, skill),
+            FOREIGN KEY (user_id) REFERENCES users (id)
+        )
+    ''')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_user_skills_skill ON user_skills(skill)')
+
+    # Revoked session tokens, mirrored into memory by the sync task
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS revoked_tokens (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            jti TEXT UNIQUE NOT NULL,
+            user_id INTEGER NOT NULL,
+            expires_at INTEGER NOT NULL,
+            revoked_at DATETIME DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_revoked_tokens_expires ON revoked_tokens(expires_at)')
     conn.commit()
     conn.close()
 
 init_db()
 
-def hash_password(password: str) -> str:
-    return hashlib.sha256(password.encode()).hexdigest()
+recommendation_builder = RecommendationBuilder(get_db_connection, skill_matcher)
+
+def register_jobs(jobs, refresh_recommendations=True):
+    # Single write path for new or updated jobs: store first, then every
+    # in-memory index, then the users whose recommendations they affect.
+    # Bulk ingest defers the recommendation refresh to the end of the stream.
+    jobs = list(jobs)
+    job_store.add_many(jobs)
+    index_jobs(jobs)
+    if refresh_recommendations:
+        recommendation_builder.jobs_added(jobs)
+
+def index_jobs(jobs):
+    # Jobs already in the store, written here or pulled from another worker.
+    # The catalog version moves only once every index has them, so a request
+    # that read the old indexes can't cache its answer under the new version.
+    global catalog_version
+    job_fragments.invalidate(job['id'] for job in jobs)
+    job_search_index.add_many(jobs)
+    skill_matcher.add_many(jobs)
+    with catalog_version_lock:
+        catalog_version += 1
+
+def pull_catalog_changes():
+    """Index jobs other workers wrote to the shared store since the last pull.
+
+    Their recommendations were already refreshed by the worker that wrote
+    them; this worker's own writes come back too, and re-indexing an
+    unchanged job is a no-op.
+    """
+    global catalog_position
+    pulled = 0
+    while True:
+        jobs, catalog_position = job_store.changes_since(catalog_position, CATALOG_SYNC_BATCH)
+        if not jobs:
+            return pulled
+        index_jobs(jobs)
+        pulled += len(jobs)
+
+def hashing_busy_error():
+    # The hashing queue is full; shed the request rather than pile up behind it
+    return HTTPException(
+        status_code=503,
+        detail="Server busy, please try again shortly",
+        headers={"Retry-After": "1"}
+    )
 
 def generate_reset_token():
     return secrets.token_urlsafe(32)
 
+def unauthorized(detail: str):
+    return HTTPException(status_code=401, detail=detail, headers={"WWW-Authenticate": "Bearer"})
+
+def get_token_claims(authorization: Optional[str] = Header(None)):
+    # Signature, expiry and revocation are all checked in memory
+    scheme, _, token = (authorization or "").partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        raise unauthorized("Not authenticated")
+    try:
+        return token_service.decode(token)
+    except TokenError as e:
+        raise unauthorized(str(e))
+
+def require_profile_owner(user_id: int, claims: dict = Depends(get_token_claims)):
+    # A valid token proves the user exists, so profile routes don't re-check users
+    if claims["sub"] != str(user_id):
+        raise HTTPException(status_code=403, detail="Not allowed to access this profile")
+    return claims
+
 @app.get("/")
-def root():
+async def root():
     return {"message": "Auth API is running"}
 
+def require_admin(x_admin_token: Optional[str] = Header(None)):
+    if not ADMIN_API_TOKEN:
+        if ADMIN_ROUTES_OPEN:
+            return
+        raise HTTPException(status_code=403, detail="Admin routes are disabled: ADMIN_API_TOKEN is not set")
+    if not secrets.compare_digest(x_admin_token or "", ADMIN_API_TOKEN):
+        raise HTTPException(status_code=403, detail="Admin token required")
+
+@app.get("/api/admin/cache", dependencies=[Depends(require_admin)])
+async def get_cache_stats():
+    return {"profiles": profile_cache.stats(), "job_fragments": job_fragments.stats()}
+
+@app.get("/api/admin/rate-limits", dependencies=[Depends(require_admin)])
+async def get_rate_limit_stats():
+    if rate_limiter is None:
+        return {"backend": "off"}
+    if rate_limiter.blocking:
+        return await run_db(rate_limiter.stats)
+    return rate_limiter.stats()
+
+@app.get("/api/admin/slow-queries", dependencies=[Depends(require_admin)])
+async def get_slow_queries(limit: int = Query(50, ge=1, le=500), order: str = "total"):
+    # Off unless SLOW_QUERY_MS is set; aggregated per process since startup or the last reset
+    if order not in SLOW_QUERY_ORDERS:
+        raise HTTPException(status_code=400, detail=f"Invalid order: {order}")
+    if slow_query_log is None:
+        return {"enabled": False}
+    return {"enabled": True, **slow_query_log.stats(limit, order)}
+
+@app.delete("/api/admin/slow-queries", dependencies=[Depends(require_admin)])
+async def reset_slow_queries():
+    if slow_query_log is not None:
+        slow_query_log.reset()
+    return {"message": "Slow query log cleared"}
+
+@app.get("/api/admin/db-pool", dependencies=[Depends(require_admin)])
+async def get_db_pool_stats():
+    stats = {"auth": db_pool.stats()}
+    jobs_pool = getattr(job_store, "pool", None)
+    if jobs_pool is not None:
+        stats["jobs"] = jobs_pool.stats()
+    return stats
+
+def _pool_gauge(field):
+    def read():
+        pools = [db_pool, getattr(job_store, "pool", None)]
+        return {(pool.name,): pool.stats()[field] for pool in pools if pool is not None}
+    return read
+
+registry.gauge_callback("db_pool_connections", "Open pooled SQLite connections", _pool_gauge("size"), ("database",))
+registry.gauge_callback("db_pool_in_use", "Pooled SQLite connections checked out", _pool_gauge("in_use"), ("database",))
+registry.gauge_callback(
+    "password_hash_in_flight", "Hash and verify jobs queued or running",
+    lambda: {(): password_hasher.in_flight}
+)
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    # Per process: with several workers, Prometheus scrapes each one
+    return Response(registry.render(), media_type=CONTENT_TYPE)
+
 @app.post("/api/signup", response_model=UserResponse)
-def signup(user: UserCreate):
+async def signup(user: UserCreate, http_request: Request):
+    await enforce_rate_limit(("signup_ip", client_ip(http_request)))
     try:
-        conn = get_db_connection()
-        existing = conn.execute(
+        existing = await async_db.run(lambda conn: conn.execute(
             "SELECT id FROM users WHERE email = ?", (user.email,)
-        ).fetchone()
+        ).fetchone())
         
         if existing:
             # Return 400 with specific message instead of 500
-            conn.close()
             raise HTTPException(status_code=400, detail="User Already Exists! Please, Try Again")
         
-        password_hash = hash_password(user.password)
-        cursor = conn.cursor()
-        cursor.execute(
-            "INSERT INTO users (email, hashed_password) VALUES (?, ?)",
-            (user.email, password_hash)
-        )
-        user_id = cursor.lastrowid
-        
-        # Create empty profile for new user
-        cursor.execute(
-            """INSERT INTO user_profiles (user_id, email) 
-               VALUES (?, ?)""",
-            (user_id, user.email)
-        )
-        
-        conn.commit()
-        
-        new_user = conn.execute(
-            "SELECT id, email FROM users WHERE id = ?", (user_id,)
-        ).fetchone()
-        conn.close()
+        # Hashed before taking a connection, so a signup burst queues on the
+        # hashing pool without tying up DB connections
+        password_hash = await password_hasher.hash(user.password)
+
+        def create_user(conn):
+            try:
+                result = conn.execute(
+                    "INSERT INTO users (email, hashed_password) VALUES (?, ?)",
+                    (user.email, password_hash)
+                )
+            except sqlite3.IntegrityError:
+                # Another signup for the same email won the race
+                conn.rollback()
+                return None
+            user_id = result.lastrowid
+            
+            # Create empty profile for new user
+            conn.execute(
+                """INSERT INTO user_profiles (user_id, email) 
+                   VALUES (?, ?)""",
+                (user_id, user.email)
+            )
+            
+            conn.commit()
+            
+            return conn.execute(
+                "SELECT id, email FROM users WHERE id = ?", (user_id,)
+            ).fetchone()
+
+        new_user = await async_db.run(create_user)
+        if new_user is None:
+            raise HTTPException(status_code=400, detail="User Already Exists! Please, Try Again")
+        user_id = new_user['id']
+
+        # Drop anything cached under a reused id
+        profile_cache.delete(user_id)
         
         return dict(new_user)
         
     except HTTPException:
         # Re-raise HTTP exceptions (like our 400 error)
         raise
+    except HashingBusy:
+        raise hashing_busy_error()
     except Exception as e:
         # Only catch unexpected errors and return 500
         raise HTTPException(status_code=500, detail=f"Server error: {str(e)}")
 
 @app.post("/api/login")
-def login(user: UserCreate):
+async def login(user: UserCreate, http_request: Request):
+    await enforce_rate_limit(
+        ("login_ip", client_ip(http_request)), ("login_email", user.email.strip().lower())
+    )
     try:
-        conn = get_db_connection()
-        db_user = conn.execute(
+        db_user = await async_db.run(lambda conn: conn.execute(
             "SELECT * FROM users WHERE email = ?", (user.email,)
-        ).fetchone()
-        conn.close()
+        ).fetchone())
         
         if not db_user:
             raise HTTPException(status_code=401, detail="Incorrect Credentials, Try Again")
         
-        password_hash = hash_password(user.password)
-        if db_user['hashed_password'] != password_hash:
+        matches, upgraded_hash = await password_hasher.verify(user.password, db_user['hashed_password'])
+        if not matches:
             raise HTTPException(status_code=401, detail="Incorrect Credentials, Try Again")
+
+        if upgraded_hash:
+            # Legacy SHA-256 or outdated cost parameters: store the new hash
+            def store_upgraded_hash(conn):
+                conn.execute(
+                    "UPDATE users SET hashed_password = ? WHERE id = ?",
+                    (upgraded_hash, db_user['id'])
+                )
+                conn.commit()
+            await async_db.run(store_upgraded_hash)
         
         return {
             "message": "Login successful", 
             "user_id": db_user['id'],
-            "email": db_user['email']
+            "email": db_user['email'],
+            **token_service.issue_pair(db_user['id'], db_user['email'])
         }
         
+    except HTTPException:
+        raise
+    except HashingBusy:
+        raise hashing_busy_error()
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Server error: {str(e)}")
+
+@app.post("/api/token/refresh")
+async def refresh_token(request: RefreshTokenRequest):
+    try:
+        try:
+            claims = token_service.decode(request.refresh_token, expected_type=REFRESH)
+        except TokenError as e:
+            raise unauthorized(str(e))
+
+        # Refresh tokens are single use: rotate, and revoke the one presented.
+        # The in-memory check in decode() can race; the revocation insert
+        # can't, so only the request that records it gets new tokens
+        if not await async_db.run(token_service.revoke, claims):
+            raise unauthorized("Token has been revoked")
+        return token_service.issue_pair(int(claims["sub"]), claims["email"])
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Server error: {str(e)}")
+
+@app.post("/api/logout")
+async def logout(request: LogoutRequest = None, claims: dict = Depends(get_token_claims)):
+    try:
+        await async_db.run(token_service.revoke, claims)
+        if request and request.refresh_token:
+            try:
+                refresh_claims = token_service.decode(request.refresh_token, expected_type=REFRESH)
+            except TokenError:
+                refresh_claims = None
+            if refresh_claims and refresh_claims["sub"] == claims["sub"]:
+                await async_db.run(token_service.revoke, refresh_claims)
+
+        return {"message": "Logged out"}
+
     except HTTPException:
         raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Server error: {str(e)}")
 
 @app.get("/api/profile/{user_id}", response_model=UserProfileResponse)
-def get_user_profile(user_id: int):
+async def get_user_profile(user_id: int, response: Response, if_none_match: Optional[str] = Header(None),
+                           claims: dict = Depends(require_profile_owner)):
     try:
-        conn = get_db_connection()
-        profile = conn.execute(
-            """SELECT * FROM user_profiles WHERE user_id = ?""",
-            (user_id,)
-        ).fetchone()
-        conn.close()
+        profile = await load_profile(user_id)
         
         if not profile:
             raise HTTPException(status_code=404, detail="Profile not found")
-        
-        return dict(profile)
+
+        # updated_at changes on every write; location_known only changes with
+        # the gazetteer, which is loaded once per process
+        location_known = gazetteer.locate_zip(profile['zip_code']) is not None
+        etag = make_etag("profile", user_id, profile['updated_at'], location_known)
+        if etag_matches(if_none_match, etag):
+            return not_modified(etag, PROFILE_CACHE_CONTROL)
+
+        response.headers["ETag"] = etag
+        response.headers["Cache-Control"] = PROFILE_CACHE_CONTROL
+        return {**profile, "location_known": location_known}
         
     except HTTPException:
         raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Server error: {str(e)}")
 
+def format_matches(skills, ranked):
+    jobs = {job['id']: job for job in job_store.get_many(job_id for job_id, _, _ in ranked)}
+    user_skills = set(skills)
+    matches = []
+    for job_id, overlap, coverage in ranked:
+        job = jobs.get(job_id)
+        if job is None:
+            continue
+        matches.append({
+            "job": job,
+            "match_score": overlap,
+            "coverage": round(coverage, 4),
+            "matched_skills": [
+                skill for skill in job['skills_required']
+                if normalize_skill(skill) in user_skills
+            ]
+        })
+    return matches
+
+@app.get("/api/profile/{user_id}/matches", response_model=JobMatchResponse)
+async def get_profile_matches(user_id: int, limit: int = 10, claims: dict = Depends(require_profile_owner)):
+    try:
+        if limit < 1 or limit > MAX_MATCHES:
+            raise HTTPException(status_code=400, detail=f"limit must be between 1 and {MAX_MATCHES}")
+
+        profile = await load_profile(user_id)
+
+        if not profile:
+            raise HTTPException(status_code=404, detail="Profile not found")
+
+        skills = parse_profile_skills(profile['skills'])
+        ranked = await run_cpu(skill_matcher.top_k, skills, limit)
+        matches = await run_db(format_matches, skills, ranked)
+
+        return {"user_id": user_id, "skills": skills, "matches": matches}
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Server error: {str(e)}")
+
+@app.get("/api/profile/{user_id}/recommendations", response_model=JobMatchResponse)
+async def get_profile_recommendations(user_id: int, claims: dict = Depends(require_profile_owner)):
+    try:
+        skills, ranked = await run_db(recommendation_builder.get, user_id)
+
+        if not ranked and not skills:
+            # Nothing precomputed yet (e.g. profile saved before the first
+            # batch build); fill it in now so the next load is a plain read
+            profile = await load_profile(user_id)
+
+            if not profile:
+                raise HTTPException(status_code=404, detail="Profile not found")
+
+            skills = parse_profile_skills(profile['skills'])
+            ranked = await run_db(recommendation_builder.refresh_user, user_id, profile['skills'])
+
+        matches = await run_db(format_matches, skills, ranked)
+        return {"user_id": user_id, "skills": skills, "matches": matches}
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Server error: {str(e)}")
+
 @app.put("/api/profile/{user_id}")
-def update_user_profile(user_id: int, profile: ProfileUpdate):
+async def update_user_profile(user_id: int, profile: ProfileUpdate, background_tasks: BackgroundTasks,
+                              claims: dict = Depends(require_profile_owner)):
     try:
         # Validation checks
         if not profile.first_name or not profile.first_name.strip():
@@ -645,16 +766,6 @@ def update_user_profile(user_id: int, profile: ProfileUpdate):
         if not profile.skills or not profile.skills.strip():
             raise HTTPException(status_code=400, detail="Skills are required")
 
-        conn = get_db_connection()
-        
-        # Check if user exists
-        user = conn.execute(
-            "SELECT id FROM users WHERE id = ?", (user_id,)
-        ).fetchone()
-        
-        if not user:
-            raise HTTPException(status_code=404, detail="User not found")
-        
         # Build update query dynamically based on provided fields
         update_fields = []
         values = []
@@ -667,8 +778,9 @@ def update_user_profile(user_id: int, profile: ProfileUpdate):
         if not update_fields:
             raise HTTPException(status_code=400, detail="No fields to update")
         
-        # Add updated_at timestamp
-        update_fields.append("updated_at = datetime('now')")
+        # Add updated_at timestamp; millisecond precision so two saves in
+        # the same second still produce different ETags
+        update_fields.append("updated_at = strftime('%Y-%m-%d %H:%M:%f', 'now')")
         
         values.append(user_id)
         
@@ -677,25 +789,33 @@ def update_user_profile(user_id: int, profile: ProfileUpdate):
             SET {', '.join(update_fields)}
             WHERE user_id = ?
         """
-        
-        cursor = conn.cursor()
-        cursor.execute(query, values)
-        
-        if cursor.rowcount == 0:
-            # Profile doesn't exist, create one
-            cursor.execute(
-                """INSERT INTO user_profiles 
-                   (user_id, email, first_name, last_name, phone, skills, experience, 
-                    city, state, zip_code, availability, linkedin_profile, github_profile, resume_cv)
-                   VALUES (?, (SELECT email FROM users WHERE id = ?), ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
-                (user_id, user_id, profile.first_name, profile.last_name, profile.phone,
-                 profile.skills, profile.experience, profile.city, profile.state,
-                 profile.zip_code, profile.availability, profile.linkedin_profile,
-                 profile.github_profile, profile.resume_cv)
-            )
-        
-        conn.commit()
-        conn.close()
+
+        def write_profile(conn):
+            # The token already vouches for the user, so go straight to the write
+            result = conn.execute(query, values)
+            
+            if result.rowcount == 0:
+                # Profile doesn't exist, create one
+                conn.execute(
+                    """INSERT INTO user_profiles 
+                       (user_id, email, first_name, last_name, phone, skills, experience, 
+                        city, state, zip_code, availability, linkedin_profile, github_profile, resume_cv)
+                       VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+                    (user_id, claims["email"], profile.first_name, profile.last_name, profile.phone,
+                     profile.skills, profile.experience, profile.city, profile.state,
+                     profile.zip_code, profile.availability, profile.linkedin_profile,
+                     profile.github_profile, profile.resume_cv)
+                )
+            
+            conn.commit()
+
+        await async_db.run(write_profile)
+
+        # Invalidate after the commit so a reload sees the new row
+        profile_cache.delete(user_id)
+
+        # Only this user's recommendations depend on their skills
+        background_tasks.add_task(run_db, recommendation_builder.refresh_user, user_id, profile.skills)
         
         return {"message": "Profile updated successfully"}
         
@@ -705,110 +825,545 @@ def update_user_profile(user_id: int, profile: ProfileUpdate):
         raise HTTPException(status_code=500, detail=f"Server error: {str(e)}")
 
 @app.post("/api/forgot-password")
-def forgot_password(request: ForgotPasswordRequest):
+async def forgot_password(request: ForgotPasswordRequest, http_request: Request):
+    await enforce_rate_limit(
+        ("forgot_password_ip", client_ip(http_request)), ("forgot_password_email", request.email.strip().lower())
+    )
     try:
-        conn = get_db_connection()
-        user = conn.execute(
-            "SELECT id FROM users WHERE email = ?", (request.email,)
-        ).fetchone()
-        
-        if not user:
-            conn.close()
+        def issue_reset_token(conn):
+            user = conn.execute(
+                "SELECT id FROM users WHERE email = ?", (request.email,)
+            ).fetchone()
+            
+            if not user:
+                return None
+            
+            token = generate_reset_token()
+            conn.execute(
+                "INSERT INTO password_reset_tokens (user_id, token, expires_at) VALUES (?, ?, datetime('now', '+1 hour'))",
+                (user['id'], token)
+            )
+            # Only the newest MAX_LIVE_RESET_TOKENS links keep working
+            conn.execute(
+                """DELETE FROM password_reset_tokens
+                   WHERE user_id = ? AND used = 0 AND id NOT IN (
+                       SELECT id FROM password_reset_tokens
+                       WHERE user_id = ? AND used = 0 ORDER BY id DESC LIMIT ?
+                   )""",
+                (user['id'], user['id'], MAX_LIVE_RESET_TOKENS)
+            )
+            conn.commit()
+            return token
+
+        token = await async_db.run(issue_reset_token)
+        if token is None:
             return {"message": "If the email exists, a password reset link has been sent."}
         
-        token = generate_reset_token()
-        cursor = conn.cursor()
-        cursor.execute(
-            "INSERT INTO password_reset_tokens (user_id, token, expires_at) VALUES (?, ?, datetime('now', '+1 hour'))",
-            (user['id'], token)
-        )
-        conn.commit()
-        conn.close()
-        
         return {"message": "If the email exists, a password reset link has been sent.", "token": token}
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Server error: {str(e)}")
 
 @app.post("/api/reset-password")
-def reset_password(request: ResetPasswordRequest):
+async def reset_password(request: ResetPasswordRequest):
     try:
-        conn = get_db_connection()
-        token_record = conn.execute(
-            """SELECT * FROM password_reset_tokens 
-               WHERE token = ? AND used = 0 AND expires_at > datetime('now')""",
-            (request.token,)
-        ).fetchone()
-        
+        def load_token(conn):
+            token_record = conn.execute(
+                """SELECT * FROM password_reset_tokens 
+                   WHERE token = ? AND used = 0 AND expires_at > datetime('now')""",
+                (request.token,)
+            ).fetchone()
+            if not token_record:
+                return None, None
+            user = conn.execute(
+                "SELECT hashed_password FROM users WHERE id = ?", (token_record['user_id'],)
+            ).fetchone()
+            return token_record, user
+
+        token_record, user = await async_db.run(load_token)
         if not token_record:
             raise HTTPException(status_code=400, detail="Invalid or expired reset token")
         
-        # Check if new password is same as old password
-        user = conn.execute(
-            "SELECT hashed_password FROM users WHERE id = ?", (token_record['user_id'],)
-        ).fetchone()
-        
+        # Verify and hash with no connection checked out; argon2 and its
+        # queue can take far longer than the statements
         if user:
-            new_password_hash = hash_password(request.new_password)
-            if user['hashed_password'] == new_password_hash:
+            same_password, _ = await password_hasher.verify(request.new_password, user['hashed_password'])
+            if same_password:
                 raise HTTPException(status_code=400, detail="New Password Cannot be Same As Old Password")
         
-        cursor = conn.cursor()
-        cursor.execute(
-            "UPDATE users SET hashed_password = ? WHERE id = ?",
-            (new_password_hash, token_record['user_id'])
-        )
-        cursor.execute(
-            "UPDATE password_reset_tokens SET used = 1 WHERE id = ?",
-            (token_record['id'],)
-        )
-        conn.commit()
-        conn.close()
+        new_password_hash = await password_hasher.hash(request.new_password)
+
+        def apply_reset(conn):
+            # The token is claimed here, not when it was read: of two resets
+            # racing with the same token only one finds it still unused
+            claimed = conn.execute(
+                """UPDATE password_reset_tokens SET used = 1
+                   WHERE id = ? AND used = 0 AND expires_at > datetime('now')""",
+                (token_record['id'],)
+            ).rowcount
+            if not claimed:
+                conn.rollback()
+                return False
+            conn.execute(
+                "UPDATE users SET hashed_password = ? WHERE id = ?",
+                (new_password_hash, token_record['user_id'])
+            )
+            conn.commit()
+            return True
+
+        if not await async_db.run(apply_reset):
+            raise HTTPException(status_code=400, detail="Invalid or expired reset token")
         
         return {"message": "Password reset successfully"}
         
     except HTTPException:
         raise
+    except HashingBusy:
+        raise hashing_busy_error()
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Server error: {str(e)}")
 
-@app.get("/api/jobs", response_model=JobSearchResponse)
-def search_jobs(search: str = None, page: int = 1, per_page: int = 3):
+def fetch_job_page(kind, search, offset, per_page, after, include_total, filters=None, include_facets=False,
+                   sort="relevance"):
+    # One extra row tells us whether there is a next page without counting
+    if kind == "relevance":
+        total_jobs, ranked = job_search_index.search(
+            search, limit=offset + per_page + 1, after=after, filters=filters, sort=sort
+        )
+        window = ranked[offset:offset + per_page + 1]
+        has_next = len(window) > per_page
+        window = window[:per_page]
+        # Cached fragments only need the ids; the store is read for misses
+        fragments = job_fragments.for_ids((job_id for _, job_id, _ in window), job_store.get_many)
+        last_key = None
+        if window:
+            score, job_id, posted_date = window[-1]
+            # Salary and distance sorts resume from (value, id); the rest from (score, date, id)
+            last_key = [score, job_id] if sort in VALUE_SORTS else [score, posted_date, job_id]
+    else:
+        # Browsing and the substring compatibility mode filter and
+        # paginate inside the store
+        rows = job_store.list_jobs(search, offset=offset, limit=per_page + 1, after=after)
+        has_next = len(rows) > per_page
+        jobs = rows[:per_page]
+        fragments = job_fragments.for_jobs(jobs)
+        last_key = list(catalog_sort_key(jobs[-1])) if jobs else None
+        total_jobs = None
+        if include_total:
+            total_jobs = total_count_cache.get(
+                (kind, search), catalog_version, lambda: job_store.count(search)
+            )
+
+    if not include_total:
+        total_jobs = None
+
+    # Counts come from facet bitmaps, per query, until the catalog changes;
+    # substring mode has no index behind it, so no facets
+    facets = None
+    if include_facets and kind != "substring":
+        facets = facet_count_cache.get(
+            search_scope(search, filters), catalog_version,
+            lambda: job_search_index.facet_counts(search, filters)
+        )
+    return fragments, total_jobs, has_next, last_key, facets
+
+def parse_job_lines(lines, first_line_no):
+    # Returns (jobs, errors); later lines win when an id repeats in a chunk
+    jobs = {}
+    errors = []
+    for line_no, raw in enumerate(lines, start=first_line_no):
+        if not raw.strip():
+            continue
+        if len(raw) > MAX_BULK_LINE_BYTES:
+            errors.append({"line": line_no, "error": "Line too long"})
+            continue
+        try:
+            job = Job.model_validate(orjson.loads(raw)).model_dump()
+        except orjson.JSONDecodeError as e:
+            errors.append({"line": line_no, "error": f"Invalid JSON: {e}"})
+            continue
+        except ValidationError as e:
+            details = "; ".join(
+                f"{'.'.join(str(part) for part in err['loc']) or 'record'}: {err['msg']}"
+                for err in e.errors()
+            )
+            errors.append({"line": line_no, "error": details})
+            continue
+        jobs[job['id']] = job
+    return list(jobs.values()), errors
+
+async def ingest_job_lines(lines, first_line_no):
+    jobs, errors = await run_cpu(parse_job_lines, lines, first_line_no)
+    if jobs:
+        await run_db(register_jobs, jobs, False)
+    return len(jobs), errors, job_skills(jobs)
+
+@app.post("/api/jobs/bulk", dependencies=[Depends(require_admin)])
+async def bulk_ingest_jobs(request: Request, background_tasks: BackgroundTasks):
+    """Ingest a streamed NDJSON body with one Job per line.
+
+    The body is never held in full: lines are validated and written in
+    chunks of BULK_CHUNK_SIZE, each in its own transaction, while the next
+    chunk is being read. Invalid lines are skipped and reported.
+    """
     try:
-        # Filter jobs based on search query
-        filtered_jobs = SAMPLE_JOBS
-        if search:
-            search_lower = search.lower()
-            filtered_jobs = [
-                job for job in SAMPLE_JOBS
-                if (search_lower in job['title'].lower() or 
-                    search_lower in job['company'].lower() or
-                    any(search_lower in skill.lower() for skill in job['skills_required']))
-            ]
-        
-        # Calculate pagination
-        total_jobs = len(filtered_jobs)
-        total_pages = (total_jobs + per_page - 1) // per_page
-        start_index = (page - 1) * per_page
-        end_index = start_index + per_page
-        
-        # Get jobs for current page
-        paginated_jobs = filtered_jobs[start_index:end_index]
-        
+        accepted = 0
+        error_count = 0
+        errors = []
+        skills = set()
+        line_no = 0
+        lines = []
+        buffer = b""
+        pending = None
+
+        def collect(result):
+            nonlocal accepted, error_count
+            count, chunk_errors, chunk_skills = result
+            accepted += count
+            error_count += len(chunk_errors)
+            errors.extend(chunk_errors[:MAX_BULK_ERRORS - len(errors)])
+            skills.update(chunk_skills)
+
+        async def flush():
+            # At most one chunk is being written while the next one fills
+            nonlocal pending, lines
+            if pending is not None:
+                collect(await pending)
+            pending = asyncio.create_task(ingest_job_lines(lines, line_no - len(lines) + 1))
+            lines = []
+
+        async for piece in request.stream():
+            buffer += piece
+            *complete, buffer = buffer.split(b"\n")
+            for raw in complete:
+                line_no += 1
+                lines.append(raw)
+                if len(lines) >= BULK_CHUNK_SIZE:
+                    await flush()
+            if len(buffer) > MAX_BULK_LINE_BYTES:
+                raise HTTPException(status_code=413, detail=f"Line {line_no + 1} is too long")
+        if buffer.strip():
+            line_no += 1
+            lines.append(buffer)
+        if lines:
+            await flush()
+        if pending is not None:
+            collect(await pending)
+
+        # One recommendation refresh for everything ingested, after the response
+        if skills:
+            background_tasks.add_task(run_db, recommendation_builder.skills_added, skills)
+
         return {
-            "jobs": paginated_jobs,
+            "lines": line_no,
+            "accepted": accepted,
+            "rejected": error_count,
+            "errors": errors,
+            "errors_truncated": error_count > len(errors)
+        }
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Server error: {str(e)}")
+
+def job_filters(type: List[str] = Query(None), experience: List[str] = Query(None),
+                work_mode: List[str] = Query(None), skill: List[str] = Query(None),
+                min_salary: Optional[int] = None, max_salary: Optional[int] = None,
+                salary_match: str = "overlap", near_zip: Optional[str] = None,
+                radius_miles: Optional[float] = None):
+    """Facet, salary and distance filters from query params, normalized to index values.
+
+    min_salary/max_salary are annual amounts. By default a job matches when
+    its salary range overlaps [min_salary, max_salary]; with
+    salary_match=within the whole range has to fit inside it. near_zip
+    keeps jobs within radius_miles (default DEFAULT_RADIUS_MILES) of the
+    zip code, plus every remote job.
+    """
+    filters = {}
+    for field, values in (("type", type), ("experience", experience),
+                          ("work_mode", work_mode), ("skills", skill)):
+        values = [normalize_facet_value(field, value) for value in values or [] if value.strip()]
+        if not values:
+            continue
+        choices = FACET_CHOICES.get(field)
+        invalid = [value for value in values if choices is not None and value not in choices]
+        if invalid:
+            raise HTTPException(status_code=400, detail=f"Invalid {field} filter: {', '.join(invalid)}")
+        filters[field] = sorted(set(values))
+
+    if salary_match not in SALARY_MATCHES:
+        raise HTTPException(status_code=400, detail=f"Invalid salary_match: {salary_match}")
+    if min_salary is not None and max_salary is not None and min_salary > max_salary:
+        raise HTTPException(status_code=400, detail="min_salary must not exceed max_salary")
+    if min_salary is not None or max_salary is not None:
+        filters["salary"] = [min_salary, max_salary, salary_match]
+
+    if radius_miles is not None and not near_zip:
+        raise HTTPException(status_code=400, detail="radius_miles requires near_zip")
+    if near_zip:
+        radius = DEFAULT_RADIUS_MILES if radius_miles is None else radius_miles
+        if not 0 < radius <= MAX_RADIUS_MILES:
+            raise HTTPException(status_code=400, detail=f"radius_miles must be between 0 and {MAX_RADIUS_MILES}")
+        coords = gazetteer.locate_zip(near_zip)
+        if coords is None:
+            raise HTTPException(status_code=400, detail=f"Unknown zip code: {near_zip}")
+        filters["near"] = [coords[0], coords[1], radius]
+    return filters
+
+def search_kind(search, mode, filters=None, sort="relevance"):
+    if mode == "substring" and (filters or sort in VALUE_SORTS):
+        raise HTTPException(status_code=400, detail="Filters and value sorts are not supported in substring mode")
+    if sort == DISTANCE_SORT and not (filters or {}).get("near"):
+        raise HTTPException(status_code=400, detail="sort=distance requires near_zip")
+    if not search and not filters and sort not in VALUE_SORTS:
+        return "browse"
+    if mode == "substring":
+        return "substring"
+    return "relevance"
+
+def search_scope(search, filters, sort="relevance"):
+    # What a cursor or cached count is bound to: the query, its filters and
+    # any non-default sort order
+    if not filters and sort == "relevance":
+        return search
+    if sort == "relevance":
+        return orjson.dumps([search or "", filters], option=orjson.OPT_SORT_KEYS).decode()
+    return orjson.dumps([search or "", filters or {}, sort], option=orjson.OPT_SORT_KEYS).decode()
+
+def iter_job_export(kind, search, filters=None):
+    # Page by page, each page a fresh index lookup or store query, so
+    # nothing is held between batches
+    fields = tuple(Job.model_fields)
+    after = None
+    while True:
+        if kind == "relevance":
+            # Every match, unranked: ids come from the index, documents from the store
+            job_ids = job_search_index.matching_ids(search, filters, after=after, limit=EXPORT_BATCH_SIZE)
+            if not job_ids:
+                return
+            jobs = job_store.get_many(job_ids)
+            after = job_ids[-1]
+        else:
+            jobs = job_store.list_jobs(search if kind == "substring" else None, limit=EXPORT_BATCH_SIZE, after=after)
+            if not jobs:
+                return
+            after = catalog_sort_key(jobs[-1])
+        yield [{field: job[field] for field in fields} for job in jobs]
+
+@app.get("/api/jobs/export", dependencies=[Depends(require_admin)])
+async def export_jobs(search: str = None, mode: str = "relevance", format: str = "ndjson",
+                      filters: dict = Depends(job_filters)):
+    """Stream every job matching the same filters as /api/jobs, as NDJSON or CSV."""
+    if mode not in SEARCH_MODES:
+        raise HTTPException(status_code=400, detail=f"Invalid search mode: {mode}")
+    if format not in EXPORT_FORMATS:
+        raise HTTPException(status_code=400, detail=f"Invalid export format: {format}")
+    batches = iter_job_export(search_kind(search, mode, filters), search, filters)
+    return export_response(batches, format, Job.model_fields, "jobs")
+
+def iter_profile_export(skill, city, state, updated_since):
+    clauses = []
+    params = []
+    if skill:
+        clauses.append("user_id IN (SELECT user_id FROM user_skills WHERE skill = ?)")
+        params.append(normalize_skill(skill))
+    if city:
+        clauses.append("lower(city) = lower(?)")
+        params.append(city.strip())
+    if state:
+        clauses.append("lower(state) = lower(?)")
+        params.append(state.strip())
+    if updated_since:
+        clauses.append("updated_at >= ?")
+        params.append(updated_since)
+    clauses.append("user_id > ?")
+    where = "WHERE " + " AND ".join(clauses)
+
+    # Keyset pages on user_id, each on a connection taken for that page
+    # only; rows are never all in memory
+    after = 0
+    while True:
+        conn = get_db_connection()
+        try:
+            rows = conn.execute(
+                f"SELECT * FROM user_profiles {where} ORDER BY user_id LIMIT ?",
+                params + [after, EXPORT_BATCH_SIZE]
+            ).fetchall()
+        finally:
+            conn.close()
+        if not rows:
+            return
+        after = rows[-1]['user_id']
+        yield [dict(row) for row in rows]
+
+@app.get("/api/profiles/export", dependencies=[Depends(require_admin)])
+async def export_profiles(format: str = "ndjson", skill: str = None, city: str = None, state: str = None,
+                          updated_since: str = None):
+    """Stream candidate profiles, optionally filtered, as NDJSON or CSV."""
+    if format not in EXPORT_FORMATS:
+        raise HTTPException(status_code=400, detail=f"Invalid export format: {format}")
+    batches = iter_profile_export(skill, city, state, updated_since)
+    return export_response(batches, format, UserProfileResponse.model_fields, "profiles")
+
+@app.get("/api/jobs/suggest", response_model=SuggestResponse)
+async def suggest_jobs(prefix: str = "", limit: int = SUGGEST_LIMIT, if_none_match: Optional[str] = Header(None)):
+    """Typeahead: the most common titles, companies and skills with a word starting with prefix."""
+    if not 1 <= limit <= MAX_SUGGEST_LIMIT:
+        raise HTTPException(status_code=400, detail=f"limit must be between 1 and {MAX_SUGGEST_LIMIT}")
+    if len(prefix) > MAX_PREFIX_LENGTH:
+        raise HTTPException(status_code=400, detail="prefix is too long")
+
+    etag = make_etag("suggest", PROCESS_EPOCH, catalog_version, prefix.lower(), limit)
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag, SUGGEST_CACHE_CONTROL)
+
+    # Served from memory in microseconds, so it stays on the event loop
+    suggestions = job_search_index.suggest(prefix, limit)
+    content = orjson.dumps({
+        "prefix": prefix,
+        "suggestions": [{"text": text, "kind": kind, "count": count} for text, kind, count in suggestions]
+    })
+    return Response(
+        content=content,
+        media_type="application/json",
+        headers={"ETag": etag, "Cache-Control": SUGGEST_CACHE_CONTROL}
+    )
+
+# response_model documents the shape; the handler returns pre-encoded bytes,
+# so FastAPI skips validating and serializing the page
+@app.get("/api/jobs", response_model=JobSearchResponse)
+async def search_jobs(search: str = None, page: int = 1, per_page: int = 3,
+                      mode: str = "relevance", cursor: str = None, include_total: Optional[bool] = None,
+                      include_facets: Optional[bool] = None, filters: dict = Depends(job_filters),
+                      sort: str = "relevance", if_none_match: Optional[str] = Header(None)):
+    try:
+        if mode not in SEARCH_MODES:
+            raise HTTPException(status_code=400, detail=f"Invalid search mode: {mode}")
+        if sort not in JOB_SORTS:
+            raise HTTPException(status_code=400, detail=f"Invalid sort: {sort}")
+        if page < 1 or per_page < 1:
+            raise HTTPException(status_code=400, detail="page and per_page must be positive")
+
+        # Cursor requests resume from a stable sort key instead of an offset,
+        # and skip the total count unless explicitly asked for it
+        if include_total is None:
+            include_total = cursor is None
+        if include_facets is None:
+            include_facets = cursor is None
+
+        kind = search_kind(search, mode, filters, sort)
+        scope = search_scope(search, filters, sort)
+
+        after = None
+        if cursor:
+            try:
+                after = decode_cursor(cursor, kind, scope, sort in VALUE_SORTS)
+            except ValueError as e:
+                raise HTTPException(status_code=400, detail=str(e))
+        offset = 0 if cursor else (page - 1) * per_page
+
+        # A page only changes when the catalog does, so a matching ETag skips
+        # the search and serialization entirely
+        etag = make_etag("jobs", PROCESS_EPOCH, catalog_version, kind, scope, page, per_page,
+                         cursor, include_total, include_facets)
+        if etag_matches(if_none_match, etag):
+            return not_modified(etag, JOBS_CACHE_CONTROL)
+
+        fragments, total_jobs, has_next, last_key, facets = await run_db(
+            fetch_job_page, kind, search, offset, per_page, after, include_total, filters, include_facets, sort
+        )
+
+        total_pages = None
+        if total_jobs is not None:
+            total_pages = (total_jobs + per_page - 1) // per_page
+
+        content = render_jobs_envelope(fragments, {
             "total_jobs": total_jobs,
             "total_pages": total_pages,
             "current_page": page,
             "per_page": per_page,
-            "has_next": page < total_pages,
-            "has_prev": page > 1
-        }
+            "has_next": has_next,
+            "has_prev": bool(cursor) or page > 1,
+            "next_cursor": encode_cursor(kind, scope, last_key) if has_next else None,
+            "facets": facets
+        })
+        return Response(
+            content=content,
+            media_type="application/json",
+            headers={"ETag": etag, "Cache-Control": JOBS_CACHE_CONTROL}
+        )
         
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Server error: {str(e)}")
 
+def sweep_reset_tokens_batch():
+    # Used tokens expire within the hour too, so expiry covers both
+    conn = get_db_connection()
+    try:
+        deleted = conn.execute(
+            """DELETE FROM password_reset_tokens WHERE id IN (
+                   SELECT id FROM password_reset_tokens WHERE expires_at <= datetime('now') LIMIT ?
+               )""",
+            (RESET_TOKEN_SWEEP_BATCH,)
+        ).rowcount
+        conn.commit()
+    finally:
+        conn.close()
+    return deleted
+
+async def sweep_reset_tokens():
+    # One short transaction per batch, yielding between them, so signups and
+    # resets never wait long behind the sweeper for the write lock
+    while True:
+        await asyncio.sleep(RESET_TOKEN_SWEEP_SECONDS)
+        try:
+            while await run_db(sweep_reset_tokens_batch) >= RESET_TOKEN_SWEEP_BATCH:
+                await asyncio.sleep(0)
+        except Exception:
+            logger.exception("Reset token sweep failed")
+
+async def sync_revoked_tokens():
+    # Picks up revocations made by other workers and drops expired ones
+    while True:
+        await asyncio.sleep(REVOCATION_SYNC_SECONDS)
+        try:
+            await async_db.run(token_service.revoked.sync)
+        except Exception:
+            logger.exception("Revoked token sync failed")
+
+async def sync_catalog():
+    # Picks up jobs ingested through other workers
+    while True:
+        await asyncio.sleep(CATALOG_SYNC_SECONDS)
+        try:
+            await run_db(pull_catalog_changes)
+        except Exception:
+            logger.exception("Catalog sync failed")
+
+# Periodic maintenance loops started with the app
+background_loops = []
+
+@app.on_event("startup")
+async def startup():
+    password_hasher.start()
+    await async_db.run(token_service.revoked.sync)
+    background_loops.append(asyncio.create_task(sync_revoked_tokens()))
+    background_loops.append(asyncio.create_task(sweep_reset_tokens()))
+    if catalog_position is not None:
+        background_loops.append(asyncio.create_task(sync_catalog()))
+
+@app.on_event("shutdown")
+def shutdown():
+    for task in background_loops:
+        task.cancel()
+    background_loops.clear()
+    shutdown_executors()
+    password_hasher.shutdown()
+    db_pool.close_all()
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8001)
-
@@ -0,0 +1,197 @@
+import re
+import threading
+
+import numpy as np
+
+# Profile skills are free text ("Python, AWS; Docker"); job skills are lists
+SKILL_SPLIT_RE = re.compile(r"[,;\n\r\t|•]+")
+
+
+def normalize_skill(skill: str) -> str:
+    return " ".join(skill.lower().split())
+
+
+def parse_profile_skills(text: str):
+    if not text:
+        return []
+    skills = (normalize_skill(part) for part in SKILL_SPLIT_RE.split(text))
+    return list(dict.fromkeys(skill for skill in skills if skill))
+
+
+class SkillMatcher:
+    """Scores a set of skills against every job in one vectorized pass.
+
+    Job skills are interned into integer ids and stored as a CSR-style sparse
+    matrix (``_indptr`` row offsets into ``_indices``). Scoring a user builds
+    a boolean mask over the vocabulary, gathers it through ``_indices`` and
+    turns the per-row sums into overlap counts with a single cumsum, so the
+    cost is one pass over the non-zeros with no Python-level loop over jobs.
+
+    Rows are append-only (see _snapshot): an updated job gets a new row and
+    its old one is deactivated, and once inactive rows pass
+    COMPACT_MIN_ROWS and a quarter of all rows the live ones are copied
+    into fresh arrays. Re-adding a job with the same skills changes nothing.
+    """
+
+    COMPACT_MIN_ROWS = 1024
+
+    def __init__(self, initial_capacity: int = 1024):
+        self._lock = threading.Lock()
+        self._vocab = {}
+        self._row_by_job = {}
+        self._rows = 0
+        self._nnz = 0
+        self._inactive = 0
+        self._job_ids = np.zeros(initial_capacity, dtype=np.int64)
+        self._active = np.zeros(initial_capacity, dtype=bool)
+        self._skill_counts = np.zeros(initial_capacity, dtype=np.int32)
+        self._indptr = np.zeros(initial_capacity + 1, dtype=np.int64)
+        self._indices = np.zeros(initial_capacity * 8, dtype=np.int32)
+
+    def __len__(self):
+        return len(self._row_by_job)
+
+    @property
+    def vocabulary_size(self):
+        return len(self._vocab)
+
+    def _intern(self, skill: str) -> int:
+        skill_id = self._vocab.get(skill)
+        if skill_id is None:
+            skill_id = len(self._vocab)
+            self._vocab[skill] = skill_id
+        return skill_id
+
+    def _grow(self, rows_needed: int, nnz_needed: int):
+        if rows_needed > len(self._job_ids):
+            capacity = max(rows_needed, len(self._job_ids) * 2)
+            self._job_ids = np.resize(self._job_ids, capacity)
+            self._active = np.resize(self._active, capacity)
+            self._skill_counts = np.resize(self._skill_counts, capacity)
+            self._indptr = np.resize(self._indptr, capacity + 1)
+        if nnz_needed > len(self._indices):
+            self._indices = np.resize(self._indices, max(nnz_needed, len(self._indices) * 2))
+
+    def add(self, job: dict):
+        self.add_many([job])
+
+    def add_many(self, jobs):
+        with self._lock:
+            for job in jobs:
+                self._add(job)
+            self._maybe_compact()
+
+    def _add(self, job: dict):
+        skill_ids = sorted({
+            self._intern(normalize_skill(skill))
+            for skill in job.get('skills_required') or []
+            if skill.strip()
+        })
+        old_row = self._row_by_job.get(job['id'])
+        if old_row is not None:
+            if self._indices[self._indptr[old_row]:self._indptr[old_row + 1]].tolist() == skill_ids:
+                return
+            # Updating a job deactivates its old row and appends a fresh one
+            self._active[old_row] = False
+            self._inactive += 1
+
+        row = self._rows
+        self._grow(row + 1, self._nnz + len(skill_ids))
+        self._indices[self._nnz:self._nnz + len(skill_ids)] = skill_ids
+        self._nnz += len(skill_ids)
+        self._indptr[row + 1] = self._nnz
+        self._job_ids[row] = job['id']
+        self._active[row] = True
+        self._skill_counts[row] = len(skill_ids)
+        self._row_by_job[job['id']] = row
+        self._rows += 1
+
+    def remove(self, job_id: int):
+        with self._lock:
+            row = self._row_by_job.pop(job_id, None)
+            if row is not None:
+                self._active[row] = False
+                self._inactive += 1
+                self._maybe_compact()
+
+    def _maybe_compact(self):
+        if self._inactive < max(self.COMPACT_MIN_ROWS, self._rows // 4):
+            return
+        # Boolean indexing copies, so snapshots keep the arrays they sliced
+        rows = self._rows
+        live = self._active[:rows].copy()
+        lengths = np.diff(self._indptr[:rows + 1])
+        self._indices = self._indices[:self._nnz][np.repeat(live, lengths)]
+        self._nnz = len(self._indices)
+        self._indptr = np.zeros(np.count_nonzero(live) + 1, dtype=np.int64)
+        np.cumsum(lengths[live], out=self._indptr[1:])
+        self._job_ids = self._job_ids[:rows][live]
+        self._skill_counts = self._skill_counts[:rows][live]
+        self._rows = len(self._job_ids)
+        self._active = np.ones(self._rows, dtype=bool)
+        self._row_by_job = {job_id: row for row, job_id in enumerate(self._job_ids.tolist())}
+        self._inactive = 0
+
+    def _snapshot(self, skills):
+        # Rows, non-zeros and indptr entries are append-only and _grow copies
+        # into new arrays, so slices taken here stay valid and consistent
+        # after the lock is released; _active is flipped in place, so it's copied
+        rows, nnz = self._rows, self._nnz
+        skill_ids = [
+            skill_id for skill_id in (self._vocab.get(normalize_skill(skill)) for skill in skills)
+            if skill_id is not None
+        ]
+        return (
+            rows, len(self._vocab), skill_ids, self._indices[:nnz], self._indptr[:rows + 1],
+            self._active[:rows].copy(), self._skill_counts[:rows], self._job_ids[:rows],
+        )
+
+    @staticmethod
+    def _score(snapshot):
+        rows, vocab_size, skill_ids, indices, indptr, active, counts, _ = snapshot
+        user_mask = np.zeros(vocab_size + 1, dtype=np.int32)
+        user_mask[skill_ids] = 1
+
+        hits = user_mask[indices]
+        cumulative = np.zeros(len(indices) + 1, dtype=np.int64)
+        np.cumsum(hits, out=cumulative[1:])
+        overlap = cumulative[indptr[1:]] - cumulative[indptr[:-1]]
+        overlap[~active] = 0
+
+        coverage = np.divide(overlap, counts, out=np.zeros(rows, dtype=np.float64), where=counts > 0)
+        return overlap, coverage
+
+    def score(self, skills):
+        """Return (overlap, coverage) arrays over all rows for ``skills``."""
+        with self._lock:
+            snapshot = self._snapshot(skills)
+        return self._score(snapshot)
+
+    def top_k(self, skills, k: int = 10):
+        """Return [(job_id, overlap, coverage), ...] for the best ``k`` jobs.
+
+        Jobs are ranked by how many of the skills they require, then by the
+        fraction of their required skills covered. Jobs with no overlap are
+        never returned. Only taking the snapshot holds the lock; scoring
+        runs outside it, so threads score users in parallel.
+        """
+        if k <= 0 or not skills:
+            return []
+        with self._lock:
+            if self._rows == 0:
+                return []
+            snapshot = self._snapshot(skills)
+        overlap, coverage = self._score(snapshot)
+        job_ids = snapshot[-1]
+
+        # Coverage is in [0, 1] so it only ever breaks ties between equal overlaps
+        ranking = overlap + coverage * 0.5
+        candidates = np.flatnonzero(overlap > 0)
+        if len(candidates) > k:
+            top = np.argpartition(-ranking[candidates], k - 1)[:k]
+            candidates = candidates[top]
+        order = candidates[np.argsort(-ranking[candidates], kind="stable")]
+        return [
+            (int(job_ids[row]), int(overlap[row]), float(coverage[row]))
+            for row in order
+        ]
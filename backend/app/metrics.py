@@ -0,0 +1,246 @@
+import threading
+import time
+from bisect import bisect_left
+
+# Seconds; spans a cached page (~1ms) to a slow hash or export (10s)
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+DB_BUCKETS = (0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.5, 1.0, 5.0)
+QUERY_VERBS = {
+    "SELECT", "INSERT", "UPDATE", "DELETE", "REPLACE", "WITH", "BEGIN", "COMMIT",
+    "CREATE", "DROP", "ALTER", "PRAGMA", "EXPLAIN",
+}
+# Starlette appends "; charset=utf-8" to text/ media types
+CONTENT_TYPE = "text/plain; version=0.0.4"
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names, values, extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def query_verb(sql: str) -> str:
+    head = sql.lstrip()[:10].split(None, 1)
+    verb = head[0].upper() if head else ""
+    return verb if verb in QUERY_VERBS else "OTHER"
+
+
+class _Metric:
+    """Base for metrics whose values are kept in per-thread shards.
+
+    Each thread updates only its own dict, so recording takes no lock (the
+    lock is taken once per thread, to register its shard). Shards are
+    summed when the metric is collected.
+    """
+
+    kind = None
+
+    def __init__(self, name: str, help_text: str, labels=()):
+        self.name = name
+        self.help = help_text
+        self.labels = tuple(labels)
+        self._local = threading.local()
+        self._shards = []
+        self._shards_lock = threading.Lock()
+
+    def _shard(self) -> dict:
+        try:
+            return self._local.values
+        except AttributeError:
+            values = self._local.values = {}
+            with self._shards_lock:
+                self._shards.append(values)
+            return values
+
+    def _shard_items(self):
+        with self._shards_lock:
+            shards = list(self._shards)
+        for shard in shards:
+            yield from list(shard.items())
+
+    def samples(self):
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def inc(self, labels=(), amount: float = 1):
+        shard = self._shard()
+        shard[labels] = shard.get(labels, 0) + amount
+
+    def samples(self):
+        totals = {}
+        for labels, value in self._shard_items():
+            totals[labels] = totals.get(labels, 0) + value
+        for labels, value in sorted(totals.items()):
+            yield self.name + _format_labels(self.labels, labels), value
+
+
+class Gauge(Counter):
+    """A gauge moved with inc()/dec(); shards hold deltas that sum to the value."""
+
+    kind = "gauge"
+
+    def dec(self, labels=(), amount: float = 1):
+        self.inc(labels, -amount)
+
+
+class GaugeCallback(_Metric):
+    """A gauge read at collection time from ``fn() -> {label values: value}``."""
+
+    kind = "gauge"
+
+    def __init__(self, name: str, help_text: str, fn, labels=()):
+        super().__init__(name, help_text, labels)
+        self.fn = fn
+
+    def samples(self):
+        for labels, value in sorted(self.fn().items()):
+            yield self.name + _format_labels(self.labels, labels), value
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, help_text: str, labels=(), buckets=LATENCY_BUCKETS):
+        super().__init__(name, help_text, labels)
+        self.buckets = tuple(buckets)
+
+    def observe(self, value: float, labels=()):
+        # Per label set: a count per bucket (plus +Inf), then the sum
+        shard = self._shard()
+        counts = shard.get(labels)
+        if counts is None:
+            counts = shard[labels] = [0] * (len(self.buckets) + 2)
+        counts[bisect_left(self.buckets, value)] += 1
+        counts[-1] += value
+
+    def time(self, labels=()):
+        return _Timer(self, labels)
+
+    def samples(self):
+        totals = {}
+        for labels, counts in self._shard_items():
+            merged = totals.get(labels)
+            if merged is None:
+                totals[labels] = list(counts)
+            else:
+                for i, count in enumerate(counts):
+                    merged[i] += count
+        for labels, counts in sorted(totals.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + ("+Inf",), counts):
+                cumulative += count
+                yield self.name + "_bucket" + _format_labels(self.labels, labels, f'le="{bound}"'), cumulative
+            yield self.name + "_sum" + _format_labels(self.labels, labels), counts[-1]
+            yield self.name + "_count" + _format_labels(self.labels, labels), cumulative
+
+
+class _Timer:
+    __slots__ = ("histogram", "labels", "started")
+
+    def __init__(self, histogram, labels):
+        self.histogram = histogram
+        self.labels = labels
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.histogram.observe(time.perf_counter() - self.started, self.labels)
+
+
+class Registry:
+    def __init__(self):
+        self._metrics = {}
+
+    def register(self, metric):
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name, help_text, labels=()):
+        return self.register(Counter(name, help_text, labels))
+
+    def gauge(self, name, help_text, labels=()):
+        return self.register(Gauge(name, help_text, labels))
+
+    def gauge_callback(self, name, help_text, fn, labels=()):
+        return self.register(GaugeCallback(name, help_text, fn, labels))
+
+    def histogram(self, name, help_text, labels=(), buckets=LATENCY_BUCKETS):
+        return self.register(Histogram(name, help_text, labels, buckets))
+
+    def render(self) -> str:
+        """Every metric in the Prometheus text exposition format."""
+        lines = []
+        for metric in self._metrics.values():
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            for sample, value in metric.samples():
+                lines.append(f"{sample} {value}")
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+HTTP_REQUESTS = registry.counter(
+    "http_requests_total", "HTTP requests by route and status code", ("method", "route", "status")
+)
+HTTP_LATENCY = registry.histogram(
+    "http_request_duration_seconds", "Time from request start to the end of the response body", ("method", "route")
+)
+HTTP_IN_FLIGHT = registry.gauge("http_requests_in_flight", "Requests currently being handled", ("method",))
+DB_ACQUIRE_SECONDS = registry.histogram(
+    "db_pool_acquire_seconds", "Time spent waiting for a pooled SQLite connection", ("database",), DB_BUCKETS
+)
+DB_QUERY_SECONDS = registry.histogram(
+    "db_query_seconds", "Time spent executing SQLite statements (execution, not row fetching)",
+    ("database", "verb"), DB_BUCKETS
+)
+PASSWORD_HASH_SECONDS = registry.histogram(
+    "password_hash_seconds", "Password hashing and verification time, queueing included", ("operation",)
+)
+
+
+class MetricsMiddleware:
+    """ASGI middleware recording HTTP_REQUESTS, HTTP_LATENCY and HTTP_IN_FLIGHT.
+
+    Routes are labelled by their path template (/api/profile/{user_id}), so
+    label cardinality is bounded by the number of routes.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        status = 500
+        started = time.perf_counter()
+        HTTP_IN_FLIGHT.inc((method,))
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            HTTP_IN_FLIGHT.dec((method,))
+            # The router fills in scope["route"] once a route matched
+            route = scope.get("route")
+            route = getattr(route, "path_format", None) or getattr(route, "path", None) or "unmatched"
+            HTTP_LATENCY.observe(time.perf_counter() - started, (method, route))
+            HTTP_REQUESTS.inc((method, route, str(status)))
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, Text
+from sqlalchemy import Column, Integer, String, DateTime, Text, JSON, Index
 from sqlalchemy.sql import func
 from .database import Base
 
@@ -39,4 +39,30 @@ class PasswordResetToken(Base):
     token = Column(String, unique=True, nullable=False)
     expires_at = Column(DateTime(timezone=True), nullable=False)
     used = Column(Integer, default=0)
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
\ No newline at end of file
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+class JobPosting(Base):
+    __tablename__ = "jobs"
+
+    id = Column(Integer, primary_key=True)
+    title = Column(String, nullable=False)
+    company = Column(String, nullable=False)
+    location = Column(String, nullable=False)
+    type = Column(String, nullable=False)
+    experience = Column(String, nullable=False)
+    salary = Column(String, nullable=False)
+    description = Column(Text, nullable=False)
+    posted_date = Column(String, nullable=False)
+    skills_required = Column(JSON, nullable=False)
+    responsibilities = Column(JSON, nullable=False)
+    requirements = Column(JSON, nullable=False)
+    skills_text = Column(Text, nullable=False)
+    salary_min = Column(Integer)
+    salary_max = Column(Integer)
+    # Catalog revision of the write that stored this row; workers pull newer ones
+    revision = Column(Integer, nullable=False, default=0, server_default="0")
+
+    __table_args__ = (
+        Index("idx_jobs_posted", posted_date.desc(), id.desc()),
+        Index("idx_jobs_revision", revision, id),
+    )
\ No newline at end of file
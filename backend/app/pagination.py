@@ -0,0 +1,68 @@
+import base64
+import json
+import threading
+
+# Element types of a cursor's position, per search kind: browse and
+# substring resume from (posted_date, id), relevance from (score,
+# posted_date, id) and value sorts (salary, distance) from (value, id)
+NUMBER = (int, float)
+CURSOR_SHAPES = {
+    "browse": (str, int),
+    "substring": (str, int),
+    "relevance": (NUMBER, str, int),
+}
+VALUE_CURSOR_SHAPE = (NUMBER, int)
+
+
+def encode_cursor(kind: str, search: str, key) -> str:
+    # Opaque to clients: the query it belongs to plus the last sort key served
+    payload = json.dumps({"k": kind, "q": search or "", "p": list(key)}, separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+
+def _matches_shape(position, shape) -> bool:
+    if not isinstance(position, list) or len(position) != len(shape):
+        return False
+    # bool is an int subclass, but never a valid sort key
+    return all(
+        isinstance(value, types) and not isinstance(value, bool)
+        for value, types in zip(position, shape)
+    )
+
+
+def decode_cursor(cursor: str, kind: str, search: str, value_sort: bool = False):
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        position = payload["p"]
+        matches_query = payload["k"] == kind and payload["q"] == (search or "")
+    except (ValueError, KeyError, TypeError):
+        raise ValueError("Invalid cursor")
+    if not matches_query:
+        raise ValueError("Cursor does not belong to this search")
+    shape = VALUE_CURSOR_SHAPE if value_sort else CURSOR_SHAPES[kind]
+    if not _matches_shape(position, shape):
+        raise ValueError("Invalid cursor")
+    return position
+
+
+class TotalCountCache:
+    """Caches result-set sizes per query until the catalog version changes."""
+
+    def __init__(self, max_entries: int = 1024):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries = {}
+
+    def get(self, key, version: int, compute):
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] == version:
+            return entry[1]
+
+        total = compute()
+        with self._lock:
+            if len(self._entries) >= self.max_entries:
+                # Drop the oldest entry; dicts keep insertion order
+                self._entries.pop(next(iter(self._entries)))
+            self._entries[key] = (version, total)
+        return total
@@ -0,0 +1,286 @@
+import argparse
+import csv
+import json
+import os
+import secrets
+import sys
+import time
+
+from .hashing import PasswordHashingService
+
+PROFILE_FIELDS = (
+    "first_name", "last_name", "phone", "skills", "experience", "city", "state",
+    "zip_code", "availability", "linkedin_profile", "github_profile", "resume_cv",
+)
+# SQLite caps bound parameters per statement; stay well below the limit
+IN_CHUNK_SIZE = 500
+MAX_REPORTED = 20
+
+
+def read_rows(path: str, fmt: str = None):
+    """Yield (line_no, row, error) for every record of a CSV (with header) or NDJSON file.
+
+    Exactly one item is yielded per record, so a count of items is a
+    stable resume position; ``row`` is None for blank or invalid lines.
+    """
+    fmt = fmt or ("csv" if path.lower().endswith(".csv") else "ndjson")
+    with open(path, newline="" if fmt == "csv" else None, encoding="utf-8") as f:
+        if fmt == "csv":
+            reader = csv.DictReader(f)
+            for row in reader:
+                yield reader.line_num, row, None
+        else:
+            for line_no, line in enumerate(f, start=1):
+                if not line.strip():
+                    yield line_no, None, None
+                    continue
+                try:
+                    row = json.loads(line)
+                except json.JSONDecodeError as e:
+                    yield line_no, None, f"Invalid JSON: {e}"
+                    continue
+                if not isinstance(row, dict):
+                    yield line_no, None, "Expected a JSON object"
+                    continue
+                yield line_no, row, None
+
+
+def _chunks(items, size):
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def _clean(value):
+    if value is None:
+        return None
+    value = str(value).strip()
+    return value or None
+
+
+class Checkpoint:
+    """Number of input rows already committed, stored next to the input."""
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def load(self) -> int:
+        try:
+            with open(self.path) as f:
+                return int(json.load(f)["rows_done"])
+        except FileNotFoundError:
+            return 0
+
+    def save(self, rows_done: int):
+        tmp = f"{self.path}.tmp"
+        with open(tmp, "w") as f:
+            json.dump({"rows_done": rows_done, "saved_at": time.time()}, f)
+        os.replace(tmp, self.path)
+
+    def clear(self):
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+
+class UserProvisioner:
+    """Creates users and their profiles in bulk.
+
+    Each batch is checked for duplicate emails (within the input and
+    against the database) before any hashing, the remaining passwords are
+    hashed across the hasher's process pool, and users plus profiles are
+    inserted with executemany in one transaction per batch.
+
+    Rows may carry a plaintext ``password`` (hashed here), an existing
+    argon2/bcrypt ``hashed_password`` (stored as is), or neither, in which
+    case the account gets an unusable password and must go through
+    forgot-password before first login.
+    """
+
+    def __init__(self, connect, hasher: PasswordHashingService):
+        self.connect = connect
+        self.hasher = hasher
+        self.created = 0
+        self.duplicates = []
+        self.invalid = []
+        self.without_password = 0
+
+    def _existing_emails(self, conn, emails):
+        existing = set()
+        for chunk in _chunks(emails, IN_CHUNK_SIZE):
+            placeholders = ", ".join("?" * len(chunk))
+            rows = conn.execute(f"SELECT email FROM users WHERE email IN ({placeholders})", chunk).fetchall()
+            existing.update(row['email'] for row in rows)
+        return existing
+
+    def _password_hash(self, row):
+        stored = _clean(row.get("hashed_password"))
+        if stored and (stored.startswith("$argon2") or stored.startswith("$2")):
+            return stored
+        if stored:
+            raise ValueError("hashed_password must be an argon2 or bcrypt hash")
+        return None
+
+    def provision_batch(self, batch, seen_emails):
+        """Insert one batch of (line_no, row); returns the number of users created."""
+        candidates = []
+        for line_no, row in batch:
+            email = _clean(row.get("email"))
+            if not email or "@" not in email:
+                self.invalid.append((line_no, "Missing or invalid email"))
+                continue
+            if email in seen_emails:
+                self.duplicates.append((line_no, email))
+                continue
+            try:
+                stored_hash = self._password_hash(row)
+            except ValueError as e:
+                self.invalid.append((line_no, str(e)))
+                continue
+            seen_emails.add(email)
+            candidates.append((line_no, email, row, stored_hash))
+
+        conn = self.connect()
+        try:
+            existing = self._existing_emails(conn, [email for _, email, _, _ in candidates])
+            new_users = []
+            for line_no, email, row, stored_hash in candidates:
+                if email in existing:
+                    self.duplicates.append((line_no, email))
+                else:
+                    new_users.append((email, row, stored_hash))
+
+            # Only the passwords that still need hashing go to the pool
+            to_hash = [
+                (index, _clean(row.get("password")))
+                for index, (_, row, stored_hash) in enumerate(new_users)
+                if stored_hash is None and _clean(row.get("password"))
+            ]
+            hashes = dict(zip(
+                (index for index, _ in to_hash),
+                self.hasher.hash_many_blocking(password for _, password in to_hash)
+            ))
+
+            user_rows = []
+            for index, (email, row, stored_hash) in enumerate(new_users):
+                password_hash = stored_hash or hashes.get(index)
+                if password_hash is None:
+                    self.without_password += 1
+                    password_hash = "!" + secrets.token_hex(16)
+                user_rows.append((email, password_hash))
+
+            # INSERT OR IGNORE: an account created concurrently through signup wins
+            before = conn.total_changes
+            conn.executemany("INSERT OR IGNORE INTO users (email, hashed_password) VALUES (?, ?)", user_rows)
+            created = conn.total_changes - before
+
+            user_ids = {}
+            for chunk in _chunks([email for email, _ in user_rows], IN_CHUNK_SIZE):
+                placeholders = ", ".join("?" * len(chunk))
+                for row in conn.execute(f"SELECT id, email FROM users WHERE email IN ({placeholders})", chunk):
+                    user_ids[row['email']] = row['id']
+
+            columns = ("user_id", "email") + PROFILE_FIELDS
+            conn.executemany(
+                f"INSERT OR IGNORE INTO user_profiles ({', '.join(columns)}) "
+                f"VALUES ({', '.join('?' * len(columns))})",
+                (
+                    (user_ids[email], email, *(_clean(row.get(field)) for field in PROFILE_FIELDS))
+                    for email, row, _ in new_users
+                    if email in user_ids
+                )
+            )
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
+
+        self.created += created
+        return created
+
+    def run(self, rows, batch_size: int = 5000, checkpoint: Checkpoint = None, progress=None):
+        skip = checkpoint.load() if checkpoint else 0
+        seen_emails = set()
+        batch = []
+        rows_done = 0
+
+        def flush():
+            self.provision_batch(batch, seen_emails)
+            if checkpoint:
+                checkpoint.save(rows_done)
+            if progress:
+                progress(self, rows_done)
+            batch.clear()
+
+        for rows_done, (line_no, row, error) in enumerate(rows, start=1):
+            if rows_done <= skip:
+                continue
+            if error:
+                self.invalid.append((line_no, error))
+            elif row is not None:
+                batch.append((line_no, row))
+            if len(batch) >= batch_size:
+                flush()
+        if batch:
+            flush()
+        elif checkpoint:
+            checkpoint.save(rows_done)
+        return rows_done, skip
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Create users and profiles in bulk from CSV or NDJSON")
+    parser.add_argument("path", help="Input file; one user per row/line with at least an email")
+    parser.add_argument("--format", choices=("csv", "ndjson"), default=None,
+                        help="Defaults to csv for *.csv, otherwise ndjson")
+    parser.add_argument("--batch-size", type=int, default=5000)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 4,
+                        help="Password hashing processes")
+    parser.add_argument("--checkpoint", default=None,
+                        help="Progress file used to resume (default: <path>.checkpoint)")
+    parser.add_argument("--restart", action="store_true", help="Ignore any existing checkpoint")
+    parser.add_argument("--duplicates-file", default=None,
+                        help="Write every skipped duplicate as 'line,email' to this file")
+    args = parser.parse_args()
+
+    # Importing the app creates the schema and its connection pool
+    from .main import get_db_connection
+
+    hasher = PasswordHashingService.from_env(workers=args.workers)
+    checkpoint = Checkpoint(args.checkpoint or f"{args.path}.checkpoint")
+    if args.restart:
+        checkpoint.clear()
+
+    provisioner = UserProvisioner(get_db_connection, hasher)
+    started = time.time()
+
+    def report_progress(p, rows_done):
+        rate = p.created / max(time.time() - started, 1e-9)
+        print(f"  {rows_done} rows read, {p.created} created, {len(p.duplicates)} duplicates "
+              f"({rate:.0f} users/s)", file=sys.stderr)
+
+    try:
+        rows_done, skipped = provisioner.run(
+            read_rows(args.path, args.format), batch_size=args.batch_size,
+            checkpoint=checkpoint, progress=report_progress
+        )
+    finally:
+        hasher.shutdown()
+    elapsed = time.time() - started
+
+    if skipped:
+        print(f"Resumed after {skipped} rows already committed")
+    print(f"✅ Created {provisioner.created} users from {rows_done} rows in {elapsed:.1f}s")
+    if provisioner.without_password:
+        print(f"   {provisioner.without_password} accounts have no password and must use forgot-password")
+    for label, items in (("duplicate emails", provisioner.duplicates), ("invalid rows", provisioner.invalid)):
+        if items:
+            print(f"⚠️  Skipped {len(items)} {label}:")
+            for line_no, detail in items[:MAX_REPORTED]:
+                print(f"   line {line_no}: {detail}")
+            if len(items) > MAX_REPORTED:
+                print(f"   ... and {len(items) - MAX_REPORTED} more")
+    if args.duplicates_file and provisioner.duplicates:
+        with open(args.duplicates_file, "w", newline="") as f:
+            csv.writer(f).writerows(provisioner.duplicates)
+    checkpoint.clear()
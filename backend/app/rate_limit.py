@@ -0,0 +1,181 @@
+import os
+import random
+import threading
+import time
+
+
+class RateRule:
+    """At most ``capacity`` hits in a burst, refilled evenly over ``period`` seconds."""
+
+    def __init__(self, capacity: int, period: float):
+        self.capacity = capacity
+        self.period = period
+        self.interval = period / capacity
+
+    @classmethod
+    def from_env(cls, name: str, capacity: int, period: float):
+        # RATE_LIMIT_LOGIN_IP=20/60 means 20 hits per 60 seconds
+        value = os.getenv(f"RATE_LIMIT_{name.upper()}")
+        if value:
+            capacity, period = value.split("/")
+        return cls(int(capacity), float(period))
+
+
+def _take(tat, now: float, rule: RateRule):
+    """(new state, retry_after) for one hit on a bucket.
+
+    A bucket is stored as the single time at which it will be full again
+    (the GCRA form of a token bucket). Each hit pushes that time forward by
+    one refill interval, and a hit is refused when that would put it more
+    than a full period ahead. A bucket whose time has passed is full, which
+    is the same as not storing it, so expiry needs no bookkeeping.
+    """
+    full_at = max(tat or now, now) + rule.interval
+    allowed_at = full_at - rule.period
+    if allowed_at > now:
+        return tat, allowed_at - now
+    return full_at, 0.0
+
+
+class BucketStore:
+    """Where bucket state lives; ``take`` returns 0 when the hit is allowed,
+    else the seconds until it would be."""
+
+    blocking = False
+
+    def take(self, key, rule: RateRule) -> float:
+        raise NotImplementedError
+
+    def stats(self) -> dict:
+        raise NotImplementedError
+
+
+class MemoryBucketStore(BucketStore):
+    """Per-process buckets, one float per key, spread over locked shards.
+
+    Full buckets are only dropped when a shard outgrows ``max_keys_per_shard``;
+    if it is still too big after that (a flood of distinct keys), the oldest
+    keys go, which can only make the limiter more lenient for them.
+    """
+
+    def __init__(self, shards: int = 16, max_keys_per_shard: int = 50000):
+        self.max_keys_per_shard = max_keys_per_shard
+        self._shards = [({}, threading.Lock()) for _ in range(shards)]
+
+    def take(self, key, rule: RateRule) -> float:
+        buckets, lock = self._shards[hash(key) % len(self._shards)]
+        now = time.monotonic()
+        with lock:
+            tat, retry_after = _take(buckets.get(key), now, rule)
+            if not retry_after:
+                buckets[key] = tat
+                if len(buckets) > self.max_keys_per_shard:
+                    self._prune(buckets, now)
+        return retry_after
+
+    def _prune(self, buckets: dict, now: float):
+        for key in [key for key, tat in buckets.items() if tat <= now]:
+            del buckets[key]
+        excess = len(buckets) - self.max_keys_per_shard // 2
+        if excess > 0 and len(buckets) > self.max_keys_per_shard:
+            for key in list(buckets)[:excess]:
+                del buckets[key]
+
+    def stats(self) -> dict:
+        return {"backend": "memory", "keys": sum(len(buckets) for buckets, _ in self._shards)}
+
+
+class SQLiteBucketStore(BucketStore):
+    """Buckets in a SQLite table, shared by every worker using the database.
+
+    Each hit is one short write transaction, so it runs on the DB executor.
+    Expired rows are deleted now and then (about one hit in PRUNE_ONE_IN).
+    """
+
+    blocking = True
+    PRUNE_ONE_IN = 1000
+
+    def __init__(self, connect):
+        self.connect = connect
+        conn = connect()
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS rate_limit_buckets (
+                key TEXT PRIMARY KEY,
+                full_at REAL NOT NULL
+            ) WITHOUT ROWID
+        ''')
+        conn.commit()
+        conn.close()
+
+    def take(self, key, rule: RateRule) -> float:
+        key = "\x1f".join(str(part) for part in key) if isinstance(key, tuple) else str(key)
+        now = time.time()
+        conn = self.connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute("SELECT full_at FROM rate_limit_buckets WHERE key = ?", (key,)).fetchone()
+            tat, retry_after = _take(row[0] if row else None, now, rule)
+            if not retry_after:
+                conn.execute(
+                    "INSERT INTO rate_limit_buckets (key, full_at) VALUES (?, ?) "
+                    "ON CONFLICT(key) DO UPDATE SET full_at = excluded.full_at",
+                    (key, tat)
+                )
+            if random.randrange(self.PRUNE_ONE_IN) == 0:
+                conn.execute("DELETE FROM rate_limit_buckets WHERE full_at <= ?", (now,))
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
+        return retry_after
+
+    def stats(self) -> dict:
+        conn = self.connect()
+        keys = conn.execute("SELECT COUNT(*) FROM rate_limit_buckets").fetchone()[0]
+        conn.close()
+        return {"backend": "sqlite", "keys": keys}
+
+
+class RateLimiter:
+    """Named rules applied to keys, e.g. ("login_ip", "203.0.113.7")."""
+
+    def __init__(self, store: BucketStore, rules: dict):
+        self.store = store
+        self.rules = rules
+        self.blocking = store.blocking
+        self.rejected = dict.fromkeys(rules, 0)
+
+    def check(self, *hits) -> float:
+        """Spend one hit per (rule, key); 0 when all pass, else the first refusal's retry_after.
+
+        Hits are taken in order and stop at the first refusal, so a request
+        refused per IP doesn't also spend its per-email allowance.
+        """
+        for rule, key in hits:
+            retry_after = self.store.take((rule, key), self.rules[rule])
+            if retry_after:
+                self.rejected[rule] += 1
+                return retry_after
+        return 0.0
+
+    def stats(self) -> dict:
+        return {**self.store.stats(), "rejected": dict(self.rejected)}
+
+
+RATE_LIMIT_BACKENDS = ("memory", "sqlite", "off")
+
+
+def create_rate_limiter(rules: dict, connect=None):
+    """RateLimiter per RATE_LIMIT_BACKEND (memory|sqlite|off); None when off."""
+    backend = os.getenv("RATE_LIMIT_BACKEND", "memory")
+    if backend == "off":
+        return None
+    if backend == "memory":
+        store = MemoryBucketStore(shards=int(os.getenv("RATE_LIMIT_SHARDS", "16")))
+    elif backend == "sqlite":
+        store = SQLiteBucketStore(connect)
+    else:
+        raise ValueError(f"Unknown rate limit backend: {backend}")
+    return RateLimiter(store, rules)
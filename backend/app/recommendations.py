@@ -0,0 +1,166 @@
+import argparse
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from .matching import normalize_skill, parse_profile_skills
+
+DEFAULT_TOP_K = int(os.getenv("RECOMMENDATIONS_TOP_K", "20"))
+
+# SQLite caps bound parameters per statement; stay well below the limit
+IN_CHUNK_SIZE = 500
+
+
+def _chunks(items, size):
+    items = list(items)
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def job_skills(jobs) -> set:
+    return {
+        normalize_skill(skill)
+        for job in jobs
+        for skill in job.get('skills_required') or []
+        if skill.strip()
+    }
+
+
+class RecommendationBuilder:
+    """Maintains the precomputed top-K job list for every user.
+
+    ``user_skills`` doubles as an inverted index from skill to user, so a
+    job ingest only re-scores users who list one of the new job's skills.
+    Scoring runs on the in-memory SkillMatcher; only writes touch SQLite.
+    """
+
+    def __init__(self, connect, matcher, top_k: int = DEFAULT_TOP_K):
+        self.connect = connect
+        self.matcher = matcher
+        self.top_k = top_k
+
+    def _score(self, user_id, skills):
+        return user_id, skills, self.matcher.top_k(skills, self.top_k)
+
+    def _write(self, conn, scored):
+        user_ids = [(user_id,) for user_id, _, _ in scored]
+        conn.executemany("DELETE FROM job_recommendations WHERE user_id = ?", user_ids)
+        conn.executemany("DELETE FROM user_skills WHERE user_id = ?", user_ids)
+        conn.executemany(
+            "INSERT INTO user_skills (user_id, skill) VALUES (?, ?)",
+            [(user_id, skill) for user_id, skills, _ in scored for skill in skills]
+        )
+        conn.executemany(
+            """INSERT INTO job_recommendations (user_id, rank, job_id, score, coverage)
+               VALUES (?, ?, ?, ?, ?)""",
+            [
+                (user_id, rank, job_id, overlap, coverage)
+                for user_id, _, ranked in scored
+                for rank, (job_id, overlap, coverage) in enumerate(ranked, start=1)
+            ]
+        )
+
+    def refresh_user(self, user_id: int, skills_text: str):
+        scored = [self._score(user_id, parse_profile_skills(skills_text))]
+        conn = self.connect()
+        try:
+            self._write(conn, scored)
+            conn.commit()
+        finally:
+            conn.close()
+        return scored[0][2]
+
+    def rebuild_all(self, workers: int = 4, batch_size: int = 500):
+        """Recompute recommendations for every profile; returns users processed."""
+        processed = 0
+        last_user_id = 0
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            while True:
+                conn = self.connect()
+                try:
+                    rows = conn.execute(
+                        """SELECT user_id, skills FROM user_profiles
+                           WHERE user_id > ? ORDER BY user_id LIMIT ?""",
+                        (last_user_id, batch_size)
+                    ).fetchall()
+                    if not rows:
+                        break
+                    # NumPy releases the GIL in the scoring kernels, so threads
+                    # score users in parallel while this thread does the writes
+                    scored = list(pool.map(
+                        lambda row: self._score(row['user_id'], parse_profile_skills(row['skills'])),
+                        rows
+                    ))
+                    self._write(conn, scored)
+                    conn.commit()
+                finally:
+                    conn.close()
+                processed += len(rows)
+                last_user_id = rows[-1]['user_id']
+        return processed
+
+    def jobs_added(self, jobs):
+        """Re-score only the users whose skills overlap the new jobs' skills."""
+        return self.skills_added(job_skills(jobs))
+
+    def skills_added(self, skills):
+        """Re-score the users who list any of ``skills`` (normalized)."""
+        if not skills:
+            return 0
+
+        conn = self.connect()
+        try:
+            user_ids = set()
+            for chunk in _chunks(skills, IN_CHUNK_SIZE):
+                placeholders = ", ".join("?" * len(chunk))
+                rows = conn.execute(
+                    f"SELECT DISTINCT user_id FROM user_skills WHERE skill IN ({placeholders})",
+                    chunk
+                ).fetchall()
+                user_ids.update(row['user_id'] for row in rows)
+
+            for chunk in _chunks(sorted(user_ids), IN_CHUNK_SIZE):
+                placeholders = ", ".join("?" * len(chunk))
+                skills_by_user = {user_id: [] for user_id in chunk}
+                for row in conn.execute(
+                    f"SELECT user_id, skill FROM user_skills WHERE user_id IN ({placeholders})",
+                    chunk
+                ):
+                    skills_by_user[row['user_id']].append(row['skill'])
+                self._write(conn, [
+                    self._score(user_id, skills) for user_id, skills in skills_by_user.items()
+                ])
+            conn.commit()
+        finally:
+            conn.close()
+        return len(user_ids)
+
+    def get(self, user_id: int):
+        conn = self.connect()
+        try:
+            rows = conn.execute(
+                """SELECT job_id, score, coverage FROM job_recommendations
+                   WHERE user_id = ? ORDER BY rank""",
+                (user_id,)
+            ).fetchall()
+            skills = [
+                row['skill'] for row in conn.execute(
+                    "SELECT skill FROM user_skills WHERE user_id = ?", (user_id,)
+                )
+            ]
+        finally:
+            conn.close()
+        return skills, [(row['job_id'], row['score'], row['coverage']) for row in rows]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Rebuild precomputed job recommendations for all users")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 4)
+    parser.add_argument("--batch-size", type=int, default=500)
+    args = parser.parse_args()
+
+    from .main import recommendation_builder
+
+    started = time.time()
+    total = recommendation_builder.rebuild_all(workers=args.workers, batch_size=args.batch_size)
+    print(f"✅ Rebuilt recommendations for {total} users in {time.time() - started:.1f}s")
@@ -1,44 +1,69 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from passlib.context import CryptContext
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from .. import models, schemas
-from ..database import get_db
+from ..database import get_async_db
+from ..hashing import HashingBusy, password_hasher
+from ..tokens import token_service
 
 router = APIRouter()
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
-def verify_password(plain_password, hashed_password):
-    return pwd_context.verify(plain_password, hashed_password)
+def hashing_busy_error():
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Server busy, please try again shortly",
+        headers={"Retry-After": "1"}
+    )
 
-def get_password_hash(password):
-    return pwd_context.hash(password)
-
-def get_user_by_email(db: Session, email: str):
-    return db.query(models.User).filter(models.User.email == email).first()
+async def get_user_by_email(db: AsyncSession, email: str):
+    result = await db.execute(select(models.User).where(models.User.email == email))
+    return result.scalars().first()
 
 @router.post("/signup", response_model=schemas.UserResponse)
-def signup(user: schemas.UserCreate, db: Session = Depends(get_db)):
-    db_user = get_user_by_email(db, email=user.email)
+async def signup(user: schemas.UserCreate, db: AsyncSession = Depends(get_async_db)):
+    db_user = await get_user_by_email(db, email=user.email)
     if db_user:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Email already registered"
         )
-    
-    hashed_password = get_password_hash(user.password)
+
+    try:
+        hashed_password = await password_hasher.hash(user.password)
+    except HashingBusy:
+        raise hashing_busy_error()
     db_user = models.User(email=user.email, hashed_password=hashed_password)
     db.add(db_user)
-    db.commit()
-    db.refresh(db_user)
+    await db.commit()
+    await db.refresh(db_user)
     return db_user
 
 @router.post("/login")
-def login(user: schemas.UserLogin, db: Session = Depends(get_db)):
-    db_user = get_user_by_email(db, email=user.email)
-    if not db_user or not verify_password(user.password, db_user.hashed_password):
+async def login(user: schemas.UserLogin, db: AsyncSession = Depends(get_async_db)):
+    db_user = await get_user_by_email(db, email=user.email)
+    if not db_user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid credentials"
         )
-    
-    return {"message": "Login successful", "user_id": db_user.id}
\ No newline at end of file
+
+    try:
+        matches, upgraded_hash = await password_hasher.verify(user.password, db_user.hashed_password)
+    except HashingBusy:
+        raise hashing_busy_error()
+    if not matches:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid credentials"
+        )
+
+    if upgraded_hash:
+        # Existing bcrypt hashes move to the configured scheme on next login
+        db_user.hashed_password = upgraded_hash
+        await db.commit()
+
+    return {
+        "message": "Login successful",
+        "user_id": db_user.id,
+        **token_service.issue_pair(db_user.id, db_user.email)
+    }
@@ -0,0 +1,164 @@
+import re
+
+import numpy as np
+
+from .facets import rank_by_value
+
+# "$140,000 - $180,000", "$120k-$150k", "$45/hr", "80,000 USD": the first
+# figure, and a second one only when joined to it by -, – or "to"
+SALARY_AMOUNT = r"(\d[\d,]*(?:\.\d+)?)\s*(?:([km])(?![a-z]))?"
+SALARY_RANGE_RE = re.compile(
+    SALARY_AMOUNT + r"(?:\s*(?:-|–|—|to\b)\s*[$€£]?\s*" + SALARY_AMOUNT + ")?", re.IGNORECASE
+)
+# Retirement plans ("401k", "403(b)") look like k-suffixed figures
+PLAN_NAME_RE = re.compile(r"\b(?:401|403|457)\s*\(?[kb]\)?(?![a-z])", re.IGNORECASE)
+HOURLY_RE = re.compile(r"/\s*h(?:ou)?r|per\s+hour|hourly", re.IGNORECASE)
+MONTHLY_RE = re.compile(r"/\s*mo(?:nth)?|per\s+month|monthly", re.IGNORECASE)
+HOURS_PER_YEAR = 2080
+
+SALARY_MATCHES = ("overlap", "within")
+SALARY_SORTS = ("salary_desc", "salary_asc")
+
+
+def _amount(number: str, suffix: str) -> float:
+    value = float(number.replace(",", ""))
+    if suffix in ("k", "K"):
+        value *= 1000
+    elif suffix in ("m", "M"):
+        value *= 1000000
+    return value
+
+
+def parse_salary(text: str):
+    """Annual (min, max) in whole currency units, or (None, None) if there is no figure.
+
+    Only the leading figure or range is read, so extras such as
+    "+ 401k match" or "+ $20k bonus" never widen it.
+    """
+    text = PLAN_NAME_RE.sub(" ", text or "")
+    match = SALARY_RANGE_RE.search(text)
+    if match is None:
+        return None, None
+    low_number, low_suffix, high_number, high_suffix = match.groups()
+    amounts = [_amount(low_number, low_suffix)]
+    if high_number is not None:
+        amounts.append(_amount(high_number, high_suffix))
+    # The pay period follows the figures, but not past the extras
+    period = text[:match.end()] + text[match.end():].split("+", 1)[0]
+    if HOURLY_RE.search(period):
+        amounts = [value * HOURS_PER_YEAR for value in amounts]
+    elif MONTHLY_RE.search(period):
+        amounts = [value * 12 for value in amounts]
+    return int(round(min(amounts))), int(round(max(amounts)))
+
+
+def salary_range(job: dict):
+    if job.get('salary_min') is not None or job.get('salary_max') is not None:
+        low, high = job.get('salary_min'), job.get('salary_max')
+        return (low if low is not None else high), (high if high is not None else low)
+    return parse_salary(job.get('salary'))
+
+
+def ensure_salary_range(job: dict) -> dict:
+    # Parsed once, when the job enters the catalog; stores persist the numbers
+    job['salary_min'], job['salary_max'] = salary_range(job)
+    return job
+
+
+class SalaryIndex:
+    """Numeric salary ranges keyed by the search index's document ordinals.
+
+    Ordinals are kept sorted by salary_min and by salary_max, so a range
+    predicate is two binary searches (``np.searchsorted``) that each select
+    a contiguous slice of ordinals: "overlaps [a, b]" is max >= a and
+    min <= b; "within [a, b]" is min >= a and max <= b. The sorted views are
+    rebuilt lazily on the first query after a write. Jobs without a salary
+    never match a salary filter and sort last.
+    """
+
+    # Stand-ins for a missing salary when sorting, chosen so those jobs sort last
+    MISSING_LOW = -1
+    MISSING_HIGH = 2 ** 62
+
+    def __init__(self):
+        self._min = np.zeros(1024, dtype=np.int64)
+        self._max = np.zeros(1024, dtype=np.int64)
+        self._known = np.zeros(1024, dtype=bool)
+        self._ids = np.zeros(1024, dtype=np.int64)
+        self._size = 0
+        self._sorted = None
+
+    def _grow(self, needed: int):
+        capacity = max(needed, len(self._min) * 2)
+        for name in ("_min", "_max", "_known", "_ids"):
+            old = getattr(self, name)
+            grown = np.zeros(capacity, dtype=old.dtype)
+            grown[:len(old)] = old
+            setattr(self, name, grown)
+
+    def add(self, ordinal: int, job: dict):
+        if ordinal >= len(self._min):
+            self._grow(ordinal + 1)
+        low, high = salary_range(job)
+        self._ids[ordinal] = job['id']
+        self._known[ordinal] = low is not None
+        self._min[ordinal] = low if low is not None else 0
+        self._max[ordinal] = high if high is not None else 0
+        self._size = max(self._size, ordinal + 1)
+        self._sorted = None
+
+    def remove(self, ordinal: int):
+        if ordinal < self._size:
+            self._known[ordinal] = False
+            self._sorted = None
+
+    def _sorted_views(self):
+        if self._sorted is None:
+            known = np.flatnonzero(self._known[:self._size])
+            by_min = known[np.argsort(self._min[known], kind="stable")]
+            by_max = known[np.argsort(self._max[known], kind="stable")]
+            self._sorted = (by_min, self._min[by_min], by_max, self._max[by_max])
+        return self._sorted
+
+    def range_mask(self, low=None, high=None, match: str = "overlap"):
+        """Boolean mask over ordinals of jobs whose salary satisfies the range."""
+        by_min, mins, by_max, maxes = self._sorted_views()
+        mask = np.zeros(self._size, dtype=bool)
+        mask[by_min] = True
+        if match == "within":
+            if low is not None:
+                selected = np.zeros(self._size, dtype=bool)
+                selected[by_min[np.searchsorted(mins, low, side="left"):]] = True
+                mask &= selected
+            if high is not None:
+                selected = np.zeros(self._size, dtype=bool)
+                selected[by_max[:np.searchsorted(maxes, high, side="right")]] = True
+                mask &= selected
+        else:
+            if low is not None:
+                selected = np.zeros(self._size, dtype=bool)
+                selected[by_max[np.searchsorted(maxes, low, side="left"):]] = True
+                mask &= selected
+            if high is not None:
+                selected = np.zeros(self._size, dtype=bool)
+                selected[by_min[:np.searchsorted(mins, high, side="right")]] = True
+                mask &= selected
+        return mask
+
+    def ranked(self, ordinals, descending: bool = True, limit: int = None, after=None):
+        """Order ``ordinals`` by salary; returns [(salary, ordinal), ...].
+
+        Descending sorts by salary_max, ascending by salary_min; ties go to
+        the higher job id. ``after`` is a (salary, job_id) keyset position.
+        """
+        ordinals = np.asarray(ordinals, dtype=np.int64)
+        known = self._known[ordinals]
+        if descending:
+            values = np.where(known, self._max[ordinals], self.MISSING_LOW)
+        else:
+            values = np.where(known, self._min[ordinals], self.MISSING_HIGH)
+        keys = -values if descending else values
+        if after is not None and descending:
+            after = (-after[0], after[1])
+        positions = rank_by_value(keys, self._ids[ordinals], limit, after)
+        return [(int(values[i]), int(ordinals[i])) for i in positions]
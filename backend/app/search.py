@@ -0,0 +1,417 @@
+import math
+import re
+import threading
+from array import array
+from bisect import bisect_left
+
+import numpy as np
+import orjson
+
+from .facets import FacetIndex, rank_by_value
+from .fuzzy import FUZZY_FIELDS, FUZZY_WEIGHT, TrigramIndex
+from .geo import DISTANCE_SORT, GeoIndex
+from .salary import SALARY_SORTS, SalaryIndex
+from .suggest import SUGGEST_LIMIT, SuggestionIndex
+
+# Splits on anything that isn't a letter or digit, but keeps trailing +/# so
+# skills like "C++" and "C#" survive as their own tokens
+TOKEN_RE = re.compile(r"[a-z0-9]+[+#]*")
+
+# Weighted term frequency per field (BM25F-style): a hit in the title counts
+# more than the same word buried in the description
+FIELD_WEIGHTS = {
+    "title": 3.0,
+    "company": 2.0,
+    "skills_required": 2.0,
+    "description": 1.0,
+}
+
+# Everything the index and its facet, salary, geo and suggestion parts read
+INDEXED_FIELDS = tuple(FIELD_WEIGHTS) + (
+    "posted_date", "type", "experience", "location", "salary", "salary_min", "salary_max",
+)
+
+# Sorts that order by a per-job value; their cursors are (value, job_id)
+VALUE_SORTS = SALARY_SORTS + (DISTANCE_SORT,)
+
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+
+def tokenize(text: str):
+    if not text:
+        return []
+    return TOKEN_RE.findall(text.lower())
+
+
+def job_digest(job: dict) -> int:
+    """Hash of every field the index reads, to recognize an unchanged job."""
+    return hash(orjson.dumps([job.get(field) for field in INDEXED_FIELDS]))
+
+
+def _field_text(job: dict, field: str) -> str:
+    value = job.get(field) or ""
+    if isinstance(value, list):
+        return " ".join(value)
+    return value
+
+
+class JobSearchIndex:
+    """In-memory inverted index over the job catalog with BM25 ranking.
+
+    Every job gets a dense ordinal when it is added. Posting lists hold
+    ordinals in ascending order next to a parallel array of weighted term
+    frequencies. A query is evaluated as a boolean mask over ordinals
+    (every term's posting list, the filters and the live jobs), BM25 is
+    scored with numpy over whole posting lists, and only the top hits are
+    fully sorted, so no job document and no per-hit Python code is
+    involved. Hits that tie on score, and filter-only or date-ordered
+    queries, follow catalog order, which is kept as a rank per ordinal and
+    rebuilt lazily on the first query after a write. ``facets`` indexes the
+    same ordinals by type, experience level, work mode and skill,
+    ``salaries`` by numeric salary range and ``geo`` by location;
+    ``suggestions`` serves typeahead over the same jobs.
+
+    Re-adding a job with the same content is a no-op. An updated job keeps
+    its ordinal: its old postings are taken out (each ordinal remembers its
+    terms) and the new ones inserted in order. Removed jobs free their
+    ordinal for the next new job, so the arrays only grow with the catalog.
+
+    A query word with no posting list is treated as a typo: it matches the
+    words ``vocabulary`` finds within a small edit distance, each edit
+    halving (FUZZY_WEIGHT) that word's contribution to the score. Words
+    that match exactly are never expanded.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._term_ids = {}      # term -> term id
+        self._postings = []      # term id -> (array of ordinals, array of weighted tf)
+        self._ordinal_terms = []  # ordinal -> array of its term ids
+        self._digests = array('q')  # ordinal -> hash of the indexed fields
+        self._free = []          # ordinals of removed jobs, reused first
+        self._ids = array('q')   # ordinal -> job id
+        self._lengths = array('f')
+        self._date_codes = array('I')  # ordinal -> index into _dates
+        self._dates = []         # distinct posted_date values
+        self._date_code_of = {}
+        self._catalog = None     # catalog order, rebuilt after writes
+        self._ordinal_by_id = {}
+        self._total_length = 0.0
+        self.facets = FacetIndex()
+        self.salaries = SalaryIndex()
+        self.geo = GeoIndex()
+        self.vocabulary = TrigramIndex()
+        self.suggestions = SuggestionIndex()
+
+    def __len__(self):
+        return len(self._ordinal_by_id)
+
+    def add(self, job: dict):
+        with self._lock:
+            self._add(job)
+
+    def add_many(self, jobs):
+        with self._lock:
+            for job in jobs:
+                self._add(job)
+
+    def remove(self, job_id: int):
+        with self._lock:
+            self._remove(job_id)
+
+    def _remove(self, job_id: int):
+        ordinal = self._ordinal_by_id.pop(job_id, None)
+        if ordinal is None:
+            return
+        self._unindex(ordinal)
+        self._free.append(ordinal)
+        self._catalog = None
+
+    def _unindex(self, ordinal: int):
+        for term_id in self._ordinal_terms[ordinal]:
+            ordinals, freqs = self._postings[term_id]
+            position = bisect_left(ordinals, ordinal)
+            del ordinals[position]
+            del freqs[position]
+        self._ordinal_terms[ordinal] = array('I')
+        self._total_length -= self._lengths[ordinal]
+        self.facets.remove(ordinal)
+        self.salaries.remove(ordinal)
+        self.geo.remove(ordinal)
+        self.suggestions.remove(ordinal)
+
+    def _add(self, job: dict):
+        digest = job_digest(job)
+        ordinal = self._ordinal_by_id.get(job['id'])
+        if ordinal is not None:
+            if self._digests[ordinal] == digest:
+                return
+            self._unindex(ordinal)
+        elif self._free:
+            ordinal = self._free.pop()
+        else:
+            ordinal = len(self._ids)
+            self._ids.append(0)
+            self._lengths.append(0.0)
+            self._date_codes.append(0)
+            self._digests.append(0)
+            self._ordinal_terms.append(array('I'))
+
+        term_freqs = {}
+        length = 0.0
+        for field, weight in FIELD_WEIGHTS.items():
+            for token in tokenize(_field_text(job, field)):
+                term_freqs[token] = term_freqs.get(token, 0.0) + weight
+                length += weight
+                if field in FUZZY_FIELDS:
+                    self.vocabulary.add(token)
+
+        posted_date = job.get('posted_date') or ""
+        date_code = self._date_code_of.get(posted_date)
+        if date_code is None:
+            date_code = self._date_code_of[posted_date] = len(self._dates)
+            self._dates.append(posted_date)
+
+        self._ids[ordinal] = job['id']
+        self._lengths[ordinal] = length
+        self._date_codes[ordinal] = date_code
+        self._digests[ordinal] = digest
+        self._catalog = None
+        self._ordinal_by_id[job['id']] = ordinal
+        self._total_length += length
+        self.facets.add(ordinal, job)
+        self.salaries.add(ordinal, job)
+        self.geo.add(ordinal, job)
+        self.suggestions.add(ordinal, job)
+
+        term_ids = array('I')
+        for term, tf in term_freqs.items():
+            term_id = self._term_ids.get(term)
+            if term_id is None:
+                term_id = self._term_ids[term] = len(self._postings)
+                self._postings.append((array('I'), array('f')))
+            ordinals, freqs = self._postings[term_id]
+            # New ordinals append; reused ones are inserted to keep the list sorted
+            if not ordinals or ordinals[-1] < ordinal:
+                ordinals.append(ordinal)
+                freqs.append(tf)
+            else:
+                position = bisect_left(ordinals, ordinal)
+                ordinals.insert(position, ordinal)
+                freqs.insert(position, tf)
+            term_ids.append(term_id)
+        self._ordinal_terms[ordinal] = term_ids
+
+    def _posting(self, term):
+        term_id = self._term_ids.get(term)
+        if term_id is None or not self._postings[term_id][0]:
+            return None
+        return self._postings[term_id]
+
+    def _fuzzy_posting(self, term):
+        """One posting list for the corrections of term, with per-hit score boosts."""
+        parts = [
+            (posting, FUZZY_WEIGHT ** edits)
+            for posting, edits in (
+                (self._posting(word), edits) for word, edits in self.vocabulary.corrections(term)
+            )
+            if posting is not None
+        ]
+        if not parts:
+            return None
+        ordinals = np.concatenate([np.frombuffer(posting[0], dtype=np.uint32) for posting, _ in parts])
+        freqs = np.concatenate([np.frombuffer(posting[1], dtype=np.float32) for posting, _ in parts])
+        boosts = np.concatenate([np.full(len(posting[0]), boost, dtype=np.float32) for posting, boost in parts])
+        # A job containing several corrections counts once, via the closest one
+        order = np.lexsort((-boosts, ordinals))
+        ordinals, freqs, boosts = ordinals[order], freqs[order], boosts[order]
+        first = np.ones(len(ordinals), dtype=bool)
+        first[1:] = ordinals[1:] != ordinals[:-1]
+        return ordinals[first], freqs[first], boosts[first]
+
+    def _posting_lists(self, terms):
+        # [(ordinals, weighted tfs, boosts or None)] as numpy arrays; None
+        # when some term matches nothing, even fuzzily, so the query can't match
+        posting_lists = []
+        for term in terms:
+            posting = self._posting(term)
+            if posting is not None:
+                posting_lists.append((
+                    np.frombuffer(posting[0], dtype=np.uint32), np.frombuffer(posting[1], dtype=np.float32), None
+                ))
+                continue
+            posting = self._fuzzy_posting(term)
+            if posting is None:
+                return None
+            posting_lists.append(posting)
+        return posting_lists
+
+    def _narrow(self, mask, filters):
+        # The non-facet filters: "salary": [min, max, match] and
+        # "near": [lat, lon, radius_miles]. Remote jobs are always near.
+        salary = filters.get("salary")
+        if salary:
+            mask &= self.salaries.range_mask(*salary)
+        near = filters.get("near")
+        if near:
+            mask &= self.geo.radius_mask(*near) | self.facets.value_mask("work_mode", "remote")
+        return mask
+
+    def _filter_mask(self, mask, filters):
+        return self.facets.apply_filters(self._narrow(mask, filters), filters)
+
+    def _matches(self, terms, filters):
+        """(mask of live ordinals matching every term and filter, posting lists)."""
+        mask = self.facets.live_mask()
+        posting_lists = []
+        if terms:
+            posting_lists = self._posting_lists(terms)
+            if posting_lists is None:
+                return np.zeros(len(mask), dtype=bool), []
+            # Shortest first, so later terms only narrow an already small mask
+            for ordinals, _, _ in sorted(posting_lists, key=lambda posting: len(posting[0])):
+                term_mask = np.zeros(len(mask), dtype=bool)
+                term_mask[ordinals] = True
+                mask &= term_mask
+        if filters:
+            mask = self._filter_mask(mask, filters)
+        return mask, posting_lists
+
+    def _catalog_order(self):
+        """(date rank, catalog rank per ordinal, ordinals newest first, sorted distinct dates, ids)."""
+        if self._catalog is None:
+            ids = np.frombuffer(self._ids, dtype=np.int64).copy()
+            sorted_codes = sorted(range(len(self._dates)), key=self._dates.__getitem__)
+            rank_of_code = np.empty(len(self._dates), dtype=np.int64)
+            rank_of_code[sorted_codes] = np.arange(len(sorted_codes))
+            date_ranks = rank_of_code[np.frombuffer(self._date_codes, dtype=np.uint32)]
+            # Oldest first by (posted_date, id); the rank grows with recency
+            ascending = np.lexsort((ids, date_ranks))
+            catalog_ranks = np.empty(len(ascending), dtype=np.int64)
+            catalog_ranks[ascending] = np.arange(len(ascending))
+            self._catalog = (
+                date_ranks, catalog_ranks, ascending[::-1], [self._dates[code] for code in sorted_codes], ids
+            )
+        return self._catalog
+
+    def _before(self, ordinals, posted_date: str, job_id: int):
+        """Mask of ``ordinals`` that come after (posted_date, job_id) in catalog order."""
+        date_ranks, _, _, sorted_dates, ids = self._catalog_order()
+        position = bisect_left(sorted_dates, posted_date)
+        ranks = date_ranks[ordinals]
+        older = ranks < position
+        if position < len(sorted_dates) and sorted_dates[position] == posted_date:
+            older |= (ranks == position) & (ids[ordinals] < job_id)
+        return older
+
+    def matching_ids(self, query: str, filters: dict = None, after: int = None, limit: int = None):
+        """Ids of the jobs matching the query and filters, ascending (unranked).
+
+        ``after`` and ``limit`` page through them: only ids above ``after``
+        are returned, at most ``limit`` of them.
+        """
+        terms = list(dict.fromkeys(tokenize(query)))
+        if not terms and not filters:
+            return []
+        with self._lock:
+            mask, _ = self._matches(terms, filters)
+            ids = np.frombuffer(self._ids, dtype=np.int64)[np.flatnonzero(mask)]
+        if after is not None:
+            ids = ids[ids > after]
+        if limit is not None and limit < len(ids):
+            ids = np.partition(ids, limit - 1)[:limit]
+        return np.sort(ids).tolist()
+
+    def suggest(self, prefix: str, limit: int = SUGGEST_LIMIT):
+        with self._lock:
+            return self.suggestions.suggest(prefix, limit)
+
+    def facet_counts(self, query: str = None, filters: dict = None) -> dict:
+        """Facet value counts over the jobs matching ``query`` (every job when empty)."""
+        terms = list(dict.fromkeys(tokenize(query)))
+        filters = filters or {}
+        with self._lock:
+            mask, _ = self._matches(terms, None)
+            # Salary and distance narrow the base set; facets are counted within it
+            return self.facets.counts(self._narrow(mask, filters), filters)
+
+    def search(self, query: str, limit: int = None, after=None, filters: dict = None, sort: str = "relevance"):
+        """Return (total_matches, [(score, job_id, posted_date), ...]) best first.
+
+        All query terms must match (AND semantics), and so must the facet
+        and salary ``filters`` (see FacetIndex and SalaryIndex). Filters
+        without terms match every job with score 0, which leaves them in
+        catalog order; so does ``sort="date"``. When ``limit`` is given only
+        the top ``limit`` hits are materialized and sorted. ``after`` is a
+        (score, posted_date, job_id) position from a previous page; only
+        hits ranked below it are returned. The total always counts every
+        match.
+
+        With a VALUE_SORTS ``sort`` ("salary_desc", "salary_asc", or
+        "distance" from the "near" filter's origin) the score is the value
+        the hits are ordered by (see SalaryIndex.ranked and GeoIndex.ranked),
+        an empty query matches every job, and ``after`` is a (value, job_id)
+        position.
+        """
+        terms = list(dict.fromkeys(tokenize(query)))
+        if not terms and not filters and sort not in VALUE_SORTS:
+            return 0, []
+
+        with self._lock:
+            mask, posting_lists = self._matches(terms, filters)
+            total = int(np.count_nonzero(mask))
+            if not total:
+                return 0, []
+
+            if sort in VALUE_SORTS:
+                matches = np.flatnonzero(mask)
+                if sort == DISTANCE_SORT:
+                    lat, lon, _ = filters["near"]
+                    ranked = self.geo.ranked(matches, lat, lon, limit, after)
+                else:
+                    ranked = self.salaries.ranked(matches, sort == "salary_desc", limit, after)
+                return total, [
+                    (value, self._ids[o], self._posted_date(o)) for value, o in ranked
+                ]
+
+            _, catalog_ranks, order, _, _ = self._catalog_order()
+            if sort == "date" or not posting_lists:
+                # Every score is 0: the hits are the catalog order, masked
+                ranked = order[mask[order]]
+                if after is not None and after[0] <= 0:
+                    ranked = ranked[self._before(ranked, after[1], after[2])] if after[0] == 0 else ranked[:0]
+                if limit is not None:
+                    ranked = ranked[:limit]
+                return total, [(0.0, self._ids[o], self._posted_date(o)) for o in ranked.tolist()]
+
+            doc_count = len(self)
+            avg_length = self._total_length / doc_count if doc_count else 1.0
+            lengths = np.frombuffer(self._lengths, dtype=np.float32)
+            scores = np.zeros(len(mask), dtype=np.float64)
+            for ordinals, freqs, boosts in posting_lists:
+                doc_freq = len(ordinals)
+                idf = math.log(1 + (doc_count - doc_freq + 0.5) / (doc_freq + 0.5))
+                tf = freqs.astype(np.float64)
+                norm = BM25_K1 * (1 - BM25_B + BM25_B * lengths[ordinals].astype(np.float64) / avg_length)
+                score = idf * tf * (BM25_K1 + 1) / (tf + norm)
+                # Ordinals are unique within a posting list, so this is a scatter-add
+                scores[ordinals] += score if boosts is None else score * boosts
+
+            candidates = np.flatnonzero(mask)
+            candidate_scores = scores[candidates]
+            if after is not None:
+                keep = (candidate_scores < after[0]) | (
+                    (candidate_scores == after[0]) & self._before(candidates, after[1], after[2])
+                )
+                candidates, candidate_scores = candidates[keep], candidate_scores[keep]
+
+            # Best score first; ties fall back to catalog order (newest first)
+            positions = rank_by_value(-candidate_scores, catalog_ranks[candidates], limit)
+            return total, [
+                (float(candidate_scores[i]), self._ids[candidates[i]], self._posted_date(candidates[i]))
+                for i in positions.tolist()
+            ]
+
+    def _posted_date(self, ordinal) -> str:
+        return self._dates[self._date_codes[ordinal]]
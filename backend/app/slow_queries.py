@@ -0,0 +1,184 @@
+import logging
+import os
+import threading
+import time
+
+from .metrics import query_verb
+
+logger = logging.getLogger(__name__)
+
+# Statements at or above this many milliseconds are logged; unset turns the
+# slow-query log off (0 logs everything)
+SLOW_QUERY_MS = os.getenv("SLOW_QUERY_MS")
+MAX_SLOW_STATEMENTS = int(os.getenv("SLOW_QUERY_MAX_STATEMENTS", "500"))
+MAX_PARAM_SHAPES = 5
+EXPLAINABLE_VERBS = {"SELECT", "INSERT", "UPDATE", "DELETE", "REPLACE", "WITH"}
+SLOW_QUERY_ORDERS = ("total", "max", "count", "last_seen")
+
+
+def normalize_sql(sql: str) -> str:
+    return " ".join(sql.split())
+
+
+def param_shape(params) -> str:
+    """Types of the bound parameters, never their values: "(int, str, NoneType)"."""
+    if isinstance(params, dict):
+        return "{" + ", ".join(f"{name}: {type(value).__name__}" for name, value in params.items()) + "}"
+    if isinstance(params, (list, tuple)):
+        return "(" + ", ".join(type(value).__name__ for value in params) + ")"
+    return type(params).__name__
+
+
+def format_sqlite_plan(rows):
+    """EXPLAIN QUERY PLAN rows (id, parent, notused, detail) as an indented tree."""
+    depth = {0: -1}
+    lines = []
+    for row in rows:
+        node, parent, detail = row[0], row[1], row[3]
+        depth[node] = depth.get(parent, -1) + 1
+        lines.append("  " * depth[node] + detail)
+    return lines
+
+
+class SlowStatement:
+    __slots__ = ("database", "sql", "count", "total", "max", "last_seen", "param_shapes", "plan")
+
+    def __init__(self, database: str, sql: str):
+        self.database = database
+        self.sql = sql
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.last_seen = 0.0
+        self.param_shapes = []
+        self.plan = None
+
+    def to_dict(self) -> dict:
+        return {
+            "database": self.database,
+            "sql": self.sql,
+            "count": self.count,
+            "total_ms": round(self.total * 1000, 3),
+            "mean_ms": round(self.total / self.count * 1000, 3),
+            "max_ms": round(self.max * 1000, 3),
+            "last_seen": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(self.last_seen)),
+            "param_shapes": list(self.param_shapes),
+            "plan": self.plan,
+        }
+
+
+class SlowQueryLog:
+    """Statements slower than a threshold, aggregated per database and SQL text.
+
+    Callers time their own statements and hand over the slow ones, so a
+    fast statement costs one comparison. The first time a statement is
+    slow its query plan is captured through ``explain`` (run once per
+    statement, not per occurrence). Only parameter types are kept, since
+    values include emails, password hashes and reset tokens.
+    """
+
+    def __init__(self, threshold_ms: float, max_statements: int = MAX_SLOW_STATEMENTS):
+        self.threshold = threshold_ms / 1000
+        self.max_statements = max_statements
+        self._statements = {}        # (database, sql) -> SlowStatement
+        self._lock = threading.Lock()
+        self.dropped = 0
+
+    def record(self, database: str, sql: str, params, seconds: float, explain=None):
+        """Add one slow execution; ``explain(sql, params)`` returns plan lines."""
+        text = normalize_sql(sql)
+        shape = param_shape(params)
+        key = (database, text)
+        with self._lock:
+            statement = self._statements.get(key)
+            if statement is None:
+                if len(self._statements) >= self.max_statements:
+                    self.dropped += 1
+                    return
+                statement = self._statements[key] = SlowStatement(database, text)
+            statement.count += 1
+            statement.total += seconds
+            statement.max = max(statement.max, seconds)
+            statement.last_seen = time.time()
+            if shape not in statement.param_shapes and len(statement.param_shapes) < MAX_PARAM_SHAPES:
+                statement.param_shapes.append(shape)
+            needs_plan = statement.plan is None
+            if needs_plan:
+                # Claimed under the lock so concurrent slow runs explain it once
+                statement.plan = []
+
+        if needs_plan and explain is not None and query_verb(text) in EXPLAINABLE_VERBS:
+            try:
+                statement.plan = explain(sql, params)
+            except Exception as e:
+                statement.plan = [f"EXPLAIN failed: {e}"]
+        logger.warning(
+            "Slow query on %s (%.1f ms): %s params=%s%s", database, seconds * 1000, text, shape,
+            "".join("\n    " + line for line in statement.plan) if needs_plan else ""
+        )
+
+    def stats(self, limit: int = 50, order: str = "total") -> dict:
+        with self._lock:
+            statements = list(self._statements.values())
+        statements.sort(key=lambda statement: getattr(statement, order), reverse=True)
+        return {
+            "threshold_ms": self.threshold * 1000,
+            "statements": len(statements),
+            "dropped": self.dropped,
+            "slowest": [statement.to_dict() for statement in statements[:limit]],
+        }
+
+    def reset(self):
+        with self._lock:
+            self._statements.clear()
+            self.dropped = 0
+
+
+def create_slow_query_log():
+    if SLOW_QUERY_MS is None or SLOW_QUERY_MS == "":
+        return None
+    return SlowQueryLog(float(SLOW_QUERY_MS))
+
+
+slow_query_log = create_slow_query_log()
+
+
+def install_sqlalchemy_hooks(engine, log: SlowQueryLog = None):
+    """Time an SQLAlchemy engine's statements into the slow-query log."""
+    log = log or slow_query_log
+    if log is None:
+        return
+    from sqlalchemy import event
+
+    database = engine.url.database and os.path.basename(engine.url.database) or engine.url.get_backend_name()
+    prefix = "EXPLAIN QUERY PLAN " if engine.dialect.name == "sqlite" else "EXPLAIN "
+
+    # The start time rides on the execution context, so a statement that
+    # raises (and never reaches after_cursor_execute) leaves nothing behind
+    @event.listens_for(engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if context is not None:
+            context.slow_query_started = time.perf_counter()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        started = getattr(context, "slow_query_started", None)
+        if started is None:
+            return
+        seconds = time.perf_counter() - started
+        if seconds < log.threshold:
+            return
+
+        def explain(sql, params):
+            # A fresh cursor, so the statement's own results are left unread
+            plan_cursor = cursor.connection.cursor()
+            try:
+                plan_cursor.execute(prefix + sql, params)
+                rows = plan_cursor.fetchall()
+            finally:
+                plan_cursor.close()
+            if engine.dialect.name == "sqlite":
+                return format_sqlite_plan(rows)
+            return [str(row[0]) for row in rows]
+
+        log.record(database, statement, parameters, seconds, None if executemany else explain)
@@ -0,0 +1,99 @@
+import heapq
+from array import array
+from bisect import bisect_left
+
+SUGGEST_LIMIT = 10
+MAX_SUGGEST_LIMIT = 25
+MAX_PREFIX_LENGTH = 100
+# Prefix ranges up to this size are ranked on the fly; larger ones (short
+# prefixes) have their top entries cached until the next catalog change
+SCAN_LIMIT = 256
+
+
+def normalize_phrase(text: str) -> str:
+    return " ".join((text or "").lower().split())
+
+
+class SuggestionIndex:
+    """Typeahead over job titles, companies and skills, weighted by frequency.
+
+    Every distinct phrase is a key with a count of the live jobs using it.
+    Keys are entered in one sorted array once per word start ("senior
+    python developer", "python developer", "developer"), so a prefix is a
+    contiguous range found with two binary searches and a phrase can be
+    found by any of its words. Adding or removing a job only adjusts the
+    counts of its own keys; new keys are merged into the array on the next
+    lookup. Keys are tracked per ordinal of the search index, so a removed
+    or replaced job's old phrases are decremented too.
+    """
+
+    def __init__(self):
+        self._keys = {}                 # (kind, phrase) -> key id
+        self._texts = []                # key id -> display text
+        self._kinds = []
+        self._counts = array('i')
+        self._entries = []              # sorted (phrase suffix, key id)
+        self._pending = []              # entries of keys added since the last lookup
+        # Per ordinal: the key ids of its title, company and skills
+        self._ordinal_keys = {}
+        self._top_cache = {}
+
+    def _key(self, kind: str, text: str):
+        phrase = normalize_phrase(text)
+        if not phrase:
+            return None
+        key_id = self._keys.get((kind, phrase))
+        if key_id is None:
+            key_id = self._keys[(kind, phrase)] = len(self._texts)
+            self._texts.append(" ".join(text.split()))
+            self._kinds.append(kind)
+            self._counts.append(0)
+            words = phrase.split(" ")
+            for start in range(len(words)):
+                self._pending.append((" ".join(words[start:]), key_id))
+        return key_id
+
+    def add(self, ordinal: int, job: dict):
+        # The search index removes an ordinal before reusing it
+        keys = [self._key("title", job.get('title')), self._key("company", job.get('company'))]
+        keys.extend(self._key("skill", skill) for skill in job.get('skills_required') or [])
+        keys = array('I', dict.fromkeys(key for key in keys if key is not None))
+        for key_id in keys:
+            self._counts[key_id] += 1
+        self._ordinal_keys[ordinal] = keys
+        self._top_cache.clear()
+
+    def remove(self, ordinal: int):
+        for key_id in self._ordinal_keys.pop(ordinal, ()):
+            self._counts[key_id] -= 1
+        self._top_cache.clear()
+
+    def _rank(self, key_ids, limit):
+        return heapq.nlargest(
+            limit, (key_id for key_id in key_ids if self._counts[key_id] > 0),
+            key=lambda key_id: (self._counts[key_id], -len(self._texts[key_id]))
+        )
+
+    def _merge_pending(self):
+        # New keys are batched and merged in one sort: both runs are already
+        # ordered, so Timsort merges them in linear time
+        if self._pending:
+            self._pending.sort()
+            self._entries.extend(self._pending)
+            self._entries.sort()
+            self._pending.clear()
+
+    def suggest(self, prefix: str, limit: int = SUGGEST_LIMIT):
+        """Top ``limit`` [(text, kind, count), ...] for phrases with a word starting with prefix."""
+        prefix = normalize_phrase(prefix)
+        if not prefix:
+            return []
+        self._merge_pending()
+        top = self._top_cache.get(prefix)
+        if top is None:
+            lo = bisect_left(self._entries, (prefix,))
+            hi = bisect_left(self._entries, (prefix + "\uffff",), lo)
+            top = self._rank(dict.fromkeys(key_id for _, key_id in self._entries[lo:hi]), MAX_SUGGEST_LIMIT)
+            if hi - lo > SCAN_LIMIT:
+                self._top_cache[prefix] = top
+        return [(self._texts[key_id], self._kinds[key_id], self._counts[key_id]) for key_id in top[:limit]]
@@ -0,0 +1,148 @@
+import logging
+import os
+import secrets
+import threading
+import time
+import uuid
+
+from jose import ExpiredSignatureError, JWTError, jwt
+
+logger = logging.getLogger(__name__)
+
+ACCESS = "access"
+REFRESH = "refresh"
+
+
+class TokenError(Exception):
+    """Raised for any token that is malformed, expired, revoked or of the wrong type."""
+
+
+class RevocationList:
+    """In-memory set of revoked token ids, mirrored from the revoked_tokens table.
+
+    Checking a token never touches the database. Revocations made by this
+    process are visible immediately; ones made by other workers show up
+    after the next ``sync``. Entries are dropped once the token they refer
+    to has expired anyway, so the set only holds live tokens.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._revoked = {}
+        self._last_row_id = 0
+        self.last_synced = None
+
+    def __contains__(self, jti) -> bool:
+        return jti in self._revoked
+
+    def __len__(self):
+        return len(self._revoked)
+
+    def add(self, jti: str, expires_at: int):
+        with self._lock:
+            self._revoked[jti] = expires_at
+
+    def _prune(self, now: int):
+        with self._lock:
+            expired = [jti for jti, expires_at in self._revoked.items() if expires_at <= now]
+            for jti in expired:
+                del self._revoked[jti]
+
+    def sync(self, conn):
+        """Pull rows added since the last sync and purge expired ones."""
+        now = int(time.time())
+        rows = conn.execute(
+            "SELECT id, jti, expires_at FROM revoked_tokens WHERE id > ? AND expires_at > ? ORDER BY id",
+            (self._last_row_id, now)
+        ).fetchall()
+        with self._lock:
+            for row in rows:
+                self._revoked[row['jti']] = row['expires_at']
+            if rows:
+                self._last_row_id = max(self._last_row_id, rows[-1]['id'])
+        self._prune(now)
+        conn.execute("DELETE FROM revoked_tokens WHERE expires_at <= ?", (now,))
+        conn.commit()
+        self.last_synced = now
+
+
+class TokenService:
+    """Issues and verifies signed (JWT) access and refresh tokens.
+
+    Verification is pure computation plus a lookup in ``revoked``, so an
+    authenticated request costs no queries.
+    """
+
+    def __init__(self, secret_key: str, algorithm: str = "HS256",
+                 access_ttl: int = 900, refresh_ttl: int = 7 * 24 * 3600):
+        self.secret_key = secret_key
+        self.algorithm = algorithm
+        self.access_ttl = access_ttl
+        self.refresh_ttl = refresh_ttl
+        self.revoked = RevocationList()
+
+    @classmethod
+    def from_env(cls):
+        secret_key = os.getenv("JWT_SECRET_KEY")
+        if not secret_key:
+            # Fine for local development; tokens won't survive a restart and
+            # aren't shared between workers
+            logger.warning("JWT_SECRET_KEY is not set; using a random per-process key")
+            secret_key = secrets.token_urlsafe(32)
+        return cls(
+            secret_key=secret_key,
+            algorithm=os.getenv("JWT_ALGORITHM", "HS256"),
+            access_ttl=int(os.getenv("ACCESS_TOKEN_TTL_SECONDS", "900")),
+            refresh_ttl=int(os.getenv("REFRESH_TOKEN_TTL_SECONDS", str(7 * 24 * 3600))),
+        )
+
+    def _issue(self, user_id: int, email: str, token_type: str, ttl: int) -> str:
+        now = int(time.time())
+        claims = {
+            "sub": str(user_id),
+            "email": email,
+            "type": token_type,
+            "jti": uuid.uuid4().hex,
+            "iat": now,
+            "exp": now + ttl,
+        }
+        return jwt.encode(claims, self.secret_key, algorithm=self.algorithm)
+
+    def issue_pair(self, user_id: int, email: str) -> dict:
+        return {
+            "access_token": self._issue(user_id, email, ACCESS, self.access_ttl),
+            "refresh_token": self._issue(user_id, email, REFRESH, self.refresh_ttl),
+            "token_type": "bearer",
+            "expires_in": self.access_ttl,
+        }
+
+    def decode(self, token: str, expected_type: str = ACCESS) -> dict:
+        try:
+            claims = jwt.decode(token, self.secret_key, algorithms=[self.algorithm])
+        except ExpiredSignatureError:
+            raise TokenError("Token has expired")
+        except JWTError:
+            raise TokenError("Invalid token")
+        if claims.get("type") != expected_type or "sub" not in claims or "jti" not in claims:
+            raise TokenError("Invalid token")
+        if claims["jti"] in self.revoked:
+            raise TokenError("Token has been revoked")
+        return claims
+
+    def revoke(self, conn, claims: dict) -> bool:
+        """Record a revocation; call on the DB executor with a pooled connection.
+
+        Returns False when the token was already revoked, by this or any
+        other worker. jti is UNIQUE, so of concurrent revocations of the
+        same token exactly one inserts the row and gets True.
+        """
+        inserted = conn.execute(
+            "INSERT OR IGNORE INTO revoked_tokens (jti, user_id, expires_at) VALUES (?, ?, ?)",
+            (claims["jti"], int(claims["sub"]), int(claims["exp"]))
+        ).rowcount
+        conn.commit()
+        self.revoked.add(claims["jti"], int(claims["exp"]))
+        return inserted == 1
+
+
+token_service = TokenService.from_env()
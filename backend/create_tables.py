@@ -1,28 +1,12 @@
-import sqlite3
-
 def create_tables():
-    # Connect to SQLite database (creates it if it doesn't exist)
-    conn = sqlite3.connect('auth.db')
-    cursor = conn.cursor()
-    
-    # Create users table
-    cursor.execute('''
-    CREATE TABLE IF NOT EXISTS users (
-        id INTEGER PRIMARY KEY AUTOINCREMENT,
-        email TEXT UNIQUE NOT NULL,
-        hashed_password TEXT NOT NULL,
-        created_at DATETIME DEFAULT CURRENT_TIMESTAMP
-    )
-    ''')
-    
-    # Create index on email
-    cursor.execute('CREATE INDEX IF NOT EXISTS idx_users_email ON users(email)')
-    
-    # Commit and close
-    conn.commit()
-    conn.close()
-    
-    print("✅ Users table created successfully!")
+    # The app owns the schema (users, profiles, reset tokens, recommendations,
+    # revoked tokens); importing it creates every table in auth.db
+    from app.main import DATABASE_PATH, init_db
+
+    init_db()
+
+    print(f"✅ Tables created successfully in {DATABASE_PATH}!")
+    print("   Bulk-create accounts with: python -m app.provision users.csv")
 
 if __name__ == "__main__":
-    create_tables()
\ No newline at end of file
+    create_tables()
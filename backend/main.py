@@ -2,13 +2,14 @@ from fastapi import FastAPI, HTTPException, Depends
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
 from typing import Optional
-import sqlite3
 import hashlib
 import os
 import secrets
 import datetime
 import re
 
+from app.db_pool import SQLitePool, pool_settings_from_env
+
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 DATABASE_PATH = os.path.join(BASE_DIR, '..', 'auth.db')
 
@@ -70,10 +71,10 @@ class ProfileUpdate(BaseModel):
     github_profile: Optional[str] = None
     resume_cv: Optional[str] = None
 
+db_pool = SQLitePool(DATABASE_PATH, **pool_settings_from_env())
+
 def get_db_connection():
-    conn = sqlite3.connect(DATABASE_PATH)
-    conn.row_factory = sqlite3.Row
-    return conn
+    return db_pool.acquire()
 
 def init_db():
     conn = get_db_connection()
@@ -252,6 +253,7 @@ def update_user_profile(user_id: int, profile: ProfileUpdate):
         ).fetchone()
         
         if not user:
+            conn.close()
             raise HTTPException(status_code=404, detail="User not found")
         
         # Build update query dynamically based on provided fields
@@ -264,6 +266,7 @@ def update_user_profile(user_id: int, profile: ProfileUpdate):
                 values.append(value.strip() if isinstance(value, str) else value)
         
         if not update_fields:
+            conn.close()
             raise HTTPException(status_code=400, detail="No fields to update")
         
         # Add updated_at timestamp
@@ -340,6 +343,7 @@ def reset_password(request: ResetPasswordRequest):
         ).fetchone()
         
         if not token_record:
+            conn.close()
             raise HTTPException(status_code=400, detail="Invalid or expired reset token")
         
         new_password_hash = hash_password(request.new_password)
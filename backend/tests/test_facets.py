@@ -0,0 +1,34 @@
+import numpy as np
+
+from app.facets import rank_by_value
+
+
+def test_rank_by_value_orders_ascending_with_ties_to_the_higher_id():
+    keys = np.array([30, 10, 20, 10, 30])
+    ids = np.array([1, 2, 3, 4, 5])
+    assert rank_by_value(keys, ids).tolist() == [3, 1, 2, 4, 0]
+
+
+def test_rank_by_value_limit_matches_the_full_ranking():
+    rng = np.random.default_rng(7)
+    keys = rng.integers(0, 20, size=500)
+    ids = np.arange(500)
+    full = rank_by_value(keys, ids).tolist()
+    for limit in (1, 10, 499, 500, 1000):
+        assert rank_by_value(keys, ids, limit).tolist() == full[:limit]
+
+
+def test_rank_by_value_pages_with_after():
+    rng = np.random.default_rng(11)
+    keys = rng.integers(0, 20, size=300)
+    ids = rng.permutation(300)
+    full = rank_by_value(keys, ids).tolist()
+
+    served, after = [], None
+    while True:
+        page = rank_by_value(keys, ids, 25, after).tolist()
+        if not page:
+            break
+        served.extend(page)
+        after = (keys[page[-1]], ids[page[-1]])
+    assert served == full
@@ -0,0 +1,50 @@
+from app.fuzzy import TrigramIndex, bounded_edit_distance
+
+
+def test_bounded_edit_distance():
+    assert bounded_edit_distance("python", "python", 2) == 0
+    assert bounded_edit_distance("enginer", "engineers", 2) == 2
+    assert bounded_edit_distance("kubernetes", "kubernets", 2) == 1
+    assert bounded_edit_distance("react", "reacts", 1) == 1
+
+
+def test_bounded_edit_distance_gives_up_past_the_limit():
+    assert bounded_edit_distance("python", "pascal", 2) is None
+    assert bounded_edit_distance("java", "javascript", 2) is None
+    assert bounded_edit_distance("pyhtno", "python", 1) is None
+
+
+def test_corrections_closest_first():
+    index = TrigramIndex()
+    for word in ("python", "pylons", "engineer", "engineering", "developer"):
+        index.add(word)
+    assert index.corrections("enginer") == [("engineer", 1)]
+    assert index.corrections("pythn") == [("python", 1)]
+    assert index.corrections("developr") == [("developer", 1)]
+
+
+def test_corrections_skip_exact_and_short_words():
+    index = TrigramIndex()
+    for word in ("python", "java", "go"):
+        index.add(word)
+    # An exact match is not a correction, and short terms are never corrected
+    assert index.corrections("python") == []
+    assert index.corrections("jav") == []
+    assert TrigramIndex().corrections("python") == []
+
+
+def test_adjacent_swaps_cost_one_edit():
+    assert bounded_edit_distance("pyhton", "python", 1) == 1
+    assert bounded_edit_distance("ab", "ba", 1) == 1
+    assert bounded_edit_distance("jaav", "java", 1) == 1
+    assert bounded_edit_distance("kubrenetes", "kubernetes", 2) == 1
+    # Optimal string alignment: a swapped pair is not edited again
+    assert bounded_edit_distance("ca", "abc", 2) is None
+
+
+def test_corrections_find_swapped_letters():
+    index = TrigramIndex()
+    for word in ("python", "typescript", "engineer"):
+        index.add(word)
+    assert index.corrections("pyhton") == [("python", 1)]
+    assert index.corrections("enigneer") == [("engineer", 1)]
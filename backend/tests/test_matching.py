@@ -0,0 +1,59 @@
+from app.matching import SkillMatcher
+
+
+def make_matcher():
+    matcher = SkillMatcher(initial_capacity=2)
+    matcher.add_many([
+        {"id": 1, "skills_required": ["Python", "SQL"]},
+        {"id": 2, "skills_required": ["Python", "React", "CSS", "AWS"]},
+        {"id": 3, "skills_required": ["Java"]},
+        {"id": 4, "skills_required": ["python", "sql", "docker"]},
+    ])
+    return matcher
+
+
+def test_top_k_ranks_by_overlap_then_coverage():
+    matcher = make_matcher()
+    assert matcher.top_k(["Python", "SQL"], 3) == [(1, 2, 1.0), (4, 2, 2 / 3), (2, 1, 0.25)]
+    assert matcher.top_k(["Python", "SQL"], 1) == [(1, 2, 1.0)]
+    assert matcher.top_k(["Rust"]) == []
+    assert matcher.top_k([]) == []
+
+
+def test_top_k_sees_updates_and_removals():
+    matcher = make_matcher()
+    matcher.remove(1)
+    matcher.add({"id": 3, "skills_required": ["Python", "SQL"]})
+    assert [job_id for job_id, _, _ in matcher.top_k(["Python", "SQL"])] == [3, 4, 2]
+
+
+def test_snapshot_is_unaffected_by_later_writes():
+    matcher = make_matcher()
+    snapshot = matcher._snapshot(["Python", "SQL"])
+    overlap, _ = SkillMatcher._score(snapshot)
+
+    # Growing past capacity and deactivating rows must not reach the snapshot
+    matcher.add_many([{"id": job_id, "skills_required": ["Python"]} for job_id in range(10, 40)])
+    matcher.remove(1)
+    again, _ = SkillMatcher._score(snapshot)
+    assert again.tolist() == overlap.tolist() == [2, 1, 0, 2]
+
+
+def test_re_adding_unchanged_jobs_is_a_no_op():
+    matcher = make_matcher()
+    matcher.add_many([{"id": 1, "skills_required": ["SQL", "python"]}, {"id": 3, "skills_required": ["Java"]}])
+    assert matcher._rows == 4
+
+
+def test_updates_are_compacted():
+    matcher = SkillMatcher()
+    matcher.COMPACT_MIN_ROWS = 8
+    matcher.add_many([{"id": job_id, "skills_required": ["Python"]} for job_id in range(20)])
+    snapshot = matcher._snapshot(["Python"])
+    for _ in range(3):
+        matcher.add_many([{"id": job_id, "skills_required": ["Python", "Go"]} for job_id in range(10)])
+        matcher.add_many([{"id": job_id, "skills_required": ["Python"]} for job_id in range(10)])
+    assert matcher._rows < 40
+    assert len(matcher) == 20
+    assert sorted(job_id for job_id, _, _ in matcher.top_k(["Python"], 50)) == list(range(20))
+    assert SkillMatcher._score(snapshot)[0].tolist() == [1] * 20
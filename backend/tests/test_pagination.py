@@ -0,0 +1,53 @@
+import base64
+import json
+
+import pytest
+
+from app.pagination import decode_cursor, encode_cursor
+
+
+def raw_cursor(payload) -> str:
+    return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode().rstrip('=')
+
+
+@pytest.mark.parametrize("kind, key, value_sort", [
+    ("browse", ("2024-01-14", 2), False),
+    ("substring", ("2024-01-14", 2), False),
+    ("relevance", (3.25, "2024-01-14", 17), False),
+    ("relevance", (0.0, "", 17), False),
+    ("relevance", (185000, 42), True),
+    ("relevance", (12.5, 42), True),
+])
+def test_cursor_round_trip(kind, key, value_sort):
+    cursor = encode_cursor(kind, "python", key)
+    assert decode_cursor(cursor, kind, "python", value_sort) == list(key)
+
+
+def test_cursor_is_bound_to_its_search():
+    cursor = encode_cursor("relevance", "python", (1.5, "2024-01-14", 3))
+    with pytest.raises(ValueError, match="does not belong"):
+        decode_cursor(cursor, "relevance", "java")
+    with pytest.raises(ValueError, match="does not belong"):
+        decode_cursor(cursor, "browse", "python")
+
+
+@pytest.mark.parametrize("cursor", ["", "not a cursor", "e30", raw_cursor([1, 2])])
+def test_malformed_cursor(cursor):
+    with pytest.raises(ValueError, match="Invalid cursor"):
+        decode_cursor(cursor, "browse", "")
+
+
+@pytest.mark.parametrize("kind, position, value_sort", [
+    ("browse", [1], False),
+    ("browse", "ab", False),
+    ("browse", ["2024-01-14", "2"], False),
+    ("browse", ["2024-01-14", True], False),
+    ("browse", ["2024-01-14", 2, 3], False),
+    ("relevance", [1.5, 2], False),
+    ("relevance", [1.5, "2024-01-14", 2], True),
+    ("relevance", [None, 2], True),
+])
+def test_cursor_with_the_wrong_shape(kind, position, value_sort):
+    cursor = raw_cursor({"k": kind, "q": "", "p": position})
+    with pytest.raises(ValueError, match="Invalid cursor"):
+        decode_cursor(cursor, kind, "", value_sort)
@@ -0,0 +1,33 @@
+import pytest
+
+from app.rate_limit import RateRule, _take
+
+
+def test_take_allows_a_burst_of_capacity():
+    rule = RateRule(3, 3.0)
+    tat = None
+    for _ in range(3):
+        tat, retry_after = _take(tat, 100.0, rule)
+        assert retry_after == 0.0
+    assert tat == pytest.approx(103.0)
+
+    refused, retry_after = _take(tat, 100.0, rule)
+    assert refused == tat
+    assert retry_after == pytest.approx(1.0)
+
+
+def test_take_refills_one_interval_at_a_time():
+    rule = RateRule(2, 10.0)
+    tat, _ = _take(None, 0.0, rule)
+    tat, _ = _take(tat, 0.0, rule)
+    assert _take(tat, 4.0, rule)[1] == pytest.approx(1.0)
+    tat, retry_after = _take(tat, 5.0, rule)
+    assert retry_after == 0.0
+    assert tat == pytest.approx(15.0)
+
+
+def test_take_treats_a_past_time_as_a_full_bucket():
+    rule = RateRule(2, 10.0)
+    tat, retry_after = _take(3.0, 50.0, rule)
+    assert retry_after == 0.0
+    assert tat == pytest.approx(55.0)
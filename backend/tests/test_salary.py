@@ -0,0 +1,35 @@
+import pytest
+
+from app.salary import parse_salary
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("$140,000 - $180,000", (140000, 180000)),
+    ("$120k-$150k", (120000, 150000)),
+    ("$90K – $110K", (90000, 110000)),
+    ("100,000 to 120,000", (100000, 120000)),
+    ("80,000 USD", (80000, 80000)),
+    ("1.2M", (1200000, 1200000)),
+    ("$45/hr", (93600, 93600)),
+    ("$50 to $60 per hour", (104000, 124800)),
+    ("$5,000 monthly", (60000, 60000)),
+])
+def test_parse_salary(text, expected):
+    assert parse_salary(text) == expected
+
+
+@pytest.mark.parametrize("text", ["", None, "Competitive", "DOE"])
+def test_parse_salary_without_a_figure(text):
+    assert parse_salary(text) == (None, None)
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("$100,000 + 401k match", (100000, 100000)),
+    ("$100k + $20k bonus", (100000, 100000)),
+    ("$90k-$110k + 403(b)", (90000, 110000)),
+    ("$120,000 + $10/hr stipend", (120000, 120000)),
+    ("$45 - $55 / hour + benefits", (93600, 114400)),
+    ("401k match only", (None, None)),
+])
+def test_parse_salary_ignores_extras(text, expected):
+    assert parse_salary(text) == expected
@@ -0,0 +1,100 @@
+import random
+
+import pytest
+
+from app.loadtest import synthetic_job
+from app.search import JobSearchIndex
+
+
+@pytest.fixture(scope="module")
+def index():
+    rng = random.Random(3)
+    index = JobSearchIndex()
+    index.add_many(synthetic_job(rng, job_id) for job_id in range(1, 501))
+    # Replaced and removed jobs must not show up or be counted
+    index.add({**synthetic_job(rng, 7), "title": "Staff Rust Engineer"})
+    index.remove(9)
+    return index
+
+
+def catalog_key(hit):
+    _, job_id, posted_date = hit
+    return posted_date, job_id
+
+
+def pages(index, query, per_page, **kwargs):
+    hits, after = [], None
+    while True:
+        _, page = index.search(query, limit=per_page, after=after, **kwargs)
+        if not page:
+            return hits
+        hits.extend(page)
+        score, job_id, posted_date = page[-1]
+        after = [score, job_id] if kwargs.get("sort", "relevance").startswith("salary") else [score, posted_date, job_id]
+
+
+def test_relevance_ranks_by_score_then_catalog_order(index):
+    total, hits = index.search("engineer")
+    assert total == len(hits) > 0
+    keys = [(hit[0], catalog_key(hit)) for hit in hits]
+    assert keys == sorted(keys, reverse=True)
+    assert hits[:10] == index.search("engineer", limit=10)[1]
+
+
+def test_filter_only_and_date_sort_follow_catalog_order(index):
+    total, hits = index.search("", filters={"type": ["contract"]})
+    assert total == len(hits) > 0
+    assert {score for score, _, _ in hits} == {0.0}
+    assert [catalog_key(hit) for hit in hits] == sorted(map(catalog_key, hits), reverse=True)
+
+    _, by_date = index.search("engineer", sort="date")
+    assert [catalog_key(hit) for hit in by_date] == sorted(map(catalog_key, by_date), reverse=True)
+
+
+@pytest.mark.parametrize("query, kwargs", [
+    ("engineer", {}),
+    ("senior python", {}),
+    ("pyhton", {}),
+    ("", {"filters": {"type": ["full-time"]}}),
+    ("engineer", {"sort": "date"}),
+    ("data", {"sort": "salary_desc"}),
+])
+def test_cursor_pages_match_the_full_ranking(index, query, kwargs):
+    _, full = index.search(query, **kwargs)
+    assert pages(index, query, 7, **kwargs) == full
+
+
+def test_replaced_and_removed_jobs(index):
+    _, hits = index.search("rust")
+    assert [job_id for _, job_id, _ in hits] == [7]
+    every_job = index.matching_ids("", {"work_mode": ["remote", "hybrid", "onsite"]})
+    assert len(every_job) == len(index) == 499
+    assert 9 not in every_job
+
+
+def test_updates_reuse_ordinals():
+    rng = random.Random(4)
+    jobs = [synthetic_job(rng, job_id) for job_id in range(1, 51)]
+    index = JobSearchIndex()
+    index.add_many(jobs)
+    index.add_many(dict(job) for job in jobs)
+    index.add({**jobs[0], "title": "Staff Rust Engineer"})
+    index.remove(2)
+    index.add(synthetic_job(rng, 51))
+    assert len(index._ids) == 50
+    assert len(index) == 50
+    assert [job_id for _, job_id, _ in index.search("rust")[1]] == [1]
+    assert 2 not in index.matching_ids("", {"work_mode": ["remote", "hybrid", "onsite"]})
+
+
+def test_matching_ids_pages(index):
+    every_job = index.matching_ids("engineer")
+    assert every_job == sorted(every_job)
+    paged, after = [], None
+    while True:
+        page = index.matching_ids("engineer", after=after, limit=16)
+        if not page:
+            break
+        paged.extend(page)
+        after = page[-1]
+    assert paged == every_job
@@ -0,0 +1,18 @@
+import sqlite3
+
+from app.tokens import REFRESH, TokenService
+
+
+def test_revoke_is_single_use():
+    conn = sqlite3.connect(":memory:")
+    conn.execute(
+        "CREATE TABLE revoked_tokens (id INTEGER PRIMARY KEY AUTOINCREMENT, jti TEXT UNIQUE NOT NULL, "
+        "user_id INTEGER NOT NULL, expires_at INTEGER NOT NULL)"
+    )
+    service = TokenService("test-secret")
+    claims = service.decode(service.issue_pair(1, "a@example.com")["refresh_token"], REFRESH)
+
+    assert service.revoke(conn, claims) is True
+    # A second worker has its own in-memory list but shares the table
+    assert TokenService("test-secret").revoke(conn, claims) is False
+    assert conn.execute("SELECT COUNT(*) FROM revoked_tokens").fetchone()[0] == 1
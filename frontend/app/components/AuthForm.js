@@ -57,7 +57,9 @@ export default function AuthForm({ type }) {
           alert('Login successful!');
           localStorage.setItem('user', JSON.stringify({
             user_id: data.user_id,
-            email: data.email
+            email: data.email,
+            access_token: data.access_token,
+            refresh_token: data.refresh_token
           }));
           router.push('/dashboard');
         } else {
@@ -3,6 +3,40 @@
 import { useState, useEffect } from 'react';
 import { useRouter } from 'next/navigation';
 import Link from 'next/link';
+import { authFetch, logout } from '../lib/auth';
+
+const FACET_LABELS = {
+  work_mode: 'Work Mode',
+  experience: 'Experience',
+  type: 'Job Type'
+};
+
+const EXPERIENCE_LABELS = {
+  entry: '0-1 years',
+  mid: '2-4 years',
+  senior: '5-7 years',
+  lead: '8+ years',
+  unspecified: 'Not specified'
+};
+
+const MIN_SALARY_OPTIONS = [50000, 75000, 100000, 125000, 150000];
+
+const RADIUS_OPTIONS = [10, 25, 50, 100];
+
+const SORT_LABELS = {
+  relevance: 'Best match',
+  date: 'Newest',
+  salary_desc: 'Highest salary',
+  salary_asc: 'Lowest salary',
+  distance: 'Nearest'
+};
+
+const facetLabel = (field, value) => {
+  if (field === 'experience') {
+    return EXPERIENCE_LABELS[value] || value;
+  }
+  return value.split('-').map((word) => word.charAt(0).toUpperCase() + word.slice(1)).join('-');
+};
 
 export default function DashboardPage() {
   const [user, setUser] = useState(null);
@@ -13,6 +47,12 @@ export default function DashboardPage() {
   const [totalPages, setTotalPages] = useState(1);
   const [totalJobs, setTotalJobs] = useState(0);
   const [jobsLoading, setJobsLoading] = useState(false);
+  const [filters, setFilters] = useState({
+    work_mode: '', experience: '', type: '', min_salary: '', near_zip: '', radius_miles: '', sort: ''
+  });
+  const [facets, setFacets] = useState({});
+  const [userZip, setUserZip] = useState('');
+  const [suggestions, setSuggestions] = useState([]);
   const router = useRouter();
 
   useEffect(() => {
@@ -22,23 +62,54 @@ export default function DashboardPage() {
       return;
     }
     
-    setUser(JSON.parse(userData));
+    const parsedUser = JSON.parse(userData);
+    setUser(parsedUser);
     setLoading(false);
     fetchJobs();
+    fetchUserZip(parsedUser.user_id);
   }, [router, currentPage]);
 
-  const fetchJobs = async (search = '') => {
+  useEffect(() => {
+    // Debounced typeahead; the endpoint is cheap but keystrokes are fast
+    const prefix = searchTerm.trim();
+    if (!prefix) {
+      setSuggestions([]);
+      return;
+    }
+    const timer = setTimeout(async () => {
+      try {
+        const params = new URLSearchParams({ prefix, limit: 8 });
+        const response = await fetch(`http://localhost:8001/api/jobs/suggest?${params}`);
+        if (response.ok) {
+          const data = await response.json();
+          setSuggestions(data.suggestions);
+        }
+      } catch (error) {
+        console.error('Error fetching suggestions:', error);
+      }
+    }, 150);
+    return () => clearTimeout(timer);
+  }, [searchTerm]);
+
+  const fetchJobs = async (search = '', activeFilters = filters) => {
     setJobsLoading(true);
     try {
-      const response = await fetch(
-        `http://localhost:8001/api/jobs?search=${encodeURIComponent(search)}&page=${currentPage}&per_page=3`
-      );
+      const params = new URLSearchParams({ search, page: currentPage, per_page: 3 });
+      Object.entries(activeFilters).forEach(([field, value]) => {
+        if (value) {
+          params.append(field, value);
+        }
+      });
+      const response = await fetch(`http://localhost:8001/api/jobs?${params}`);
       const data = await response.json();
       
       if (response.ok) {
         setJobs(data.jobs);
         setTotalPages(data.total_pages);
         setTotalJobs(data.total_jobs);
+        if (data.facets) {
+          setFacets(data.facets);
+        }
       }
     } catch (error) {
       console.error('Error fetching jobs:', error);
@@ -47,12 +118,45 @@ export default function DashboardPage() {
     }
   };
 
+  const fetchUserZip = async (userId) => {
+    // The profile's zip code powers the "within N miles" filter; zips the
+    // backend can't place leave the radius control hidden
+    try {
+      const response = await authFetch(`/api/profile/${userId}`);
+      if (response.ok) {
+        const profile = await response.json();
+        setUserZip(profile.location_known ? profile.zip_code : '');
+      }
+    } catch (error) {
+      console.error('Error fetching profile:', error);
+    }
+  };
+
   const handleSearch = (e) => {
     e.preventDefault();
     setCurrentPage(1);
     fetchJobs(searchTerm);
   };
 
+  const handleFilterChange = (field, value) => {
+    const nextFilters = { ...filters, [field]: value };
+    setFilters(nextFilters);
+    setCurrentPage(1);
+    fetchJobs(searchTerm, nextFilters);
+  };
+
+  const handleRadiusChange = (value) => {
+    const nextFilters = {
+      ...filters,
+      radius_miles: value,
+      near_zip: value ? userZip : '',
+      sort: !value && filters.sort === 'distance' ? '' : filters.sort
+    };
+    setFilters(nextFilters);
+    setCurrentPage(1);
+    fetchJobs(searchTerm, nextFilters);
+  };
+
   const handlePageChange = (page) => {
     setCurrentPage(page);
   };
@@ -61,8 +165,8 @@ export default function DashboardPage() {
     alert(`Application submitted for job #${jobId}! We'll review your profile and get back to you soon.`);
   };
 
-  const handleLogout = () => {
-    localStorage.removeItem('user');
+  const handleLogout = async () => {
+    await logout();
     router.push('/login');
   };
 
@@ -132,7 +236,13 @@ export default function DashboardPage() {
                 className="flex-1 px-4 py-2 border border-gray-300 rounded-lg focus:ring-2 focus:ring-black focus:border-black"
                 value={searchTerm}
                 onChange={(e) => setSearchTerm(e.target.value)}
+                list="job-suggestions"
               />
+              <datalist id="job-suggestions">
+                {suggestions.map((suggestion) => (
+                  <option key={`${suggestion.kind}:${suggestion.text}`} value={suggestion.text} />
+                ))}
+              </datalist>
               <button 
                 type="submit"
                 className="px-6 py-2 bg-black text-white rounded-lg hover:bg-gray-800 focus:ring-2 focus:ring-black"
@@ -141,6 +251,64 @@ export default function DashboardPage() {
               </button>
             </form>
 
+            {/* Facet Filters */}
+            <div className="flex flex-wrap gap-4 mb-6">
+              {Object.keys(FACET_LABELS).map((field) => (
+                <select
+                  key={field}
+                  value={filters[field]}
+                  onChange={(e) => handleFilterChange(field, e.target.value)}
+                  className="px-3 py-2 border border-gray-300 rounded-lg focus:ring-2 focus:ring-black focus:border-black"
+                >
+                  <option value="">{FACET_LABELS[field]}: Any</option>
+                  {(facets[field] || []).map((facet) => (
+                    <option key={facet.value} value={facet.value}>
+                      {facetLabel(field, facet.value)} ({facet.count})
+                    </option>
+                  ))}
+                </select>
+              ))}
+              <select
+                value={filters.min_salary}
+                onChange={(e) => handleFilterChange('min_salary', e.target.value)}
+                className="px-3 py-2 border border-gray-300 rounded-lg focus:ring-2 focus:ring-black focus:border-black"
+              >
+                <option value="">Salary: Any</option>
+                {MIN_SALARY_OPTIONS.map((amount) => (
+                  <option key={amount} value={amount}>
+                    ${amount / 1000}k+
+                  </option>
+                ))}
+              </select>
+              {userZip && (
+                <select
+                  value={filters.radius_miles}
+                  onChange={(e) => handleRadiusChange(e.target.value)}
+                  className="px-3 py-2 border border-gray-300 rounded-lg focus:ring-2 focus:ring-black focus:border-black"
+                >
+                  <option value="">Distance: Anywhere</option>
+                  {RADIUS_OPTIONS.map((miles) => (
+                    <option key={miles} value={miles}>
+                      Within {miles} miles of {userZip} (+ remote)
+                    </option>
+                  ))}
+                </select>
+              )}
+              <select
+                value={filters.sort}
+                onChange={(e) => handleFilterChange('sort', e.target.value)}
+                className="px-3 py-2 border border-gray-300 rounded-lg focus:ring-2 focus:ring-black focus:border-black"
+              >
+                {Object.entries(SORT_LABELS)
+                  .filter(([value]) => value !== 'distance' || filters.near_zip)
+                  .map(([value, label]) => (
+                    <option key={value} value={value === 'relevance' ? '' : value}>
+                      Sort: {label}
+                    </option>
+                  ))}
+              </select>
+            </div>
+
             {/* Search Info */}
             <div className="flex justify-between items-center mb-4">
               <p className="text-gray-600">
@@ -0,0 +1,69 @@
+const API_BASE = 'http://localhost:8001';
+
+export function getStoredUser() {
+  const userData = localStorage.getItem('user');
+  return userData ? JSON.parse(userData) : null;
+}
+
+async function refreshTokens(user) {
+  if (!user?.refresh_token) {
+    return null;
+  }
+  const response = await fetch(`${API_BASE}/api/token/refresh`, {
+    method: 'POST',
+    headers: {
+      'Content-Type': 'application/json',
+    },
+    body: JSON.stringify({ refresh_token: user.refresh_token }),
+  });
+  if (!response.ok) {
+    return null;
+  }
+  const tokens = await response.json();
+  const updated = {
+    ...user,
+    access_token: tokens.access_token,
+    refresh_token: tokens.refresh_token
+  };
+  localStorage.setItem('user', JSON.stringify(updated));
+  return updated;
+}
+
+// fetch() with the stored access token; refreshes it once if it has expired
+export async function authFetch(path, options = {}) {
+  let user = getStoredUser();
+  const send = (currentUser) => fetch(`${API_BASE}${path}`, {
+    ...options,
+    headers: {
+      ...(options.headers || {}),
+      Authorization: `Bearer ${currentUser?.access_token || ''}`,
+    },
+  });
+
+  let response = await send(user);
+  if (response.status === 401) {
+    user = await refreshTokens(user);
+    if (user) {
+      response = await send(user);
+    }
+  }
+  return response;
+}
+
+export async function logout() {
+  const user = getStoredUser();
+  if (user?.access_token) {
+    try {
+      await authFetch('/api/logout', {
+        method: 'POST',
+        headers: {
+          'Content-Type': 'application/json',
+        },
+        body: JSON.stringify({ refresh_token: user.refresh_token }),
+      });
+    } catch (error) {
+      console.error('Error logging out:', error);
+    }
+  }
+  localStorage.removeItem('user');
+}
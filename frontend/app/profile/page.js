@@ -2,6 +2,7 @@
 
 import { useState, useEffect } from 'react';
 import { useRouter } from 'next/navigation';
+import { authFetch } from '../lib/auth';
 
 export default function ProfilePage() {
   const [profile, setProfile] = useState({
@@ -39,11 +40,15 @@ export default function ProfilePage() {
   const fetchProfile = async () => {
     try {
       const userData = JSON.parse(localStorage.getItem('user'));
-      const response = await fetch(`http://localhost:8001/api/profile/${userData.user_id}`);
+      const response = await authFetch(`/api/profile/${userData.user_id}`);
       
       if (response.ok) {
         const profileData = await response.json();
         setProfile(profileData);
+      } else if (response.status === 401) {
+        // Session expired and couldn't be refreshed
+        localStorage.removeItem('user');
+        router.push('/login');
       }
     } catch (error) {
       console.error('Error fetching profile:', error);
@@ -90,7 +95,7 @@ export default function ProfilePage() {
     setSuccessMessage('');
     try {
       const userData = JSON.parse(localStorage.getItem('user'));
-      const response = await fetch(`http://localhost:8001/api/profile/${userData.user_id}`, {
+      const response = await authFetch(`/api/profile/${userData.user_id}`, {
         method: 'PUT',
         headers: {
           'Content-Type': 'application/json',